@@ -0,0 +1,182 @@
+"""Helpers shared by the benchmark scripts in this directory."""
+
+from __future__ import annotations
+
+import io
+import json
+import statistics
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+Results = Dict[str, Dict[str, float]]
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+    }
+
+
+def measure(
+    func: Callable[[Any], Any],
+    repeat: int,
+    setup: Optional[Callable[[], ContextManager[Any]]] = None,
+) -> List[float]:
+    """Call `func` `repeat` times, timing only `func`.
+
+    `func` is called with the value of a `with setup()` block, which is
+    exited after each call, or with `None` when there's no setup.
+    """
+    samples = []
+
+    for _ in range(repeat):
+        with setup() if setup is not None else nullcontext() as arg:
+            start = time.perf_counter()
+            func(arg)
+            samples.append(time.perf_counter() - start)
+
+    return samples
+
+
+@contextmanager
+def stub_terminal_probe() -> Iterator[None]:
+    """Make terminal color detection answer immediately with no colors."""
+    from rich_toolkit.utils import colors
+
+    original = colors._query_terminal_colors
+    colors._query_terminal_colors = lambda color_types: {  # type: ignore
+        color_type: None for color_type in color_types
+    }
+
+    try:
+        yield
+    finally:
+        colors._query_terminal_colors = original  # type: ignore
+        colors.clear_terminal_color_cache()
+
+
+def use_null_console(console: Console, terminal: bool = True) -> io.StringIO:
+    """Redirect a style's console to memory, optionally pretending it's a
+    terminal so live displays render like they would interactively."""
+    output = io.StringIO()
+
+    console.file = output
+    console._force_terminal = terminal
+    console.width = 100
+
+    return output
+
+
+def load_baseline(path: Path) -> Results:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: Path, results: Results) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def to_relative(results: Results, references: Dict[str, str]) -> Results:
+    """Divide the results of each benchmark in `references` by the median of
+    its reference benchmark, so they can be compared across machines."""
+    return {
+        name: {
+            key: value / results[reference]["median"] for key, value in stats.items()
+        }
+        for name, stats in results.items()
+        if (reference := references.get(name)) is not None
+    }
+
+
+def from_relative(
+    baseline: Results, results: Results, references: Dict[str, str]
+) -> Results:
+    """Turn a baseline saved with `to_relative` back into seconds, using the
+    reference medians measured in `results`."""
+    return {
+        name: {
+            key: value * results[reference]["median"] for key, value in stats.items()
+        }
+        for name, stats in baseline.items()
+        if (reference := references.get(name)) is not None and reference in results
+    }
+
+
+def _format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f} s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f} ms"
+
+    return f"{value * 1e6:.1f} µs"
+
+
+def report(
+    title: str,
+    results: Results,
+    baseline: Results,
+    threshold: float,
+    console: Optional[Console] = None,
+    min_delta: float = 50e-6,
+) -> List[str]:
+    """Print the results next to the baseline, returning the names of the
+    benchmarks whose median regressed by more than `threshold`.
+
+    Differences smaller than `min_delta` seconds are considered noise.
+    """
+    console = console or Console()
+    regressions = []
+
+    table = Table(title=title)
+    table.add_column("benchmark", no_wrap=True)
+    table.add_column("median", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("baseline median", justify="right")
+    table.add_column("change", justify="right")
+
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        baseline_median = ""
+        change = ""
+
+        if previous:
+            baseline_median = _format_seconds(previous["median"])
+            ratio = stats["median"] / previous["median"] - 1
+            change = f"{ratio:+.0%}"
+            significant = abs(stats["median"] - previous["median"]) >= min_delta
+
+            if ratio > threshold and significant:
+                regressions.append(name)
+                change = f"[red]{change}[/]"
+            elif ratio < -threshold and significant:
+                change = f"[green]{change}[/]"
+
+        table.add_row(
+            name,
+            _format_seconds(stats["median"]),
+            _format_seconds(stats["p95"]),
+            baseline_median,
+            change,
+        )
+
+    console.print(table)
+
+    return regressions
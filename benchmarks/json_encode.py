@@ -0,0 +1,90 @@
+"""Compare the JSON encoders used by JSON mode.
+
+Encodes the same records with every installed encoder (the standard
+library, orjson, msgspec), and reports records per second.
+
+    python benchmarks/json_encode.py
+    python benchmarks/json_encode.py --records 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+ENCODERS = ["stdlib", "orjson", "msgspec"]
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"dep_{i}",
+            "name": f"déploiement {i}",
+            "ready": i % 2 == 0,
+            "replicas": i % 7,
+            "cpu": i / 3,
+            "tags": ["web", "eu-west", str(i)],
+            "owner": {"id": i, "email": f"user{i}@example.com"},
+            # optional fields are often null
+            "deleted_at": None if i % 2 else f"2026-07-{i % 28 + 1:02d}",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(name: str, records: List[Dict[str, Any]]) -> Dict[str, float]:
+    from rich_toolkit._json import get_encoder
+
+    encode = get_encoder(name).encode  # type: ignore[arg-type]
+
+    start = time.perf_counter()
+    size = sum(len(encode(record)) for record in records)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "records_per_second": len(records) / elapsed,
+        "megabytes_per_second": size / elapsed / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="Print raw results")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    results: Dict[str, Dict[str, float]] = {}
+
+    for name in ENCODERS:
+        try:
+            results[name] = bench(name, records)
+        except ImportError:
+            continue
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    table = Table(title=f"Encoding {args.records:,} records")
+    table.add_column("encoder")
+    table.add_column("records/sec", justify="right")
+    table.add_column("MB/sec", justify="right")
+
+    for name, stats in results.items():
+        table.add_row(
+            name,
+            f"{stats['records_per_second']:,.0f}",
+            f"{stats['megabytes_per_second']:,.1f}",
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
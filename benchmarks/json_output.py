@@ -0,0 +1,142 @@
+"""Compare flush policies when streaming JSON lines with `app.output()`.
+
+Streams the same records to stdout, redirected to /dev/null (or to a
+pipe read by another process with `--pipe`), with each flush policy, and
+reports records per second and the number of write system calls.
+
+    python benchmarks/json_output.py
+    python benchmarks/json_output.py --records 10000000 --pipe
+    python benchmarks/json_output.py --models  # stream Pydantic models
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterator
+
+from rich.console import Console
+from rich.table import Table
+
+POLICIES: Dict[str, Dict[str, Any]] = {
+    "every line": {"json_flush_items": 1},
+    "every 1,000 lines": {"json_flush_items": 1000},
+    "every 64 KiB": {"json_flush_items": None, "json_flush_bytes": 64 * 1024},
+    "every 50 ms": {"json_flush_items": None, "json_flush_interval": 0.05},
+}
+
+
+# reads the pipe until it's closed, without keeping anything
+DRAIN = "import sys\nwhile sys.stdin.buffer.read1(1 << 20): pass"
+
+
+class CountingFileIO(io.FileIO):
+    """Count the write system calls."""
+
+    writes = 0
+
+    def write(self, data: Any) -> int:
+        self.writes += 1
+        return super().write(data)
+
+
+def records(count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {"id": f"dep_{i}", "ready": i % 2 == 0, "replicas": i % 7}
+
+
+def models(count: int) -> Iterator[Any]:
+    from pydantic import BaseModel
+
+    class Deployment(BaseModel):
+        id: str
+        ready: bool
+        replicas: int
+
+    for i in range(count):
+        yield Deployment(id=f"dep_{i}", ready=i % 2 == 0, replicas=i % 7)
+
+
+def bench(
+    policy: Dict[str, Any], count: int, pipe: bool, use_models: bool
+) -> Dict[str, float]:
+    from rich_toolkit import RichToolkit
+
+    reader = None
+
+    if pipe:
+        reader = subprocess.Popen([sys.executable, "-c", DRAIN], stdin=subprocess.PIPE)
+        assert reader.stdin is not None
+        raw = CountingFileIO(os.dup(reader.stdin.fileno()), "w")
+        reader.stdin.close()
+    else:
+        raw = CountingFileIO(os.devnull, "w")
+
+    stdout, sys.stdout = (
+        sys.stdout,
+        io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8"),
+    )
+
+    try:
+        app = RichToolkit(mode="json", **policy)
+
+        start = time.perf_counter()
+        app.output(models(count) if use_models else records(count))
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+        if reader is not None:
+            reader.wait()
+
+    return {
+        "records_per_second": count / elapsed,
+        "seconds": elapsed,
+        "writes": raw.writes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--pipe", action="store_true", help="Write to a pipe")
+    parser.add_argument(
+        "--models", action="store_true", help="Stream Pydantic models, not dicts"
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw results")
+    args = parser.parse_args()
+
+    results = {
+        name: bench(policy, args.records, args.pipe, args.models)
+        for name, policy in POLICIES.items()
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    table = Table(title=f"Streaming {args.records:,} JSON lines")
+    table.add_column("flush policy")
+    table.add_column("records/sec", justify="right")
+    table.add_column("time", justify="right")
+    table.add_column("writes", justify="right")
+
+    for name, stats in results.items():
+        table.add_row(
+            name,
+            f"{stats['records_per_second']:,.0f}",
+            f"{stats['seconds']:.2f} s",
+            f"{stats['writes']:,.0f}",
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Stress `Progress.log` with many producer threads.
+
+Every producer logs lines in a tight loop for a few seconds into a running
+progress with inline logs, rendering into a null terminal console. Reports
+the total number of lines logged per second, and how many frames per second
+were drawn meanwhile, which should stay close to the refresh rate.
+
+    python benchmarks/progress_log.py
+    python benchmarks/progress_log.py --threads 64 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from typing import Dict, List
+
+from _utils import stub_terminal_probe, use_null_console
+from rich.console import Console
+from rich.table import Table
+
+THREADS = [1, 8, 64]
+
+
+def bench(threads: int, seconds: float, refresh_per_second: float) -> Dict[str, float]:
+    from rich_toolkit.progress import Progress
+    from rich_toolkit.styles import TaggedStyle
+
+    style = TaggedStyle()
+    use_null_console(style.console)
+
+    barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def produce(worker: int) -> None:
+        barrier.wait()
+        i = 0
+
+        while not stop.is_set():
+            progress.log(f"[green]worker {worker}[/] step {i}")
+            i += 1
+
+    producers: List[threading.Thread] = [
+        threading.Thread(target=produce, args=(worker,)) for worker in range(threads)
+    ]
+
+    with Progress(
+        "Stress",
+        style=style,
+        console=style.console,
+        inline_logs=True,
+        lines_to_show=10,
+        max_logs=1000,
+        refresh_per_second=refresh_per_second,
+    ) as progress:
+        for producer in producers:
+            producer.start()
+
+        barrier.wait()
+        start = time.perf_counter()
+        frames = progress.frames_rendered
+
+        time.sleep(seconds)
+        frames = progress.frames_rendered - frames
+        stop.set()
+
+        for producer in producers:
+            producer.join()
+
+        elapsed = time.perf_counter() - start
+
+    return {
+        "lines_per_second": progress.total_lines / elapsed,
+        "frames_per_second": frames / seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, action="append")
+    parser.add_argument(
+        "--seconds", type=float, default=5, help="How long producers log per run"
+    )
+    parser.add_argument("--refresh-per-second", type=float, default=8)
+    parser.add_argument("--json", action="store_true", help="Print raw results")
+    args = parser.parse_args()
+
+    results: Dict[int, Dict[str, float]] = {}
+
+    with stub_terminal_probe():
+        for threads in args.threads or THREADS:
+            results[threads] = bench(threads, args.seconds, args.refresh_per_second)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    table = Table(title="Progress.log throughput")
+    table.add_column("producers", justify="right")
+    table.add_column("lines/sec", justify="right")
+    table.add_column("frames/sec", justify="right")
+
+    for threads, stats in results.items():
+        table.add_row(
+            str(threads),
+            f"{stats['lines_per_second']:,.0f}",
+            f"{stats['frames_per_second']:.1f} / {args.refresh_per_second:g}",
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Render every element type under every style into a null console.
+
+Reports the time per render, the peak memory allocated while rendering
+(measured with tracemalloc) and the number of bytes written per frame.
+
+    python benchmarks/render.py
+    python benchmarks/render.py --style TaggedStyle --element "progress 10k logs"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from _utils import stub_terminal_probe, use_null_console
+from rich.console import Console
+from rich.table import Table
+
+STYLES = ["MinimalStyle", "TaggedStyle", "FancyStyle", "BorderedStyle"]
+
+# (element, render_element keyword arguments)
+Case = Tuple[Any, Dict[str, Any]]
+
+
+def _menu(style: Any, count: int) -> Case:
+    from rich_toolkit.menu import Menu, Option
+
+    options: List[Option[int]] = [
+        Option({"name": f"Option {i}", "value": i}) for i in range(count)
+    ]
+
+    return Menu("Pick one", options, style=style), {"is_active": True}
+
+
+def _progress(style: Any, count: int) -> Case:
+    from rich_toolkit.progress import Progress
+
+    progress = Progress("Deploying", style=style, inline_logs=True, lines_to_show=10)
+
+    for i in range(count):
+        progress.log(f"[green]step[/] {i} completed")
+
+    return progress, {}
+
+
+def _input(style: Any) -> Case:
+    from rich_toolkit.input import Input
+
+    element = Input(label="Project name", placeholder="my-app", style=style)
+    element.text = "rich-toolkit"
+
+    return element, {"is_active": True}
+
+
+def _form(style: Any) -> Case:
+    from rich_toolkit.form import Form
+
+    form = Form("Sign in", style=style)
+    form.add_input("username", "Username", placeholder="user")
+    form.add_input("password", "Password", password=True)
+    form.add_button("submit", "Submit")
+
+    return form, {}
+
+
+def _button(style: Any) -> Case:
+    from rich_toolkit.button import Button
+
+    return Button("submit", "Submit", style=style), {"is_active": True}
+
+
+ELEMENTS: Dict[str, Callable[[Any], Case]] = {
+    "string": lambda style: ("Hello, [bold]world[/]!", {"tag": "demo"}),
+    "title": lambda style: ("Deploying", {"title": True, "tag": "demo"}),
+    "button": _button,
+    "input": _input,
+    "form": _form,
+    "menu 10 options": lambda style: _menu(style, 10),
+    "menu 1k options": lambda style: _menu(style, 1_000),
+    "menu 100k options": lambda style: _menu(style, 100_000),
+    "progress 0 logs": lambda style: _progress(style, 0),
+    "progress 100 logs": lambda style: _progress(style, 100),
+    "progress 10k logs": lambda style: _progress(style, 10_000),
+}
+
+
+def _render(style: Any, case: Case) -> None:
+    element, kwargs = case
+    style.console.print(style.render_element(element, **kwargs))
+
+
+def bench(style_name: str, element_name: str, min_time: float) -> Dict[str, float]:
+    from rich_toolkit import styles
+
+    style = getattr(styles, style_name)()
+    output = use_null_console(style.console)
+    case = ELEMENTS[element_name](style)
+
+    # warm up, and measure the size of a single frame
+    _render(style, case)
+    output.seek(0)
+    output.truncate()
+    _render(style, case)
+    frame_bytes = len(output.getvalue().encode())
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+
+    while elapsed < min_time or iterations < 3:
+        output.seek(0)
+        output.truncate()
+        _render(style, case)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        _render(style, case)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ns_per_render": elapsed / iterations * 1e9,
+        "peak_alloc_bytes": peak,
+        "bytes_per_frame": frame_bytes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--style", action="append", choices=STYLES)
+    parser.add_argument("--element", action="append", choices=list(ELEMENTS))
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum seconds spent rendering each case",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw results")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    with stub_terminal_probe():
+        for style_name in args.style or STYLES:
+            for element_name in args.element or ELEMENTS:
+                results.setdefault(element_name, {})[style_name] = bench(
+                    style_name, element_name, args.min_time
+                )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    table = Table(title="Render cost per frame")
+    table.add_column("element", no_wrap=True)
+    table.add_column("style", no_wrap=True)
+    table.add_column("time/render", justify="right")
+    table.add_column("peak alloc", justify="right")
+    table.add_column("bytes/frame", justify="right")
+
+    for element_name, by_style in results.items():
+        for style_name, stats in by_style.items():
+            table.add_row(
+                element_name,
+                style_name,
+                f"{stats['ns_per_render']:,.0f} ns",
+                f"{stats['peak_alloc_bytes'] / 1024:,.1f} KiB",
+                f"{stats['bytes_per_frame']:,}",
+            )
+
+        table.add_section()
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
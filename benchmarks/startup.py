@@ -0,0 +1,213 @@
+"""Measure how long it takes from `RichToolkit(style=...)` to the first
+byte on screen.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --allow-probe   # query the real terminal
+    python benchmarks/startup.py --save-baseline # update the stored baseline
+
+The baseline stores each benchmark relative to a reference measured in the
+same run: importing `rich.console` in a new interpreter for the imports,
+and printing a line with a plain rich console for the rest. It's converted
+back to seconds with the references measured on the machine running the
+check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from contextlib import ExitStack, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from _utils import (
+    BASELINES_DIR,
+    Results,
+    from_relative,
+    load_baseline,
+    measure,
+    report,
+    save_baseline,
+    stub_terminal_probe,
+    summarize,
+    to_relative,
+    use_null_console,
+)
+
+STYLES = ["MinimalStyle", "TaggedStyle", "FancyStyle", "BorderedStyle"]
+
+IMPORT_REFERENCE = "reference import rich.console"
+RENDER_REFERENCE = "reference rich print"
+
+
+def _get_style_class(name: str) -> Callable[[], Any]:
+    from rich_toolkit import styles
+
+    return getattr(styles, name)
+
+
+def _import_samples(statement: str, repeat: int) -> List[float]:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+
+
+def _new_style(style_name: str) -> Any:
+    from rich_toolkit.utils.colors import clear_terminal_color_cache
+
+    # every sample should pay for color detection, like a new process would
+    clear_terminal_color_cache()
+
+    return _get_style_class(style_name)()
+
+
+def _new_toolkit(style_name: str) -> Any:
+    from rich_toolkit import RichToolkit
+
+    style = _new_style(style_name)
+    use_null_console(style.console)
+
+    return RichToolkit(style=style)
+
+
+@contextmanager
+def _toolkit_to_enter(style_name: str) -> Iterator[Tuple[Any, ExitStack]]:
+    # the toolkit is entered by the benchmark and exited with the stack
+    with ExitStack() as stack:
+        yield _new_toolkit(style_name), stack
+
+
+@contextmanager
+def _entered_toolkit(style_name: str) -> Iterator[Any]:
+    with _new_toolkit(style_name) as app:
+        yield app
+
+
+def _first_progress_frame(app: Any) -> None:
+    progress = app.progress("Deploying")
+    # starting the live display renders and writes the first frame
+    progress.start(refresh=True)
+    progress.stop()
+
+
+def _references(repeat: int) -> Results:
+    from rich.console import Console
+
+    console = Console()
+    use_null_console(console)
+
+    return {
+        IMPORT_REFERENCE: summarize(_import_samples("import rich.console", repeat)),
+        RENDER_REFERENCE: summarize(
+            measure(lambda _: console.print("Deploying", style="bold"), repeat)
+        ),
+    }
+
+
+def _reference_names(results: Results) -> Dict[str, str]:
+    return {
+        name: IMPORT_REFERENCE if name.endswith(" import") else RENDER_REFERENCE
+        for name in results
+        if name not in (IMPORT_REFERENCE, RENDER_REFERENCE)
+    }
+
+
+def run(repeat: int) -> Results:
+    results = _references(repeat)
+
+    for style_name in STYLES:
+        benchmarks: Dict[str, List[float]] = {
+            "import": _import_samples(
+                "from rich_toolkit import RichToolkit\n"
+                f"from rich_toolkit.styles import {style_name}",
+                repeat,
+            ),
+            "construct": measure(
+                lambda _, s=style_name: _new_style(s),
+                repeat,
+            ),
+            "enter": measure(
+                lambda toolkit: toolkit[1].enter_context(toolkit[0]),
+                repeat,
+                setup=lambda s=style_name: _toolkit_to_enter(s),
+            ),
+            "first print_title": measure(
+                lambda app: app.print_title("Deploying", tag="deploy"),
+                repeat,
+                setup=lambda s=style_name: _entered_toolkit(s),
+            ),
+            "first progress frame": measure(
+                _first_progress_frame,
+                repeat,
+                setup=lambda s=style_name: _entered_toolkit(s),
+            ),
+        }
+
+        for name, samples in benchmarks.items():
+            results[f"{style_name} {name}"] = summarize(samples)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument(
+        "--allow-probe",
+        action="store_true",
+        help="Query the terminal for its colors instead of stubbing the probe",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=str(BASELINES_DIR / "startup.json"),
+        help="Baseline file to compare against",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative median slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+
+    with nullcontext() if args.allow_probe else stub_terminal_probe():
+        results = run(args.repeat)
+
+    references = _reference_names(results)
+
+    regressions = report(
+        "Startup latency",
+        results,
+        from_relative(load_baseline(baseline_path), results, references),
+        args.threshold,
+    )
+
+    if args.save_baseline:
+        save_baseline(baseline_path, to_relative(results, references))
+
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
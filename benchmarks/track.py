@@ -0,0 +1,145 @@
+"""Measure the overhead of `RichToolkit.track` over a bare loop.
+
+Iterates over the same items with a bare `for` loop and with `app.track`,
+rendering into a null terminal console, for a sized iterable (a range) and
+a generator of unknown length. Each loop either does nothing per item, or
+calls a small function, which is closer to real loop bodies.
+
+Bare and tracked loops are run in alternating pairs, so drift in CPU speed
+affects both alike, and the overhead is reported as the median over the
+pairs with its spread (lowest and highest). With loop bodies this small,
+the difference between two runs of the same loop is often larger than the
+overhead itself, so look at the spread before reading the median.
+
+    python benchmarks/track.py
+    python benchmarks/track.py --items 1000000 --repeat 21
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from _utils import stub_terminal_probe, use_null_console
+from rich.console import Console
+from rich.table import Table
+
+
+def work(item: int) -> int:
+    return item * 2 + 1
+
+
+def empty_loop(items: Iterable[int]) -> None:
+    for _ in items:
+        pass
+
+
+def work_loop(items: Iterable[int]) -> None:
+    for item in items:
+        work(item)
+
+
+def generate(count: int) -> Iterator[int]:
+    yield from range(count)
+
+
+SOURCES: Dict[str, Callable[[int], Iterable[int]]] = {
+    "range": range,
+    "generator": generate,
+}
+BODIES: Dict[str, Callable[[Iterable[int]], None]] = {
+    "empty": empty_loop,
+    "call": work_loop,
+}
+
+
+def timed(
+    body: Callable[[Iterable[int]], None], make_items: Callable[[], Iterable[int]]
+) -> float:
+    items = make_items()
+
+    start = time.perf_counter()
+    body(items)
+
+    return time.perf_counter() - start
+
+
+def bench(count: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    from rich_toolkit import RichToolkit
+    from rich_toolkit.styles import TaggedStyle
+
+    app = RichToolkit(style=TaggedStyle())
+    use_null_console(app.console)
+
+    results: Dict[str, Dict[str, float]] = {}
+
+    for source_name, source in SOURCES.items():
+        for body_name, body in BODIES.items():
+            bare: List[float] = []
+            tracked: List[float] = []
+
+            for _ in range(repeat):
+                bare.append(timed(body, partial(source, count)))
+                tracked.append(
+                    timed(
+                        body,
+                        lambda source=source: app.track(source(count), "Tracking"),
+                    )
+                )
+
+            overheads = [t / b - 1 for b, t in zip(bare, tracked)]
+
+            results[f"{source_name} / {body_name}"] = {
+                "bare": statistics.median(bare),
+                "track": statistics.median(tracked),
+                "overhead": statistics.median(overheads),
+                "overhead_min": min(overheads),
+                "overhead_max": max(overheads),
+            }
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000_000)
+    parser.add_argument(
+        "--repeat", type=int, default=11, help="Number of bare/tracked pairs"
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw results")
+    args = parser.parse_args()
+
+    with stub_terminal_probe():
+        results = bench(args.items, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    table = Table(
+        title=f"track() over {args.items:,} items, median of {args.repeat} pairs"
+    )
+    table.add_column("iterable / body")
+    table.add_column("bare", justify="right")
+    table.add_column("track", justify="right")
+    table.add_column("overhead", justify="right")
+    table.add_column("spread", justify="right")
+
+    for name, stats in results.items():
+        table.add_row(
+            name,
+            f"{stats['bare']:.3f} s",
+            f"{stats['track']:.3f} s",
+            f"{stats['overhead']:+.1%}",
+            f"{stats['overhead_min']:+.1%} .. {stats['overhead_max']:+.1%}",
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
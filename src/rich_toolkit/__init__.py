@@ -1,4 +1,30 @@
-from .input import Validator
-from .toolkit import RichToolkit, RichToolkitTheme
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .input import Validator
+    from .toolkit import RichToolkit, RichToolkitTheme
 
 __all__ = ["RichToolkit", "RichToolkitTheme", "Validator"]
+
+# Imported on first access so that `import rich_toolkit` stays cheap for
+# short-lived commands (e.g. `--help` or JSON output)
+_lazy_imports = {
+    "RichToolkit": "toolkit",
+    "RichToolkitTheme": "toolkit",
+    "Validator": "input",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_imports:
+        module = __import__(_lazy_imports[name], globals(), locals(), [name], level=1)
+        value = getattr(module, name)
+        globals()[name] = value
+
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
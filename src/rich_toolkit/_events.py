@@ -0,0 +1,145 @@
+"""
+Write progress events as newline-delimited JSON, so programs driving a CLI
+in JSON mode can follow its progress.
+
+Every event is an object with an `event` name and the `progress` id it's
+about:
+
+    {"event": "start", "progress": 1, "title": "Deploying", "total": null}
+    {"event": "log", "progress": 1, "lines": ["Uploading"], "suppressed": 0}
+    {"event": "advance", "progress": 1, "completed": 3, "total": 10}
+    {"event": "title", "progress": 1, "title": "Deploying app"}
+    {"event": "error", "progress": 1, "message": "Upload failed"}
+    {"event": "cancel", "progress": 1}
+    {"event": "done", "progress": 1}
+
+Tasks of a progress group also have the group's id as `group` in their
+`start` event.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from itertools import count
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from ._json import write_bytes
+
+
+class ProgressEvents:
+    """Buffer progress events and write them in batches.
+
+    Events are written together at most every `flush_interval` seconds, and
+    right away when a progress errors, is cancelled or is done. Within a
+    batch, consecutive log events of a progress are merged into one, and
+    consecutive advance events only keep the latest count. Each progress
+    can send up to `log_rate_limit` lines per second, the others are only
+    counted as `suppressed`.
+    """
+
+    def __init__(
+        self,
+        file: IO[str],
+        encode: Callable[[Any], bytes],
+        flush_interval: float = 0.1,
+        log_rate_limit: Optional[float] = 100,
+    ) -> None:
+        if log_rate_limit is not None and log_rate_limit <= 0:
+            raise ValueError("log_rate_limit must be a positive number")
+
+        self.file = file
+        self.encode = encode
+        self.flush_interval = flush_interval
+        self.log_rate_limit = log_rate_limit
+
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        # last buffered event of each progress, extended in place while
+        # nothing else about that progress happened in between
+        self._last_events: Dict[int, Dict[str, Any]] = {}
+        # token bucket per progress, as (tokens, updated at)
+        self._log_tokens: Dict[int, List[float]] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def new_id(self) -> int:
+        return next(self._ids)
+
+    def emit(self, progress: int, event: str, **data: Any) -> None:
+        with self._lock:
+            self._append({"event": event, "progress": progress, **data})
+
+            if event in ("cancel", "done"):
+                self._log_tokens.pop(progress, None)
+
+        if event in ("error", "cancel", "done"):
+            self.flush()
+
+    def log(self, progress: int, lines: List[str]) -> None:
+        with self._lock:
+            allowed = self._take_log_tokens(progress, len(lines))
+            last = self._last_events.get(progress)
+
+            if last is None or last["event"] != "log":
+                last = self._append(
+                    {"event": "log", "progress": progress, "lines": [], "suppressed": 0}
+                )
+
+            last["lines"].extend(lines[:allowed])
+            last["suppressed"] += len(lines) - allowed
+
+    def advance(self, progress: int, completed: float, total: Optional[float]) -> None:
+        with self._lock:
+            last = self._last_events.get(progress)
+
+            if last is None or last["event"] != "advance":
+                last = self._append({"event": "advance", "progress": progress})
+
+            last["completed"] = completed
+            last["total"] = total
+
+    def _append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        self._events.append(event)
+        self._last_events[event["progress"]] = event
+
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+        return event
+
+    def _take_log_tokens(self, progress: int, count: int) -> int:
+        if self.log_rate_limit is None:
+            return count
+
+        now = time.monotonic()
+        capacity = max(1.0, self.log_rate_limit)
+        bucket = self._log_tokens.setdefault(progress, [capacity, now])
+
+        bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * self.log_rate_limit)
+        bucket[1] = now
+
+        allowed = min(count, int(bucket[0]))
+        bucket[0] -= allowed
+
+        return allowed
+
+    def flush(self) -> None:
+        """Write the buffered events."""
+        with self._lock:
+            events, self._events = self._events, []
+            self._last_events.clear()
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not events:
+                return
+
+            # encoded and written under the lock, so batches stay in order
+            write_bytes(
+                self.file, b"".join([self.encode(event) + b"\n" for event in events])
+            )
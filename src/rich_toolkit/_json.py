@@ -0,0 +1,547 @@
+"""
+JSON encoders and writers used by JSON mode.
+
+orjson and msgspec are used when they're installed, the standard library
+otherwise. Every encoder returns compact UTF-8 bytes (no ASCII escaping),
+accepts the same values as the standard library, and raises its errors:
+`ValueError` for NaN and infinite floats, `TypeError` for values that
+aren't JSON serializable. Values orjson or msgspec would encode but the
+standard library wouldn't, like dataclasses, bytes or UUIDs, are handed
+to the standard library.
+
+Encoded lines are written to a sink: stdout by default, or a path, a file
+descriptor or a binary file. Sinks backed by a file descriptor write the
+buffered lines with a single `os.writev()` call, without joining them.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import math
+import os
+import stat
+import sys
+import threading
+import time
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+from typing_extensions import Literal
+
+JSONEncoderName = Literal["auto", "stdlib", "orjson", "msgspec"]
+JSONSink = Union[str, "os.PathLike[str]", int, BinaryIO, IO[str]]
+
+
+class StdlibEncoder:
+    name = "stdlib"
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(
+            data,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode()
+
+
+class OrjsonEncoder(StdlibEncoder):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        # handled by the standard library, which rejects them
+        self._option = (
+            orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+    def encode(self, data: Any) -> bytes:
+        if not _is_json_native(data):
+            # like UUIDs or enums, which orjson encodes, or NaN which it
+            # encodes as null where the standard library raises
+            return super().encode(data)
+
+        try:
+            return self._dumps(data, option=self._option)
+        except TypeError:
+            # let the standard library raise its usual error, or encode what
+            # orjson can't, like integers over 64 bits or non-string keys
+            return super().encode(data)
+
+
+class MsgspecEncoder(StdlibEncoder):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encode = msgspec.json.Encoder().encode
+        self._errors = (TypeError, msgspec.EncodeError)
+
+    def encode(self, data: Any) -> bytes:
+        if not _is_json_native(data):
+            # like dataclasses, bytes or timedeltas, which msgspec encodes
+            return super().encode(data)
+
+        try:
+            return self._encode(data)
+        except self._errors:
+            return super().encode(data)
+
+
+_ENCODERS: Dict[str, Type[StdlibEncoder]] = {
+    "stdlib": StdlibEncoder,
+    "orjson": OrjsonEncoder,
+    "msgspec": MsgspecEncoder,
+}
+
+
+def get_encoder(name: JSONEncoderName = "auto") -> StdlibEncoder:
+    """Return the encoder called `name`, or the fastest one installed for
+    `"auto"`."""
+    if name != "auto":
+        if name not in _ENCODERS:
+            raise ValueError(
+                "json_encoder must be 'auto', 'stdlib', 'orjson' or 'msgspec'"
+            )
+
+        return _ENCODERS[name]()
+
+    for encoder_class in (OrjsonEncoder, MsgspecEncoder):
+        try:
+            return encoder_class()
+        except ImportError:
+            continue
+
+    return StdlibEncoder()
+
+
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+_isfinite = math.isfinite
+
+
+def _is_json_native(data: Any) -> bool:
+    """Return whether `data` only holds dicts, lists, tuples and scalars of
+    exactly the types the standard library encodes, and no NaN or infinite
+    floats. Anything else, even subclasses, is left to the standard library,
+    so every encoder accepts and rejects the same values."""
+    cls = type(data)
+
+    if cls is float:
+        return _isfinite(data)
+
+    if cls in _JSON_SCALARS:
+        return True
+
+    if cls is dict:
+        for key, value in data.items():
+            if type(key) not in _JSON_SCALARS:
+                return False
+
+            value_cls = type(value)
+
+            if value_cls is float:
+                if not _isfinite(value):
+                    return False
+            elif value_cls not in _JSON_SCALARS and not _is_json_native(value):
+                return False
+
+        return True
+
+    if cls is list or cls is tuple:
+        for item in data:
+            item_cls = type(item)
+
+            if item_cls is float:
+                if not _isfinite(item):
+                    return False
+            elif item_cls not in _JSON_SCALARS and not _is_json_native(item):
+                return False
+
+        return True
+
+    return False
+
+
+def write_bytes(file: IO[str], data: bytes) -> None:
+    """Write `data` to the binary buffer under a text file when there's one,
+    after what was already written as text."""
+    buffer = getattr(file, "buffer", None)
+
+    if buffer is None:
+        file.write(data.decode())
+        file.flush()
+        return
+
+    file.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
+class TextFileSink:
+    """Write to a text file, like `sys.stdout`, through its binary buffer
+    when it has one."""
+
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+
+    def fileno(self) -> Optional[int]:
+        try:
+            return self.file.fileno()
+        except (AttributeError, OSError, ValueError):
+            # not backed by a file descriptor, like `io.StringIO`
+            return None
+
+    def write(self, chunks: Sequence[bytes]) -> None:
+        write_bytes(self.file, b"".join(chunks))
+
+    def close(self) -> None:
+        pass
+
+
+class BinaryFileSink(TextFileSink):
+    """Write to a binary file with `writelines()`.
+
+    Files backed by a pipe, a socket or a terminal are flushed, then written
+    to with `os.writev()`. Seekable files are always written through the
+    file object, so it keeps track of its position.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file  # type: ignore[assignment]
+        # a descriptor of a wrapper, like `gzip.GzipFile`, isn't ours to
+        # write to
+        self._fd = (
+            self.fileno()
+            if isinstance(file, (io.BufferedWriter, io.FileIO)) and not file.seekable()
+            else None
+        )
+
+    def write(self, chunks: Sequence[bytes]) -> None:
+        file: BinaryIO = self.file  # type: ignore[assignment]
+
+        if self._fd is None:
+            file.writelines(chunks)
+            file.flush()
+        else:
+            file.flush()
+            _write_chunks(self._fd, chunks)
+
+
+class FDSink(TextFileSink):
+    """Write to a file descriptor with `os.writev()`, closing it with the
+    sink when it's `owned`, or the `socket` it belongs to."""
+
+    def __init__(self, fd: int, owned: bool = False, socket: Any = None) -> None:
+        self.fd = fd
+        self.owned = owned
+        self.socket = socket
+
+    def fileno(self) -> Optional[int]:
+        return self.fd
+
+    def write(self, chunks: Sequence[bytes]) -> None:
+        _write_chunks(self.fd, chunks)
+
+    def close(self) -> None:
+        if self.socket is not None:
+            self.socket.close()
+        elif self.owned:
+            os.close(self.fd)
+
+
+def open_sink(sink: Optional[JSONSink]) -> TextFileSink:
+    """Return a sink writing to `sink`: stdout when it's `None`, a file
+    descriptor, a path, or a binary or text file.
+
+    Paths are truncated like with `open(path, "w")`, except for Unix
+    sockets, which are connected to. File descriptors and files aren't
+    closed with the sink.
+    """
+    if sink is None:
+        return TextFileSink(sys.stdout)
+
+    if isinstance(sink, bool):
+        raise TypeError("json_sink must be a path, a file descriptor or a file")
+
+    if isinstance(sink, int):
+        return FDSink(sink)
+
+    if isinstance(sink, (str, os.PathLike)):
+        return _open_path(os.fspath(sink))
+
+    if isinstance(sink, io.TextIOBase):
+        return TextFileSink(sink)  # type: ignore[arg-type]
+
+    if callable(getattr(sink, "write", None)):
+        return BinaryFileSink(sink)  # type: ignore[arg-type]
+
+    raise TypeError("json_sink must be a path, a file descriptor or a file")
+
+
+def _open_path(path: str) -> FDSink:
+    try:
+        is_socket = stat.S_ISSOCK(os.stat(path).st_mode)
+    except FileNotFoundError:
+        is_socket = False
+
+    if is_socket:
+        import socket
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            client.connect(path)
+        except BaseException:
+            client.close()
+            raise
+
+        return FDSink(client.fileno(), socket=client)
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+
+    return FDSink(fd, owned=True)
+
+
+_iov_max: Optional[int] = None
+
+
+def _get_iov_max() -> int:
+    global _iov_max
+
+    if _iov_max is None:
+        try:
+            _iov_max = os.sysconf("SC_IOV_MAX")
+        except (AttributeError, OSError, ValueError):
+            _iov_max = 1024
+
+        # -1 when there's no limit
+        if _iov_max <= 0:
+            _iov_max = 1024
+
+    return _iov_max
+
+
+def _write_chunks(fd: int, chunks: Sequence[bytes]) -> None:
+    """Write all of `chunks` to `fd`, with one `os.writev()` call per
+    `IOV_MAX` chunks, or one `os.write()` call where there's no `writev`."""
+    if not hasattr(os, "writev"):
+        _write_all(fd, [b"".join(chunks)], os.write)
+        return
+
+    iov_max = _get_iov_max()
+
+    if len(chunks) <= iov_max:
+        _write_all(fd, chunks, os.writev)
+        return
+
+    for start in range(0, len(chunks), iov_max):
+        _write_all(fd, chunks[start : start + iov_max], os.writev)
+
+
+def _write_all(fd: int, chunks: Sequence[bytes], write: Callable[..., int]) -> None:
+    size = sum(map(len, chunks))
+    buffers: Any = chunks[0] if write is os.write else chunks
+
+    while True:
+        try:
+            written = write(fd, buffers)
+        except BlockingIOError:
+            # a non-blocking descriptor, like a socket, wait until it
+            # can take more
+            import select
+
+            select.select([], [fd], [])
+            continue
+
+        size -= written
+
+        if not size:
+            return
+
+        # partly written: drop the chunks that were, and slice the first
+        # remaining one without copying it
+        if write is os.write:
+            buffers = memoryview(buffers)[written:]
+            continue
+
+        buffers = list(buffers)
+        index = 0
+
+        while written >= len(buffers[index]):
+            written -= len(buffers[index])
+            index += 1
+
+        del buffers[:index]
+
+        if written:
+            buffers[0] = memoryview(buffers[0])[written:]
+
+
+class JSONLinesWriter:
+    """Buffer encoded JSON lines and write them to `sink` together.
+
+    `sink` is a sink from `open_sink`, or a text file. The buffer is written
+    once it has `max_items` lines or `max_bytes` bytes, or `interval`
+    seconds after the first buffered line, whichever comes first. Limits
+    set to `None` are ignored, and everything is written when the writer is
+    closed, or when leaving its `with` block, even because of an exception.
+    Closing the writer also closes the sink.
+
+    Lines added with `write` are written by a timer thread when the
+    interval passes without another line. Coroutines using `add` and
+    `aflush` wait for the deadline themselves, see `time_until_flush`.
+    """
+
+    def __init__(
+        self,
+        sink: Union[TextFileSink, IO[str]],
+        max_items: Optional[int] = 1,
+        max_bytes: Optional[int] = None,
+        interval: Optional[float] = None,
+    ) -> None:
+        for name, value in (
+            ("max_items", max_items),
+            ("max_bytes", max_bytes),
+            ("interval", interval),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be a positive number")
+
+        self.sink = sink if isinstance(sink, TextFileSink) else TextFileSink(sink)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.interval = interval
+
+        self._lines: List[bytes] = []
+        self._size = 0
+        self._since = 0.0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def __enter__(self) -> JSONLinesWriter:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def write(self, line: bytes) -> None:
+        """Add an encoded JSON value, followed by a newline."""
+        with self._lock:
+            if self.add(line):
+                self._flush()
+            elif self.interval is not None and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def add(self, line: bytes) -> bool:
+        """Add an encoded JSON value without writing anything, and return
+        whether the buffer should now be flushed."""
+        lines = self._lines
+
+        if self.interval is not None and not lines:
+            self._since = time.monotonic()
+
+        lines.append(line)
+        lines.append(b"\n")
+
+        if self.max_bytes is not None:
+            self._size += len(line) + 1
+
+            if self._size >= self.max_bytes:
+                return True
+
+        if self.max_items is not None and len(lines) >= self.max_items * 2:
+            return True
+
+        return (
+            self.interval is not None
+            and time.monotonic() - self._since >= self.interval
+        )
+
+    def _take(self) -> List[bytes]:
+        lines = self._lines
+        self._lines = []
+        self._size = 0
+
+        return lines
+
+    def time_until_flush(self) -> Optional[float]:
+        """Return the number of seconds left before the buffered lines are
+        due because of `interval`, or `None` if there's no such deadline."""
+        if self.interval is None or not self._lines:
+            return None
+
+        return max(0.0, self._since + self.interval - time.monotonic())
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._lines:
+            self.sink.write(self._take())
+
+    async def aflush(self) -> None:
+        """Flush from a coroutine. The buffer is written right away when
+        the file can take it without blocking, otherwise from a thread, so
+        a full pipe doesn't block the event loop."""
+        if not self._lines:
+            return
+
+        lines = self._take()
+
+        if _can_write_without_blocking(self.sink.fileno(), lines):
+            self.sink.write(lines)
+        else:
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.sink.write, lines)
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.sink.close()
+
+    async def aclose(self) -> None:
+        try:
+            await self.aflush()
+        finally:
+            self.sink.close()
+
+
+def _can_write_without_blocking(fd: Optional[int], lines: List[bytes]) -> bool:
+    if fd is None:
+        return True
+
+    if sys.platform == "win32":
+        return False
+
+    import select
+
+    if sum(map(len, lines)) > getattr(select, "PIPE_BUF", 512):
+        return False
+
+    # a writable pipe takes at least `PIPE_BUF` bytes without blocking
+    _, writable, _ = select.select([], [fd], [], 0)
+
+    return bool(writable)
@@ -0,0 +1,312 @@
+"""
+Convert output data to JSON-compatible values: dicts with string keys,
+lists, strings, numbers, booleans and `None`.
+
+The conversion for each type is looked up once and cached. Data is
+converted in a single pass, and containers are only copied when something
+inside them had to be converted, so data that's already JSON-compatible is
+returned as is. Values of unknown types are returned unchanged, for the
+JSON encoder to reject.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sys
+import types
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Handler = Callable[[Any], Any]
+
+_PRIMITIVES = frozenset({str, int, float, bool, type(None)})
+
+_handlers: Dict[type, Handler] = {}
+
+
+def to_json_data(data: Any) -> Any:
+    cls = type(data)
+
+    if cls in _PRIMITIVES:
+        return data
+
+    handler = _handlers.get(cls)
+
+    if handler is None:
+        handler = _handlers[cls] = _make_handler(cls)
+
+    return handler(data)
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _convert_dict(data: Dict[Any, Any]) -> Dict[str, Any]:
+    converted: Optional[Dict[Any, Any]] = None
+
+    for key, value in data.items():
+        if type(key) is not str:
+            return {_json_key(key): to_json_data(value) for key, value in data.items()}
+
+        if type(value) in _PRIMITIVES:
+            continue
+
+        new_value = to_json_data(value)
+
+        if new_value is not value:
+            if converted is None:
+                converted = dict(data)
+
+            converted[key] = new_value
+
+    return data if converted is None else converted
+
+
+def _json_key(key: Any) -> Any:
+    # the keys the standard library accepts, converted the same way
+    if isinstance(key, Enum) or not isinstance(key, (str, int, float, type(None))):
+        key = to_json_data(key)
+
+    if isinstance(key, str):
+        return key
+
+    if key is True:
+        return "true"
+
+    if key is False:
+        return "false"
+
+    if key is None:
+        return "null"
+
+    if isinstance(key, int):
+        return int.__repr__(key)
+
+    if isinstance(key, float) and math.isfinite(key):
+        return float.__repr__(key)
+
+    # left for the encoder to reject
+    return key
+
+
+def _convert_list(data: List[Any]) -> List[Any]:
+    converted: Optional[List[Any]] = None
+
+    for index, item in enumerate(data):
+        if type(item) in _PRIMITIVES:
+            continue
+
+        new_item = to_json_data(item)
+
+        if new_item is not item:
+            if converted is None:
+                converted = list(data)
+
+            converted[index] = new_item
+
+    return data if converted is None else converted
+
+
+def _convert_tuple(data: Tuple[Any, ...]) -> List[Any]:
+    return _convert_list(list(data))
+
+
+def _convert_set(data: Any) -> List[Any]:
+    try:
+        items = sorted(data)
+    except TypeError:
+        # mixed types, keep the iteration order
+        items = list(data)
+
+    return _convert_list(items)
+
+
+def _convert_model(data: Any) -> Any:
+    # already JSON-compatible
+    return data.model_dump(mode="json")
+
+
+def _convert_enum(data: Enum) -> Any:
+    return to_json_data(data.value)
+
+
+def _isoformat(data: Any) -> str:
+    return data.isoformat()
+
+
+def _fields_handler(names: Tuple[str, ...]) -> Handler:
+    def convert(data: Any) -> Dict[str, Any]:
+        return {name: to_json_data(getattr(data, name)) for name in names}
+
+    return convert
+
+
+def _loaded_class(module: str, name: str) -> Optional[type]:
+    # if the module isn't imported yet, there can't be instances of its
+    # classes, so there's no need to import it
+    loaded = sys.modules.get(module)
+
+    return getattr(loaded, name, None) if loaded is not None else None
+
+
+def _is_subclass(cls: type, module: str, *names: str) -> bool:
+    for name in names:
+        base = _loaded_class(module, name)
+
+        if base is not None and issubclass(cls, base):
+            return True
+
+    return False
+
+
+def _make_handler(cls: type) -> Handler:
+    if callable(getattr(cls, "model_dump", None)):
+        return _convert_model
+
+    if issubclass(cls, Enum):
+        return _convert_enum
+
+    if issubclass(cls, dict):
+        return _convert_dict
+
+    if issubclass(cls, list):
+        return _convert_list
+
+    if issubclass(cls, tuple):
+        # named tuples too, like the standard library encodes them
+        return _convert_tuple
+
+    if issubclass(cls, (set, frozenset)):
+        return _convert_set
+
+    if hasattr(cls, "__dataclass_fields__"):
+        import dataclasses
+
+        return _fields_handler(
+            tuple(field.name for field in dataclasses.fields(cls))  # type: ignore[arg-type]
+        )
+
+    if hasattr(cls, "__attrs_attrs__"):
+        return _fields_handler(
+            tuple(attribute.name for attribute in cls.__attrs_attrs__)  # type: ignore[attr-defined]
+        )
+
+    if _is_subclass(cls, "datetime", "date", "time"):
+        return _isoformat
+
+    if _is_subclass(cls, "uuid", "UUID") or _is_subclass(cls, "decimal", "Decimal"):
+        return str
+
+    if issubclass(cls, os.PathLike):
+        return os.fspath
+
+    return _identity
+
+
+def model_encoder(cls: type) -> Optional[Callable[[Any], Optional[bytes]]]:
+    """Return a function encoding instances of the Pydantic model `cls`
+    straight to JSON with the model's compiled serializer, or `None` if
+    `cls` isn't a Pydantic model.
+
+    The function returns `None` when the result might differ from
+    converting the model with `to_json_data` and encoding it: the
+    serializer writes NaN and infinite floats as `null`, where the JSON
+    encoders raise an error.
+    """
+    serializer = getattr(cls, "__pydantic_serializer__", None)
+    fields = getattr(cls, "model_fields", None)
+
+    if serializer is None or not isinstance(fields, dict):
+        return None
+
+    to_json = serializer.to_json
+    float_fields: List[str] = []
+    # fields that can hold floats we can't check cheaply, like nested
+    # models, lists or computed fields
+    opaque = bool(getattr(cls, "model_computed_fields", None))
+
+    for name, field in fields.items():
+        kind = _annotation_kind(field.annotation)
+
+        if kind == "float":
+            float_fields.append(name)
+        elif kind == "opaque":
+            opaque = True
+
+    def encode(data: Any) -> Optional[bytes]:
+        for name in float_fields:
+            value = getattr(data, name)
+
+            if isinstance(value, float) and not math.isfinite(value):
+                return None
+
+        payload: bytes = to_json(data)
+
+        if opaque and b"null" in payload:
+            return None
+
+        return payload
+
+    return encode
+
+
+def stream_encoder(encode: Callable[[Any], bytes]) -> Callable[[Any], bytes]:
+    """Return a function encoding the items of a stream with `encode`.
+
+    When the first item is a Pydantic model, the items of that model are
+    encoded by its serializer instead, see `model_encoder`.
+    """
+    model_class: Optional[type] = None
+    encode_model: Optional[Callable[[Any], Optional[bytes]]] = None
+
+    def encode_item(item: Any) -> bytes:
+        nonlocal model_class, encode_model
+
+        if model_class is None:
+            model_class = type(item)
+            encode_model = model_encoder(model_class)
+
+        if encode_model is not None and type(item) is model_class:
+            payload = encode_model(item)
+
+            if payload is not None:
+                return payload
+
+        return encode(item)
+
+    return encode_item
+
+
+def _annotation_kind(annotation: Any) -> str:
+    """Return whether a field annotated with `annotation` can't hold a
+    float ("plain"), can only hold one directly ("float"), or might hold
+    one anywhere inside it ("opaque")."""
+    if annotation is float:
+        return "float"
+
+    if annotation in (str, int, bool, bytes, type(None)):
+        return "plain"
+
+    if isinstance(annotation, type) and (
+        issubclass(annotation, Enum)
+        or annotation.__module__ in ("datetime", "uuid", "decimal")
+    ):
+        return "plain"
+
+    origin = typing.get_origin(annotation)
+
+    if origin is typing.Literal:
+        return "plain"
+
+    if origin is typing.Union or origin is getattr(types, "UnionType", None):
+        kinds = {_annotation_kind(arg) for arg in typing.get_args(annotation)}
+
+        if "opaque" in kinds:
+            return "opaque"
+
+        return "float" if "float" in kinds else "plain"
+
+    return "opaque"
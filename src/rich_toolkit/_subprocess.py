@@ -0,0 +1,142 @@
+"""
+Read a subprocess' output streams and hand them over line by line, in
+batches.
+
+On Unix the pipes are read with `selectors` on their raw file descriptors,
+on Windows (where pipes can't be selected) with one thread per stream.
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from codecs import getincrementaldecoder
+from typing import IO, Any, Callable, List, Sequence, Union
+
+Command = Union[str, Sequence[str], "subprocess.Popen[Any]"]
+
+READ_SIZE = 65536
+
+
+class LineReader:
+    """Decode a byte stream incrementally and split it into lines."""
+
+    def __init__(self, encoding: str = "utf-8", errors: str = "replace") -> None:
+        self._decoder = getincrementaldecoder(encoding)(errors)
+        self._partial = ""
+
+    def _split(self, text: str) -> List[str]:
+        lines = text.split("\n")
+        self._partial = lines.pop()
+
+        if "\r" in text:
+            # keep the last update of lines redrawn with carriage returns,
+            # like progress bars
+            lines = [line.rstrip("\r").rpartition("\r")[2] for line in lines]
+
+        return lines
+
+    def feed(self, data: bytes) -> List[str]:
+        return self._split(self._partial + self._decoder.decode(data))
+
+    def close(self) -> List[str]:
+        lines = self._split(self._partial + self._decoder.decode(b"", final=True))
+
+        if self._partial:
+            lines.extend(self._split(self._partial + "\n"))
+
+        return lines
+
+
+def start_process(command: Command, **popen_kwargs: Any) -> subprocess.Popen[Any]:
+    if isinstance(command, subprocess.Popen):
+        return command
+
+    if isinstance(command, str):
+        command = shlex.split(command)
+
+    popen_kwargs.setdefault("stdin", subprocess.DEVNULL)
+
+    return subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        **popen_kwargs,
+    )
+
+
+def _follow_with_selectors(
+    streams: List[IO[Any]], on_lines: Callable[[List[str]], None], encoding: str
+) -> None:
+    import selectors
+
+    with selectors.DefaultSelector() as selector:
+        for stream in streams:
+            selector.register(
+                stream.fileno(), selectors.EVENT_READ, LineReader(encoding)
+            )
+
+        while selector.get_map():
+            for key, _ in selector.select():
+                reader: LineReader = key.data
+                data = os.read(key.fd, READ_SIZE)
+
+                if data:
+                    lines = reader.feed(data)
+                else:
+                    selector.unregister(key.fd)
+                    lines = reader.close()
+
+                if lines:
+                    on_lines(lines)
+
+
+def _follow_with_threads(
+    streams: List[IO[Any]], on_lines: Callable[[List[str]], None], encoding: str
+) -> None:
+    def read(stream: IO[Any]) -> None:
+        reader = LineReader(encoding)
+
+        while data := os.read(stream.fileno(), READ_SIZE):
+            if lines := reader.feed(data):
+                on_lines(lines)
+
+        if lines := reader.close():
+            on_lines(lines)
+
+    threads = [threading.Thread(target=read, args=(stream,)) for stream in streams]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+
+def follow_process(
+    process: subprocess.Popen[Any],
+    on_lines: Callable[[List[str]], None],
+    encoding: str = "utf-8",
+) -> int:
+    """Call `on_lines` with the lines written to the process' stdout and
+    stderr, until both are closed, and return its exit code."""
+    streams: List[IO[Any]] = [
+        stream for stream in (process.stdout, process.stderr) if stream is not None
+    ]
+
+    try:
+        if sys.platform == "win32":
+            _follow_with_threads(streams, on_lines, encoding)
+        else:
+            _follow_with_selectors(streams, on_lines, encoding)
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        for stream in streams:
+            stream.close()
+
+    return process.wait()
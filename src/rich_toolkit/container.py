@@ -166,8 +166,12 @@ class Container(Element):
             self._focus_previous()
 
     def run(self):
+        from .utils.colors import wait_for_terminal_color_detection
+
         self._refresh()
 
+        wait_for_terminal_color_detection()
+
         while True:
             try:
                 key = getchar()
@@ -11,7 +11,6 @@ from typing import (
     Union,
 )
 
-import click
 from rich.console import Console, RenderableType
 from rich.text import Text
 from typing_extensions import Any, Literal, TypedDict
@@ -104,6 +103,8 @@ class Menu(Generic[ReturnValue], TextInputHandler, Element):
         super().__init__()
 
     def get_key(self) -> Optional[str]:
+        import click
+
         char = click.getchar()
 
         if char == "\r":
@@ -1,15 +1,68 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from itertools import chain, compress, islice, repeat
+from operator import length_hint
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sized,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from rich.console import Console, RenderableType
+from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
 from rich.live import Live
+from rich.errors import MarkupError
+from rich.segment import Segment
 from rich.text import Text
+from typing_extensions import Literal
 
 from .element import Element
 
 if TYPE_CHECKING:
+    import asyncio
+
+    from ._events import ProgressEvents
+    from ._subprocess import Command
     from .styles.base import BaseStyle
+    from .utils.colors import FadeTable
+
+T = TypeVar("T")
+
+# text that rich would print differently than it's written: markup, emoji
+# codes, and tabs or control codes (which are expanded or stripped)
+_CONTROL_CODES_RE = re.compile(r"[\t\x07\x08\x0b\x0c\r]")
+_NEEDS_RENDERING_RE = re.compile(r"[\[\t\x07\x08\x0b\x0c\r]|:\S*:")
+
+
+class _PlainText:
+    """Write text to the console as is, without rendering it."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        yield Segment(self.text)
 
 
 class ProgressLine(Element):
@@ -17,9 +70,62 @@ class ProgressLine(Element):
         self.text = text
         self.parent = parent
 
+    @property
+    def text(self) -> str | Text:
+        return self._text
+
+    @text.setter
+    def text(self, text: str | Text) -> None:
+        self._text = text
+        self._parsed_text: Optional[Text] = None
+        self._faded_text: Optional[Tuple[FadeTable, int, Text]] = None
+
+    @property
+    def parsed_text(self) -> Text:
+        """The line as `Text`, markup is parsed once and then cached."""
+        if self._parsed_text is None:
+            self._parsed_text = (
+                Text.from_markup(self._text)
+                if isinstance(self._text, str)
+                else self._text
+            )
+
+        return self._parsed_text
+
+    def fade(self, fade_table: FadeTable, brightness_multiplier: float) -> Text:
+        """The parsed line faded with `fade_table`.
+
+        The faded copy is kept until the line's text or fade level changes,
+        it is shared between calls and should not be modified.
+        """
+        level = fade_table.get_level(brightness_multiplier)
+        cached = self._faded_text
+
+        if cached is not None and cached[0] is fade_table and cached[1] == level:
+            return cached[2]
+
+        faded = fade_table.fade_text(self.parsed_text, brightness_multiplier)
+        self._faded_text = (fade_table, level, faded)
+
+        return faded
+
+
+RefreshPolicy = Literal["fixed", "adaptive", "idle"]
+
 
 class Progress(Live, Element):
-    current_message: str | Text
+    # fraction of the time the adaptive refresh policy is allowed to spend
+    # rendering and writing frames
+    adaptive_refresh_budget = 0.1
+    # seconds over which the throughput of `advance` is averaged
+    speed_smoothing = 2.0
+    # producers apply queued log calls themselves past this many, so the
+    # queue stays small even when nothing is rendering
+    max_pending_logs = 1000
+    # with `preserve_logs`, plain text logs are buffered and written once
+    # there are this many characters, or after this many seconds
+    preserve_logs_buffer_size = 64 * 1024
+    preserve_logs_flush_interval = 0.1
 
     def __init__(
         self,
@@ -32,8 +138,59 @@ class Progress(Live, Element):
         lines_to_show: int = -1,
         preserve_logs: bool = False,
         quiet: bool = False,
+        max_logs: Optional[int] = None,
+        spill_logs_to: Union[str, os.PathLike[str], IO[str], None] = None,
+        refresh_per_second: float = 8,
+        refresh_policy: RefreshPolicy = "fixed",
+        log_rate_limit: Optional[float] = None,
+        total: Optional[float] = None,
+        events: Optional[ProgressEvents] = None,
         **metadata: Dict[Any, Any],
     ) -> None:
+        if refresh_policy not in ("fixed", "adaptive", "idle"):
+            raise ValueError("refresh_policy must be 'fixed', 'adaptive' or 'idle'")
+
+        # `log()` only appends to this queue (appending to a deque is
+        # thread-safe), the calls are applied in batches before each frame
+        # or whenever the log state is read
+        self._pending_logs: Deque[Tuple[int, Union[str, Text, List[str]], str]] = (
+            deque()
+        )
+        self._ingest_lock = threading.RLock()
+        # one entry per thread waiting for the ingest lock, producers leave
+        # the queued logs to them instead of taking the lock again first
+        self._ingest_waiters: Deque[int] = deque()
+        # thread rendering a frame, see `_frozen_logs`
+        self._logs_frozen_by: Optional[int] = None
+        # partially logged (`end=""`) lines, per producer thread
+        self._open_lines: Dict[int, ProgressLine] = {}
+        self._open_message_producer: Optional[int] = None
+
+        self._preserved_logs: List[str] = []
+        self._preserved_logs_size = 0
+        # whether the buffered logs go through the console's highlighter
+        self._preserved_logs_highlight = False
+        self._preserved_logs_timer: Optional[threading.Timer] = None
+        self._preserve_lock = threading.RLock()
+
+        self.refresh_policy = refresh_policy
+
+        # `advance` only adds to `completed`, the speed is sampled once per
+        # frame
+        self.total = total
+        self.completed: float = 0
+        self.speed: Optional[float] = None
+        self._speed_sampled_at = time.monotonic()
+        self._speed_sampled_completed: float = 0
+        self._rendered_completed: float = 0
+        # set by `track` when the progress can be read from the iterator
+        self._count_completed: Optional[Callable[[], float]] = None
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self._changed = True
+        self._last_frame_at = 0.0
+        self._frame_cost = 0.0
+
         self._inline_logs = inline_logs
         self._preserve_logs = preserve_logs
         self._title = title
@@ -43,13 +200,176 @@ class Progress(Live, Element):
         self.lines_to_show = lines_to_show
         self._quiet = quiet
 
-        self.logs: List[ProgressLine] = []
-        self._log_line_open = False
+        if max_logs is not None and max_logs <= 0:
+            raise ValueError("max_logs must be a positive number")
+
+        if max_logs is not None and lines_to_show > max_logs:
+            # always keep enough lines to fill the display
+            max_logs = lines_to_show
+
+        self.max_logs = max_logs
+        self._logs: MutableSequence[ProgressLine] = (
+            [] if max_logs is None else deque(maxlen=max_logs)
+        )
+        self._total_lines = 0
+
+        if log_rate_limit is not None and log_rate_limit <= 0:
+            raise ValueError("log_rate_limit must be a positive number")
+
+        # token bucket allowing bursts of up to a second worth of lines
+        self.log_rate_limit = log_rate_limit
+        self._log_tokens = max(1.0, log_rate_limit or 0)
+        self._log_tokens_at = time.monotonic()
+        self._suppressed_lines = 0
+
+        self._spill_logs_to = spill_logs_to
+        self._spill_file: Optional[IO[str]] = None
 
         self._cancelled = False
 
+        # machine-readable events, sent between the start and the end of the
+        # progress
+        self._events = events
+        self._event_id = events.new_id() if events is not None else 0
+        self._events_started = False
+
+        # set while the progress is driven by an asyncio task instead of
+        # rich's refresh thread, see `__aenter__`
+        self._driver: Optional[asyncio.Task[None]] = None
+        self._wake_driver: Optional[asyncio.Event] = None
+        self._logs_drained: Optional[asyncio.Event] = None
+
         Element.__init__(self, style=style, metadata=metadata)
-        super().__init__(console=console, refresh_per_second=8, transient=transient)
+        super().__init__(
+            console=console,
+            refresh_per_second=refresh_per_second,
+            transient=transient,
+        )
+
+    @property
+    def current_message(self) -> str | Text:
+        self._apply_pending_logs()
+
+        return self._current_message
+
+    @current_message.setter
+    def current_message(self, message: str | Text) -> None:
+        self._apply_pending_logs()
+
+        self._current_message = message
+        self._changed = True
+
+    @property
+    def logs(self) -> MutableSequence[ProgressLine]:
+        self._apply_pending_logs()
+
+        return self._logs
+
+    @property
+    def total_lines(self) -> int:
+        """Number of lines logged so far, including the ones no longer in
+        `logs`, but not the suppressed ones."""
+        self._apply_pending_logs()
+
+        return self._total_lines
+
+    @property
+    def suppressed_lines(self) -> int:
+        """Number of inline log lines dropped because of `log_rate_limit`."""
+        self._apply_pending_logs()
+
+        return self._suppressed_lines
+
+    @property
+    def refresh_interval(self) -> float:
+        """Minimum number of seconds between two frames."""
+        interval = 1 / self.refresh_per_second
+
+        if self.refresh_policy == "adaptive":
+            # back off when frames are slow to render or write, e.g. on
+            # slow terminals or with many inline logs
+            interval = max(interval, self._frame_cost / self.adaptive_refresh_budget)
+
+        return interval
+
+    def _should_skip_frame(self) -> bool:
+        # always render the first frame and the final one
+        if not self._started or self.frames_rendered == 0:
+            return False
+
+        if self.refresh_policy == "idle":
+            return not self._has_changed()
+
+        if self.refresh_policy == "adaptive":
+            elapsed = time.perf_counter() - self._last_frame_at
+
+            # leave a little slack for the refresh thread's timer
+            return elapsed < self.refresh_interval * 0.9
+
+        return False
+
+    def refresh(self) -> None:
+        # hold the ingest lock while rendering, so that reading the logs
+        # from another thread can't modify them mid-frame
+        with self._lock, self._frozen_logs():
+            self._sample_speed()
+
+            if self._should_skip_frame():
+                self.frames_skipped += 1
+                return
+
+            self._changed = False
+            self._rendered_completed = self.completed
+
+            start = time.perf_counter()
+            super().refresh()
+            end = time.perf_counter()
+
+            # smooth out the cost so one slow frame doesn't stall the display
+            self._frame_cost = self._frame_cost * 0.7 + (end - start) * 0.3
+            self._last_frame_at = end
+            self.frames_rendered += 1
+
+    def advance(self, advance: float = 1) -> None:
+        """Advance the number of completed steps."""
+        self.completed += advance
+
+        if self._events is not None and self._events_started:
+            self._events.advance(self._event_id, self.completed, self.total)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated number of seconds left, when `total` is known."""
+        if self.total is None or not self.speed:
+            return None
+
+        return max(0.0, (self.total - self.completed) / self.speed)
+
+    def _has_changed(self) -> bool:
+        return self._changed or self.completed != self._rendered_completed
+
+    def _sample_speed(self) -> None:
+        if self._count_completed is not None:
+            self.completed = self._count_completed()
+
+        now = time.monotonic()
+        elapsed = now - self._speed_sampled_at
+
+        if elapsed <= 0:
+            return
+
+        speed = (self.completed - self._speed_sampled_completed) / elapsed
+
+        if self.speed is None:
+            self.speed = speed
+        else:
+            # exponential moving average weighted by the time since the
+            # last sample, as frames aren't evenly spaced
+            weight = 1 - math.exp(-elapsed / self.speed_smoothing)
+            self.speed += (speed - self.speed) * weight
+
+        self._speed_sampled_at = now
+        self._speed_sampled_completed = self.completed
 
     @property
     def title(self) -> str:
@@ -65,9 +385,41 @@ class Progress(Live, Element):
             self.current_message = title
 
         self._title = title
+        self._changed = True
+        self._emit("title", title=title)
+
+    def _emit(self, event: str, **data: Any) -> None:
+        if self._events is not None and self._events_started:
+            self._events.emit(self._event_id, event, **data)
+
+    def _start_event(self) -> Dict[str, Any]:
+        return {"title": self._title, "total": self.total}
+
+    def _emit_log_event(self, text: str | Text, end: str) -> None:
+        assert self._events is not None
+
+        if isinstance(text, Text):
+            text = text.plain
+        elif _NEEDS_RENDERING_RE.search(text):
+            try:
+                text = Text.from_markup(text).plain
+            except MarkupError:
+                pass
+
+        message = text + end
+
+        if not message:
+            return
+
+        if message.endswith("\n"):
+            message = message[:-1]
+
+        self._events.log(self._event_id, message.split("\n"))
 
     # TODO: remove this once rich uses "Self"
     def __enter__(self) -> "Progress":
+        self._emit_start_event()
+
         if self._quiet:
             return self
 
@@ -79,14 +431,202 @@ class Progress(Live, Element):
         if exc_type is KeyboardInterrupt:
             self._cancelled = True
 
+        try:
+            self.flush()
+
+            if self._quiet:
+                return None
+
+            super().__exit__(exc_type, *args)
+        finally:
+            self._close_spill_file()
+            self._emit_end_events()
+
+    def _emit_start_event(self) -> None:
+        if self._events is not None and not self._events_started:
+            self._events_started = True
+            self._events.emit(self._event_id, "start", **self._start_event())
+
+    def _emit_end_events(self) -> None:
+        if self._events is None or not self._events_started:
+            return
+
+        if self._count_completed is not None:
+            # counted by `track`, which doesn't send advance events
+            self.completed = self._count_completed()
+            self._events.advance(self._event_id, self.completed, self.total)
+
+        self._emit("cancel" if self._cancelled else "done")
+        self._events_started = False
+
+    async def __aenter__(self) -> "Progress":
+        """Start the progress, refreshed by a task on the running event loop
+        rather than by a separate thread."""
+        import asyncio
+
+        self._emit_start_event()
+
         if self._quiet:
-            return None
+            return self
+
+        self._wake_driver = asyncio.Event()
+        self._logs_drained = asyncio.Event()
+
+        auto_refresh, self.auto_refresh = self.auto_refresh, False
+        try:
+            self.start(refresh=self._renderable is not None)
+        finally:
+            self.auto_refresh = auto_refresh
+
+        self._driver = asyncio.get_running_loop().create_task(self._drive())
+
+        return self
+
+    async def __aexit__(self, exc_type: type | None, *args: object) -> None:
+        import asyncio
+
+        driver, self._driver = self._driver, None
+
+        if driver is not None:
+            driver.cancel()
 
-        super().__exit__(exc_type, *args)
+            try:
+                await driver
+            except asyncio.CancelledError:
+                pass
+
+        self.__exit__(exc_type, *args)
+
+    async def _drive(self) -> None:
+        import asyncio
+
+        assert self._wake_driver is not None
+        assert self._logs_drained is not None
+
+        loop = asyncio.get_running_loop()
+        next_frame_at = loop.time() + self.refresh_interval
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._wake_driver.wait(),
+                        max(0, next_frame_at - loop.time()),
+                    )
+                except asyncio.TimeoutError:
+                    self.refresh()
+                    next_frame_at = loop.time() + self.refresh_interval
+                else:
+                    # a producer is waiting for room in the queue, apply the
+                    # queued logs but keep the frame rate
+                    self._wake_driver.clear()
+                    self._apply_pending_logs()
+
+                self._logs_drained.set()
+        finally:
+            # don't leave producers waiting once the progress stops
+            self._logs_drained.set()
 
     def get_renderable(self) -> RenderableType:
         return self.style.render_element(self, done=not self._started)
 
+    def get_visible_logs(self) -> List[ProgressLine]:
+        """Return the log lines that fit in `lines_to_show`."""
+        if self.lines_to_show <= 0:
+            return list(self.logs)
+
+        start = max(0, len(self.logs) - self.lines_to_show)
+
+        return list(islice(self.logs, start, None))
+
+    def _get_spill_file(self) -> Optional[IO[str]]:
+        if self._spill_logs_to is None:
+            return None
+
+        if self._spill_file is None:
+            if isinstance(self._spill_logs_to, (str, os.PathLike)):
+                self._spill_file = open(self._spill_logs_to, "w", encoding="utf-8")
+            else:
+                self._spill_file = self._spill_logs_to
+
+        return self._spill_file
+
+    def _spill_text(self, text: str) -> None:
+        spill_file = self._get_spill_file()
+
+        if spill_file is not None:
+            spill_file.write(text)
+
+    def _spill_line(self, line: ProgressLine) -> None:
+        # lines are written once they are complete, kept or suppressed, so
+        # the file holds the full log in order
+        if self._spill_logs_to is not None:
+            text = line.text
+            self._spill_text((text.plain if isinstance(text, Text) else text) + "\n")
+
+    def _close_spill_file(self) -> None:
+        if self._spill_logs_to is None:
+            return
+
+        self._apply_pending_logs()
+
+        # write the lines that were never completed
+        for line in self._open_lines.values():
+            self._spill_line(line)
+
+        if self._spill_file is not None:
+            if self._spill_file is self._spill_logs_to:
+                self._spill_file.flush()
+            else:
+                self._spill_file.close()
+
+        self._spill_logs_to = None
+        self._spill_file = None
+
+    def _take_log_tokens(self, count: int) -> int:
+        """Return how many of `count` new lines are allowed by the rate
+        limit."""
+        if self.log_rate_limit is None:
+            return count
+
+        now = time.monotonic()
+        capacity = max(1.0, self.log_rate_limit)
+
+        self._log_tokens = min(
+            capacity,
+            self._log_tokens + (now - self._log_tokens_at) * self.log_rate_limit,
+        )
+        self._log_tokens_at = now
+
+        allowed = min(count, int(self._log_tokens))
+        self._log_tokens -= allowed
+
+        return allowed
+
+    def _add_log_line(self, text: str | Text) -> ProgressLine:
+        if not self._take_log_tokens(1):
+            self._suppressed_lines += 1
+
+            # not stored, but still continued by `end=""` logs and spilled
+            return ProgressLine(text, self)
+
+        return self._store_log_line(text)
+
+    def _store_log_line(self, text: str | Text) -> ProgressLine:
+        if self.max_logs is not None and len(self._logs) == self.max_logs:
+            evicted = self._logs[0]
+
+            for producer, line in list(self._open_lines.items()):
+                if line is evicted:
+                    self._spill_line(evicted)
+                    del self._open_lines[producer]
+
+        line = ProgressLine(text, self)
+        self._logs.append(line)
+        self._total_lines += 1
+
+        return line
+
     def _append_text(self, target: str | Text, text: str | Text) -> str | Text:
         if isinstance(target, str) and isinstance(text, str):
             return target + text
@@ -121,38 +661,512 @@ class Progress(Live, Element):
         return result
 
     def log(self, text: str | Text, end: str = "\n") -> None:
+        """Log a message.
+
+        Safe to call from multiple threads: calls are queued and applied in
+        order before the next frame. Messages logged with `end=""` are
+        continued by the next call from the same thread.
+        """
+        if self._events is not None and self._events_started:
+            self._emit_log_event(text, end)
+
         if self._preserve_logs and not self._quiet:
-            self.console.print(text, end=end, soft_wrap=True)
+            if isinstance(text, str) and not _NEEDS_RENDERING_RE.search(text + end):
+                # highlighted like `console.print` would, unless that
+                # can't show in the output
+                self._preserve_log(
+                    text + end, highlight=self.console.color_system is not None
+                )
+            else:
+                with self._preserve_lock:
+                    self.flush()
+                    self.console.print(text, end=end, soft_wrap=True)
+
+            return
+
+        self._pending_logs.append((threading.get_ident(), text, end))
+        self._changed = True
+
+        self._limit_pending_logs()
+
+    def _preserve_log(self, text: str, highlight: bool = False) -> None:
+        with self._preserve_lock:
+            if self._preserved_logs and highlight != self._preserved_logs_highlight:
+                self._flush_preserved_logs()
+
+            if not self._preserved_logs:
+                self._preserved_logs_highlight = highlight
+
+                # flush even if nothing else is logged
+                self._preserved_logs_timer = threading.Timer(
+                    self.preserve_logs_flush_interval, self._flush_preserved_logs
+                )
+                self._preserved_logs_timer.daemon = True
+                self._preserved_logs_timer.start()
+
+            self._preserved_logs.append(text)
+            self._preserved_logs_size += len(text)
+
+            if self._preserved_logs_size >= self.preserve_logs_buffer_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the logs buffered with `preserve_logs`.
+
+        This happens automatically when the buffer is full,
+        `preserve_logs_flush_interval` seconds after logging, and when the
+        progress finishes.
+        """
+        self._flush_preserved_logs()
+
+    def _flush_preserved_logs(self) -> None:
+        with self._preserve_lock:
+            if self._preserved_logs_timer is not None:
+                self._preserved_logs_timer.cancel()
+                self._preserved_logs_timer = None
+
+            text = "".join(self._preserved_logs)
+            self._preserved_logs.clear()
+            self._preserved_logs_size = 0
+
+            if not text:
+                return
+
+            if self._preserved_logs_highlight:
+                # no markup or emoji codes, checked when logging
+                self.console.print(
+                    text, end="", soft_wrap=True, markup=False, emoji=False
+                )
+            else:
+                self.console.print(_PlainText(text), end="", soft_wrap=True)
+
+    async def alog(self, text: str | Text, end: str = "\n") -> None:
+        """Log a message from a coroutine.
+
+        When the progress is driven by the event loop (`async with`) and
+        `max_pending_logs` messages are already queued, this waits for the
+        driver to apply them, so fast producers can't outrun the display.
+        """
+        if self._preserve_logs and not self._quiet:
+            self.log(text, end=end)
+            return
+
+        while (
+            self._driver is not None
+            and len(self._pending_logs) >= self.max_pending_logs
+        ):
+            assert self._wake_driver is not None
+            assert self._logs_drained is not None
+
+            self._logs_drained.clear()
+            self._wake_driver.set()
+            await self._logs_drained.wait()
+
+        if self._driver is None:
+            self.log(text, end=end)
+            return
+
+        if self._events is not None and self._events_started:
+            self._emit_log_event(text, end)
+
+        self._pending_logs.append((threading.get_ident(), text, end))
+        self._changed = True
+
+    def _limit_pending_logs(self) -> None:
+        pending = len(self._pending_logs)
+
+        if pending >= self.max_pending_logs:
+            # apply them unless another thread is, but past twice the limit
+            # wait for it, so producers can't outrun whoever applies them
+            self._apply_pending_logs(blocking=pending >= 2 * self.max_pending_logs)
+
+    @contextmanager
+    def _frozen_logs(self) -> Iterator[None]:
+        """Apply the queued logs, then hold the ingest lock until the block
+        exits. Reading the log state from this thread in the block doesn't
+        apply the logs queued since, so a frame shows a single snapshot and
+        costs the same however fast producers are."""
+        self._acquire_ingest_lock()
+
+        try:
+            self._apply_pending_logs()
+
+            frozen_by = self._logs_frozen_by
+            self._logs_frozen_by = threading.get_ident()
+
+            try:
+                yield
+            finally:
+                self._logs_frozen_by = frozen_by
+        finally:
+            self._ingest_lock.release()
+
+    def _apply_pending_logs(self, blocking: bool = True) -> None:
+        if not self._pending_logs or self._logs_frozen_by == threading.get_ident():
+            return
+
+        if not self._acquire_ingest_lock(blocking):
+            # someone else is already applying them, or about to
             return
 
+        try:
+            # only apply what's queued now, producers can keep adding logs
+            # while this runs and the renderer is waiting for the lock
+            for _ in range(len(self._pending_logs)):
+                producer, text, end = self._pending_logs.popleft()
+
+                if isinstance(text, list):
+                    self._apply_lines(producer, text)
+                else:
+                    self._apply_log(producer, text, end)
+        finally:
+            self._ingest_lock.release()
+
+    def _acquire_ingest_lock(self, blocking: bool = True) -> bool:
+        if not blocking and self._ingest_waiters:
+            return False
+
+        if self._ingest_lock.acquire(blocking=False):
+            return True
+
+        if not blocking:
+            return False
+
+        # the lock isn't handed over fairly, producers applying their own
+        # logs in a tight loop would keep taking it before this thread
+        self._ingest_waiters.append(threading.get_ident())
+
+        try:
+            self._ingest_lock.acquire()
+        finally:
+            self._ingest_waiters.pop()
+
+        return True
+
+    def _apply_log(self, producer: int, text: str | Text, end: str) -> None:
         if end != "\n":
             text = self._append_text(text, end)
 
         lines = self._split_log_text(text)
         lines[-1] = (lines[-1][0], lines[-1][1] or end.endswith("\n"))
 
-        should_append = self._log_line_open
-
         if self._inline_logs:
+            open_line = self._open_lines.pop(producer, None)
+
             for line, is_closed in lines:
-                if should_append and self.logs:
-                    self.logs[-1].text = self._append_text(self.logs[-1].text, line)
+                if open_line is not None:
+                    open_line.text = self._append_text(open_line.text, line)
                 else:
-                    self.logs.append(ProgressLine(line, self))
+                    open_line = self._add_log_line(line)
+
+                if is_closed:
+                    self._spill_line(open_line)
+                    open_line = None
 
-                should_append = not is_closed
+            if open_line is not None:
+                self._open_lines[producer] = open_line
         else:
-            if should_append:
-                self.current_message = self._append_text(self.current_message, text)
+            if self._open_message_producer == producer:
+                self._current_message = self._append_text(self._current_message, text)
+            else:
+                self._current_message = text
+
+            self._open_message_producer = None if lines[-1][1] else producer
+
+    def _apply_lines(self, producer: int, lines: List[str]) -> None:
+        # lines are plain text, only the ones kept are turned into `Text`
+        if not self._inline_logs:
+            if self._open_message_producer == producer and len(lines) == 1:
+                self._current_message = self._append_text(
+                    self._current_message, Text(lines[0])
+                )
+            else:
+                self._current_message = Text(lines[-1])
+
+            self._open_message_producer = None
+            return
+
+        open_line = self._open_lines.pop(producer, None)
+
+        if open_line is not None:
+            open_line.text = self._append_text(open_line.text, Text(lines[0]))
+            self._spill_line(open_line)
+            lines = lines[1:]
+
+        if self._spill_logs_to is not None and lines:
+            self._spill_text("\n".join(lines) + "\n")
+
+        allowed = self._take_log_tokens(len(lines))
+        self._suppressed_lines += len(lines) - allowed
+        lines = lines[:allowed]
+
+        if self.max_logs is not None and self._open_lines:
+            # evicted lines need to be closed one by one
+            for line in lines:
+                self._store_log_line(Text(line))
+
+            return
+
+        if self.max_logs is not None and len(lines) > self.max_logs:
+            self._total_lines += len(lines) - self.max_logs
+            lines = lines[-self.max_logs :]
+
+        self._logs.extend([ProgressLine(Text(line), self) for line in lines])
+        self._total_lines += len(lines)
+
+    def _log_lines(self, lines: List[str]) -> None:
+        # log complete lines of plain text (not markup) in one go
+        if self._events is not None and self._events_started:
+            self._events.log(self._event_id, lines)
+
+        if self._preserve_logs and not self._quiet:
+            text = "\n".join(lines) + "\n"
+
+            if _CONTROL_CODES_RE.search(text):
+                with self._preserve_lock:
+                    self.flush()
+                    self.console.print(Text(text), end="", soft_wrap=True)
             else:
-                self.current_message = text
+                self._preserve_log(text)
+
+            return
+
+        self._pending_logs.append((threading.get_ident(), lines, "\n"))
+        self._changed = True
 
-            should_append = not lines[-1][1]
+        self._limit_pending_logs()
 
-        self._log_line_open = should_append
+    def follow(
+        self,
+        command: Command,
+        error_message: Optional[str] = None,
+        encoding: str = "utf-8",
+        **popen_kwargs: Any,
+    ) -> int:
+        """Run a command, or wait for a running process, logging everything
+        it writes to stdout and stderr.
+
+        Output is read straight from the pipes and logged in batches of
+        lines, as plain text.
+
+        Args:
+            command: Command to run, as a string or a list of arguments, or a
+                `subprocess.Popen` started with `stdout` and/or `stderr` set
+                to `subprocess.PIPE`.
+            error_message: Set as the progress error when the command exits
+                with a non-zero code. The progress isn't marked as errored
+                when `None`.
+            encoding: Encoding of the command's output.
+            **popen_kwargs: Additional arguments passed to `subprocess.Popen`.
+
+        Returns:
+            The command's exit code.
+        """
+        from ._subprocess import follow_process, start_process
+
+        process = start_process(command, **popen_kwargs)
+        exit_code = follow_process(process, self._log_lines, encoding=encoding)
+
+        if exit_code != 0 and error_message is not None:
+            self.set_error(error_message)
+
+        return exit_code
 
     def set_error(self, text: str) -> None:
+        self._emit("error", message=text)
+        self.flush()
         self.current_message = text
         self.is_error = True
         self.transient = self._transient_on_error
-        self._log_line_open = False
+
+        for line in self._open_lines.values():
+            self._spill_line(line)
+
+        self._open_lines.clear()
+        self._open_message_producer = None
+
+    def track(self, iterable: Iterable[T]) -> Iterator[T]:
+        """Start the progress and iterate over `iterable`, advancing the
+        progress by one per item. The progress finishes when the iteration
+        ends, or when the iterator is dropped (e.g. after a `break`).
+
+        Items are not counted one by one in Python: the number of completed
+        items is read from the iterator, or from a counter advanced in C, once
+        per frame.
+        """
+        source: Iterator[T] = iter(iterable)
+        size = len(iterable) if isinstance(iterable, Sized) else None
+
+        if self.total is None:
+            self.total = size
+
+        if size is not None and hasattr(type(source), "__length_hint__"):
+            self._count_completed = lambda: size - length_hint(source)
+        else:
+            # `compress` yields every item, taking one `True` out of `counter`
+            # for each, so the count is read from what's left of it
+            counter = repeat(True, sys.maxsize)
+            source = compress(source, counter)
+
+            self._count_completed = lambda: sys.maxsize - length_hint(counter)
+
+        self.__enter__()
+
+        return _TrackedIterator(self, source)
+
+    def _finish_tracking(self) -> None:
+        self._sample_speed()
+        self.__exit__(None, None, None)
+        self._count_completed = None
+
+
+class _TrackedIterator(chain):  # type: ignore[type-arg]
+    # iterating is done by `chain` in C, the last iterable finishes the
+    # progress, and `__del__` finishes it when the loop exits early
+    progress: Progress
+
+    def __new__(cls, progress: Progress, source: Iterator[Any]) -> _TrackedIterator:
+        iterator = super().__new__(cls, source, iter(progress._finish_tracking, None))
+        iterator.progress = progress
+
+        return iterator
+
+    def __del__(self) -> None:
+        self.progress.__exit__(None, None, None)
+
+
+class ProgressTask(Progress):
+    """A progress rendered as part of a `ProgressGroup`.
+
+    It's drawn by the group's live display, so starting or stopping it only
+    changes its state.
+    """
+
+    def __init__(self, title: str, group: ProgressGroup, **kwargs: Any) -> None:
+        self.group = group
+
+        super().__init__(title, **kwargs)
+
+    def start(self, refresh: bool = False) -> None:
+        self._started = True
+        self._changed = True
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+
+        self._started = False
+        self._changed = True
+
+        if self.transient or (self.is_error and self._transient_on_error):
+            self.group.remove_task(self)
+
+    def refresh(self) -> None:
+        self._changed = True
+
+    def _start_event(self) -> Dict[str, Any]:
+        return {**super()._start_event(), "group": self.group._event_id}
+
+    async def __aenter__(self) -> "ProgressTask":
+        self.__enter__()
+
+        return self
+
+    async def __aexit__(self, exc_type: type | None, *args: object) -> None:
+        self.__exit__(exc_type, *args)
+
+
+class ProgressGroup(Progress):
+    """Render many progress tasks in a single live display.
+
+    Tasks are added with `add_task` and each have their own title, message,
+    error state and inline logs. The group draws all of them in one frame,
+    from a single refresh loop.
+    """
+
+    def __init__(self, title: str = "", **kwargs: Any) -> None:
+        self._tasks: List[ProgressTask] = []
+
+        super().__init__(title, **kwargs)
+
+    @property
+    def tasks(self) -> List[ProgressTask]:
+        with self._lock:
+            return list(self._tasks)
+
+    def add_task(
+        self,
+        title: str,
+        transient: bool = False,
+        transient_on_error: bool = False,
+        inline_logs: bool = False,
+        lines_to_show: int = -1,
+        max_logs: Optional[int] = None,
+        spill_logs_to: Union[str, os.PathLike[str], IO[str], None] = None,
+        log_rate_limit: Optional[float] = None,
+        total: Optional[float] = None,
+        **metadata: Any,
+    ) -> ProgressTask:
+        """Add a task to the group.
+
+        The task is displayed as running once it's started, usually with
+        `with group.add_task(...) as task:`, and as done once it's stopped.
+
+        Args:
+            title: Initial task message.
+            transient: Remove the task from the group when it finishes.
+            transient_on_error: Remove the task from the group when it errors.
+            inline_logs: Display logged messages as separate lines.
+            lines_to_show: Maximum number of inline log lines to display.
+                Negative values display all lines.
+            max_logs: Maximum number of inline log lines kept in memory.
+            spill_logs_to: Path or text file where every inline log line is
+                written.
+            log_rate_limit: Maximum number of inline log lines stored per
+                second, the others are counted as suppressed.
+            total: Number of steps to complete, see `Progress.advance`.
+            **metadata: Additional metadata passed to the style renderer.
+        """
+        task = ProgressTask(
+            title,
+            group=self,
+            style=self.style,
+            console=self.console,
+            transient=transient,
+            transient_on_error=transient_on_error,
+            inline_logs=inline_logs,
+            lines_to_show=lines_to_show,
+            preserve_logs=self._preserve_logs,
+            quiet=self._quiet,
+            max_logs=max_logs,
+            spill_logs_to=spill_logs_to,
+            log_rate_limit=log_rate_limit,
+            total=total,
+            events=self._events,
+            **metadata,
+        )
+
+        with self._lock:
+            self._tasks.append(task)
+            self._changed = True
+
+        return task
+
+    def remove_task(self, task: ProgressTask) -> None:
+        with self._lock:
+            if task in self._tasks:
+                self._tasks.remove(task)
+                self._changed = True
+
+    def refresh(self) -> None:
+        with self._lock, ExitStack() as frozen:
+            for task in self._tasks:
+                frozen.enter_context(task._frozen_logs())
+                task._sample_speed()
+
+                if task._has_changed():
+                    task._changed = False
+                    task._rendered_completed = task.completed
+                    self._changed = True
+
+            super().refresh()
@@ -1,7 +1,34 @@
-from .base import BaseStyle
-from .border import BorderedStyle
-from .fancy import FancyStyle
-from .minimal import MinimalStyle
-from .tagged import TaggedStyle
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .base import BaseStyle
+    from .border import BorderedStyle
+    from .fancy import FancyStyle
+    from .minimal import MinimalStyle
+    from .tagged import TaggedStyle
 
 __all__ = ["BaseStyle", "BorderedStyle", "TaggedStyle", "FancyStyle", "MinimalStyle"]
+
+# Only import the styles that are actually used
+_lazy_imports = {
+    "BaseStyle": "base",
+    "BorderedStyle": "border",
+    "FancyStyle": "fancy",
+    "MinimalStyle": "minimal",
+    "TaggedStyle": "tagged",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_imports:
+        module = __import__(_lazy_imports[name], globals(), locals(), [name], level=1)
+        value = getattr(module, name)
+        globals()[name] = value
+
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Type, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from rich.color import Color
 from rich.console import Console, ConsoleRenderable, Group, RenderableType
+from rich.style import Style
 from rich.text import Text
 from rich.theme import Theme
 from typing_extensions import Literal
@@ -13,15 +24,47 @@ from rich_toolkit.container import Container
 from rich_toolkit.element import CursorOffset, Element
 from rich_toolkit.input import Input
 from rich_toolkit.menu import Menu
-from rich_toolkit.progress import Progress, ProgressLine
+from rich_toolkit.progress import Progress, ProgressGroup, ProgressLine
 from rich_toolkit.spacer import Spacer
 from rich_toolkit.utils.colors import (
-    fade_text,
-    get_terminal_background_color,
-    get_terminal_text_color,
+    TerminalColors,
+    detect_terminal_colors_in_background,
+    get_fade_table,
+    get_terminal_colors,
     lighten,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def _format_count(value: float) -> str:
+    if value == int(value):
+        return f"{int(value):,}"
+
+    return f"{value:,.1f}"
+
+
+def _format_rate(speed: float) -> str:
+    units = ["", "k", "M", "G"]
+
+    while abs(speed) >= 1000 and len(units) > 1:
+        speed /= 1000
+        units.pop(0)
+
+    return f"{speed:.1f}{units[0]}/s"
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours:
+        return f"{hours}:{minutes:02}:{seconds:02}"
+
+    return f"{minutes}:{seconds:02}"
+
+
 ConsoleRenderableClass = TypeVar(
     "ConsoleRenderableClass", bound=Type[ConsoleRenderable]
 )
@@ -49,17 +92,46 @@ class BaseStyle:
     }
 
     _should_show_progress_title = True
+    progress_bar_width = 30
 
     def __init__(
         self,
         theme: Optional[Dict[str, str]] = None,
         background_color: str = "#000000",
         text_color: str = "#FFFFFF",
+        detect_colors_in_background: bool = False,
     ):
-        self.background_color = get_terminal_background_color(background_color)
-        self.text_color = get_terminal_text_color(text_color)
+        """Create a style.
+
+        Args:
+            theme: Rich theme overrides.
+            background_color: Background color used when the terminal doesn't
+                report one.
+            text_color: Text color used when the terminal doesn't report one.
+            detect_colors_in_background: Query the terminal colors on a
+                background thread instead of blocking. The default colors are
+                used until the terminal answers.
+        """
+        self._terminal_colors: Optional[Future[TerminalColors]] = None
+
+        if detect_colors_in_background:
+            self.text_color = text_color
+            self.background_color = background_color
+
+            self._terminal_colors = detect_terminal_colors_in_background()
+            self._terminal_colors.add_done_callback(self._apply_terminal_colors)
+        else:
+            self.text_color, self.background_color = get_terminal_colors(
+                text_color, background_color
+            )
+
         self.animation_counter = 0
 
+        self._palette_theme_styles: Optional[Tuple[Style, Style]] = None
+        self._animation_base_colors: Dict[str, Color] = {}
+        self._animation_palettes: Dict[Tuple[int, bool, str, Color], list[Color]] = {}
+        self._animation_styles: Dict[Tuple[int, bool, str, Color], list[Style]] = {}
+
         base_theme = Theme(self.base_theme)
         self.theme = base_theme
         self.console = Console(theme=base_theme)
@@ -67,6 +139,17 @@ class BaseStyle:
         if theme:
             self.console.push_theme(Theme(theme))
 
+    def _apply_terminal_colors(self, future: Future[TerminalColors]) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        colors = future.result()
+
+        # fade tables are looked up by these values and animation palettes
+        # don't depend on them, so swapping them is enough
+        self.text_color = colors["text"] or self.text_color
+        self.background_color = colors["background"] or self.background_color
+
     def empty_line(self) -> RenderableType:
         return " "
 
@@ -76,14 +159,27 @@ class BaseStyle:
     def render_context_exit(self) -> Optional[RenderableType]:
         return ""
 
-    def _get_animation_colors(
-        self,
-        steps: int = 5,
-        breathe: bool = False,
-        animation_status: Literal["started", "stopped", "error"] = "started",
-        **metadata: Any,
-    ) -> list[Color]:
-        animated = animation_status == "started"
+    def _check_palette_theme(self) -> None:
+        # palettes depend on the "progress" and "error" styles, forget them
+        # when a pushed or popped theme changes either of them
+        theme_styles = (
+            self.console.get_style("progress"),
+            self.console.get_style("error"),
+        )
+
+        if theme_styles != self._palette_theme_styles:
+            self._palette_theme_styles = theme_styles
+            self._animation_base_colors.clear()
+            self._animation_palettes.clear()
+            self._animation_styles.clear()
+
+    def _get_animation_base_color(
+        self, animation_status: Literal["started", "stopped", "error"]
+    ) -> Color:
+        base_color = self._animation_base_colors.get(animation_status)
+
+        if base_color is not None:
+            return base_color
 
         if animation_status == "error":
             base_color = self.console.get_style("error").color
@@ -97,6 +193,46 @@ class BaseStyle:
         if not base_color:
             base_color = Color.from_rgb(255, 255, 255)
 
+        self._animation_base_colors[animation_status] = base_color
+
+        return base_color
+
+    def _get_animation_palette_key(
+        self,
+        steps: int,
+        breathe: bool,
+        animation_status: Literal["started", "stopped", "error"],
+    ) -> Tuple[int, bool, str, Color]:
+        self._check_palette_theme()
+
+        return (
+            steps,
+            breathe,
+            animation_status,
+            self._get_animation_base_color(animation_status),
+        )
+
+    def _get_animation_colors(
+        self,
+        steps: int = 5,
+        breathe: bool = False,
+        animation_status: Literal["started", "stopped", "error"] = "started",
+        **metadata: Any,
+    ) -> list[Color]:
+        """Return the colors of each animation frame.
+
+        The returned list is shared between calls and must not be modified.
+        """
+        key = self._get_animation_palette_key(steps, breathe, animation_status)
+        base_color = key[3]
+
+        colors = self._animation_palettes.get(key)
+
+        if colors is not None:
+            return colors
+
+        animated = animation_status == "started"
+
         if breathe:
             steps = steps // 2
 
@@ -112,8 +248,42 @@ class BaseStyle:
         if breathe:
             colors = colors + colors[::-1]
 
+        self._animation_palettes[key] = colors
+
         return colors
 
+    def _progress_animation_status(
+        self, element: Progress, parent: Optional[Element] = None
+    ) -> Optional[Literal["error"]]:
+        """Return the animation status that overrides the usual one for a
+        progress: failed tasks of a group use the error palette, so they
+        stand out among the others."""
+        if isinstance(parent, ProgressGroup) and element.is_error:
+            return "error"
+
+        return None
+
+    def _get_animation_styles(
+        self,
+        steps: int = 5,
+        breathe: bool = False,
+        animation_status: Literal["started", "stopped", "error"] = "started",
+    ) -> list[Style]:
+        """Like `_get_animation_colors`, but returns a foreground `Style` for
+        each frame, so frames don't need to build their own styles."""
+        key = self._get_animation_palette_key(steps, breathe, animation_status)
+
+        styles = self._animation_styles.get(key)
+
+        if styles is None:
+            colors = self._get_animation_colors(
+                steps=steps, breathe=breathe, animation_status=animation_status
+            )
+            styles = [Style(color=color) for color in colors]
+            self._animation_styles[key] = styles
+
+        return styles
+
     def _count_label_lines(self, label: str, decoration_width: int = 0) -> int:
         available_width = self.console.width - decoration_width
         if available_width <= 0:
@@ -153,13 +323,19 @@ class BaseStyle:
             return self.render_input(element, is_active, done, parent)
         elif isinstance(element, Menu):
             return self.render_menu(element, is_active, done, parent)
-        elif isinstance(element, Progress):
+        elif isinstance(element, ProgressGroup):
             self.animation_counter += 1
 
+            return self.render_progress_group(element, is_active, done, parent)
+        elif isinstance(element, Progress):
+            # tasks of a group are animated once per group frame
+            if not isinstance(parent, ProgressGroup):
+                self.animation_counter += 1
+
             return self.render_progress(element, is_active, done, parent)
         elif isinstance(element, ProgressLine):
             return self.render_progress_log_line(
-                element.text,
+                element,
                 parent=parent,
                 index=kwargs.get("index", 0),
                 max_lines=kwargs.get("max_lines", -1),
@@ -455,11 +631,7 @@ class BaseStyle:
         content: str | Group | Text = element.current_message
 
         if element.logs and element._inline_logs:
-            lines_to_show = (
-                element.logs[-element.lines_to_show :]
-                if element.lines_to_show > 0
-                else element.logs
-            )
+            lines_to_show = element.get_visible_logs()
 
             start_content = [element.title, ""]
 
@@ -473,15 +645,80 @@ class BaseStyle:
                         line,
                         index=index,
                         max_lines=element.lines_to_show,
-                        total_lines=len(element.logs),
+                        total_lines=element.total_lines,
                         parent=element,
                     )
                     for index, line in enumerate(lines_to_show)
                 ],
+                *self._render_suppressed_lines_message(element),
             )
 
+        if (bar := self._render_progress_bar(element)) is not None:
+            content = Group(content, bar)
+
         return content
 
+    def _render_progress_bar(self, element: Progress) -> Optional[RenderableType]:
+        """Render the completed steps, the rate and the time left, when the
+        progress has a total or was advanced."""
+        if element.total is None and not element.completed:
+            return None
+
+        stats: List[str] = []
+
+        if element.total is None:
+            stats.append(_format_count(element.completed))
+        else:
+            percentage = (
+                element.completed / element.total * 100 if element.total else 100
+            )
+            stats.append(
+                f"{percentage:.0f}% "
+                f"{_format_count(element.completed)}/{_format_count(element.total)}"
+            )
+
+        if element.speed:
+            stats.append(_format_rate(element.speed))
+
+        if (eta := element.eta) is not None and element.completed < (
+            element.total or 0
+        ):
+            stats.append(f"ETA {_format_duration(eta)}")
+
+        text = Text(
+            " · ".join(stats),
+            style=self.console.get_style("progress.stats", default="dim"),
+        )
+
+        if element.total is None:
+            return text
+
+        from rich.progress_bar import ProgressBar
+        from rich.table import Table
+
+        grid = Table.grid(padding=(0, 1))
+        grid.add_row(
+            ProgressBar(
+                total=element.total,
+                completed=element.completed,
+                width=self.progress_bar_width,
+            ),
+            text,
+        )
+
+        return grid
+
+    def _render_suppressed_lines_message(self, element: Progress) -> List[Text]:
+        if not element.suppressed_lines:
+            return []
+
+        return [
+            Text(
+                f"… {element.suppressed_lines:,} lines suppressed",
+                style=self.console.get_style("progress.suppressed", default="dim"),
+            )
+        ]
+
     def _progress_has_content_beyond_title(self, element: Progress) -> bool:
         if element.logs and element._inline_logs:
             return True
@@ -505,15 +742,49 @@ class BaseStyle:
 
         return content
 
+    def render_progress_group(
+        self,
+        element: ProgressGroup,
+        is_active: bool = False,
+        done: bool = False,
+        parent: Optional[Element] = None,
+    ) -> RenderableType:
+        content: list[RenderableType] = []
+
+        if element.title:
+            content.append(
+                self.render_element(element.title, title=True, parent=element)
+            )
+
+        for task in element.tasks:
+            content.append(
+                self.render_element(
+                    task,
+                    done=done or not task._started,
+                    parent=element,
+                )
+            )
+
+        if done and element._cancelled:
+            content.append(self._render_cancelled_progress_message())
+
+        return Group(*content)
+
     def render_progress_log_line(
         self,
-        line: str | Text,
+        line: str | Text | ProgressLine,
         index: int,
         max_lines: int = -1,
         total_lines: int = -1,
         parent: Optional[Element] = None,
     ) -> Text:
-        line = Text.from_markup(line) if isinstance(line, str) else line
+        progress_line: Optional[ProgressLine] = None
+
+        if isinstance(line, ProgressLine):
+            progress_line, line = line, line.parsed_text
+        elif isinstance(line, str):
+            line = Text.from_markup(line)
+
         if max_lines == -1:
             return line
 
@@ -537,9 +808,10 @@ class BaseStyle:
             1.0 - current_min_brightness
         ) + current_min_brightness
 
-        return fade_text(
-            line,
-            text_color=Color.parse(self.text_color),
-            background_color=self.background_color,
-            brightness_multiplier=brightness_multiplier,
-        )
+        fade_table = get_fade_table(self.text_color, self.background_color)
+
+        if progress_line is not None:
+            # the line keeps its faded copy between frames
+            return progress_line.fade(fade_table, brightness_multiplier)
+
+        return fade_table.fade_text(line, brightness_multiplier)
@@ -20,6 +20,8 @@ from .base import BaseStyle
 class BorderedStyle(BaseStyle):
     box = box.SQUARE
     _should_show_progress_title = False
+    # leave room for the stats inside the box
+    progress_bar_width = 10
 
     def empty_line(self) -> RenderableType:
         return ""
@@ -168,11 +170,7 @@ class BorderedStyle(BaseStyle):
         title = element.title
 
         if element.logs and element._inline_logs:
-            lines_to_show = (
-                element.logs[-element.lines_to_show :]
-                if element.lines_to_show > 0
-                else element.logs
-            )
+            lines_to_show = element.get_visible_logs()
 
             content = Group(
                 *[
@@ -180,15 +178,27 @@ class BorderedStyle(BaseStyle):
                         line,
                         index=index,
                         max_lines=element.lines_to_show,
-                        total_lines=len(element.logs),
+                        total_lines=element.total_lines,
                     )
                     for index, line in enumerate(lines_to_show)
-                ]
+                ],
+                *self._render_suppressed_lines_message(element),
             )
 
+        if (bar := self._render_progress_bar(element)) is not None:
+            content = Group(content, bar)
+
         border_color = Color.parse("white")
 
-        if not done:
+        animation_status = self._progress_animation_status(element, parent)
+
+        if animation_status is not None:
+            colors = self._get_animation_colors(
+                steps=10, animation_status=animation_status, breathe=True
+            )
+
+            border_color = colors[self.animation_counter % 10]
+        elif not done:
             colors = self._get_animation_colors(
                 steps=10, animation_status="started", breathe=True
             )
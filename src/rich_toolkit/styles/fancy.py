@@ -3,14 +3,13 @@ from typing import Any, Dict, List, Optional
 from rich._loop import loop_first_last
 from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
 from rich.segment import Segment
-from rich.style import Style
 from rich.text import Text
 from typing_extensions import Literal
 
 from rich_toolkit.container import Container
 from rich_toolkit.element import CursorOffset, Element
 from rich_toolkit.form import Form
-from rich_toolkit.progress import Progress
+from rich_toolkit.progress import Progress, ProgressGroup
 from rich_toolkit.styles.base import BaseStyle
 
 
@@ -24,6 +23,7 @@ class FancyPanel:
         is_animated: Optional[bool] = None,
         animation_counter: Optional[int] = None,
         done: bool = False,
+        animation_status: Optional[Literal["started", "stopped", "error"]] = None,
     ) -> None:
         self.renderable = renderable
         self._title = title
@@ -34,6 +34,7 @@ class FancyPanel:
         self.counter = animation_counter or 0
         self.style = style
         self.done = done
+        self.animation_status = animation_status
 
     def _get_decoration(self, suffix: str = "") -> Segment:
         char = "┌" if self.metadata.get("title") else "◆"
@@ -41,14 +42,14 @@ class FancyPanel:
         animated = not self.done and self.is_animated
 
         animation_status: Literal["started", "stopped", "error"] = (
-            "started" if animated else "stopped"
+            self.animation_status or ("started" if animated else "stopped")
         )
 
-        color = self.style._get_animation_colors(
+        style = self.style._get_animation_styles(
             steps=14, breathe=True, animation_status=animation_status
         )[self.counter % 14]
 
-        return Segment(char + suffix, style=Style.from_color(color))
+        return Segment(char + suffix, style=style)
 
     def _strip_trailing_newlines(
         self, lines: List[List[Segment]]
@@ -110,6 +111,13 @@ class FancyStyle(BaseStyle):
         self.decoration_size = 2
 
     def _should_decorate(self, element: Any, parent: Optional[Element] = None) -> bool:
+        if isinstance(element, ProgressGroup):
+            # each task is decorated instead
+            return False
+
+        if isinstance(parent, ProgressGroup):
+            return True
+
         return not isinstance(parent, (Progress, Container))
 
     def render_element(
@@ -123,10 +131,12 @@ class FancyStyle(BaseStyle):
         title: Optional[str] = None
 
         is_animated = False
+        animation_status = None
 
-        if isinstance(element, Progress):
+        if isinstance(element, Progress) and not isinstance(element, ProgressGroup):
             title = element.title
             is_animated = True
+            animation_status = self._progress_animation_status(element, parent)
 
         rendered = super().render_element(
             element=element, is_active=is_active, done=done, parent=parent, **metadata
@@ -141,6 +151,7 @@ class FancyStyle(BaseStyle):
                 done=done,
                 animation_counter=self.animation_counter,
                 style=self,
+                animation_status=animation_status,
             )
 
         return rendered
@@ -163,6 +174,24 @@ class FancyStyle(BaseStyle):
 
         return super().render_progress(element, is_active, done, parent)
 
+    def render_progress_group(
+        self,
+        element: ProgressGroup,
+        is_active: bool = False,
+        done: bool = False,
+        parent: Optional[Element] = None,
+    ) -> RenderableType:
+        group = super().render_progress_group(element, is_active, done, parent)
+
+        assert isinstance(group, Group)
+
+        # panels don't end with a new line, as they are usually printed on
+        # their own, so end each of them here
+        return Group(
+            *[Group(renderable, Text()) for renderable in group.renderables[:-1]],
+            *group.renderables[-1:],
+        )
+
     def empty_line(self) -> Text:
         """Return an empty line with decoration.
 
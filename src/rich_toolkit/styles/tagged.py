@@ -3,13 +3,12 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from rich.console import Group, RenderableType
 from rich.segment import Segment
-from rich.style import Style
 from rich.table import Column, Table
 from typing_extensions import Literal
 
 from rich_toolkit.container import Container
 from rich_toolkit.element import CursorOffset, Element
-from rich_toolkit.progress import Progress, ProgressLine
+from rich_toolkit.progress import Progress, ProgressGroup, ProgressLine
 
 from .base import BaseStyle
 
@@ -22,7 +21,12 @@ class TaggedStyle(BaseStyle):
     block = "█"
     block_length = 5
 
-    def __init__(self, tag_width: int = 12, theme: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        tag_width: int = 12,
+        theme: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ):
         self.tag_width = tag_width
 
         theme = theme or {
@@ -30,7 +34,7 @@ class TaggedStyle(BaseStyle):
             "tag": "bold",
         }
 
-        super().__init__(theme=theme)
+        super().__init__(theme=theme, **kwargs)
 
     def _get_tag_segments(
         self,
@@ -51,19 +55,17 @@ class TaggedStyle(BaseStyle):
                 animation_status = "started" if not done else "stopped"
 
             tag = " " * self.block_length
-            colors = self._get_animation_colors(
+            styles = self._get_animation_styles(
                 steps=self.block_length, animation_status=animation_status
             )
 
             if done:
-                colors = [colors[-1]]
+                styles = [styles[-1]]
 
             tag_segments = [
                 Segment(
                     self.block,
-                    style=Style(
-                        color=colors[(self.animation_counter + i) % len(colors)]
-                    ),
+                    style=styles[(self.animation_counter + i) % len(styles)],
                 )
                 for i in range(self.block_length)
             ]
@@ -124,8 +126,10 @@ class TaggedStyle(BaseStyle):
         parent: Optional[Element] = None,
         **kwargs: Any,
     ) -> RenderableType:
-        is_animated = isinstance(element, Progress)
-        should_tag = not isinstance(element, (ProgressLine, Container))
+        is_animated = isinstance(element, Progress) and not isinstance(
+            element, ProgressGroup
+        )
+        should_tag = not isinstance(element, (ProgressLine, Container, ProgressGroup))
 
         rendered = super().render_element(
             element=element, is_active=is_active, done=done, parent=parent, **kwargs
@@ -139,6 +143,8 @@ class TaggedStyle(BaseStyle):
             animation_status = None
             if isinstance(element, Progress) and element._cancelled:
                 animation_status = "error"
+            elif isinstance(element, Progress):
+                animation_status = self._progress_animation_status(element, parent)
 
             rendered = self._tag_element(
                 rendered,
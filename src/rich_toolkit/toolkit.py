@@ -1,34 +1,41 @@
 from __future__ import annotations
 
-import inspect
 import json
 import os
 import sys
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from functools import wraps
 from typing import (
+    IO,
+    TYPE_CHECKING,
     Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
     Callable,
+    Deque,
     Dict,
     List,
     Literal,
     Optional,
     TypeVar,
     Union,
-    cast,
     overload,
 )
 
 from rich.console import ConsoleRenderable, RenderableType
-from rich.pretty import Pretty
 from rich.text import Text
 from rich.theme import Theme
 from typing_extensions import Concatenate, ParamSpec
 
-from .input import Input
-from .menu import Menu, Option, ReturnValue
-from .progress import Progress
-from .styles.base import BaseStyle
+from ._serialize import stream_encoder, to_json_data
+
+if TYPE_CHECKING:
+    from ._events import ProgressEvents
+    from ._json import JSONEncoderName, JSONLinesWriter, JSONSink, StdlibEncoder
+    from .menu import Option, ReturnValue
+    from .progress import Progress, ProgressGroup, RefreshPolicy
+    from .styles.base import BaseStyle
 
 OutputT = TypeVar("OutputT")
 ReturnT = TypeVar("ReturnT")
@@ -37,6 +44,10 @@ OutputRenderer = Union[
     Callable[[OutputT], Optional[RenderableType]],
     Callable[[OutputT, "RichToolkit"], Optional[RenderableType]],
 ]
+AsyncOutputRenderer = Union[
+    Callable[[OutputT], Awaitable[Optional[RenderableType]]],
+    Callable[[OutputT, "RichToolkit"], Awaitable[Optional[RenderableType]]],
+]
 
 
 def _unavailable_in_json_mode(
@@ -64,27 +75,46 @@ def _is_output_stream(data: Any) -> bool:
     return isinstance(data, Iterator)
 
 
-def _is_ci_enabled() -> bool:
-    value = os.environ.get("CI")
+def _is_async_output_stream(data: Any) -> bool:
+    return hasattr(data, "__aiter__")
 
-    if value is None:
-        return False
 
-    return value.lower() not in {"", "0", "false", "no", "off"}
+async def _flush_while_waiting(
+    data: AsyncIterable[Any], writer: JSONLinesWriter
+) -> AsyncIterator[Any]:
+    """Iterate over `data`, flushing `writer` when its interval passes while
+    waiting for the next item."""
+    import asyncio
+
+    iterator = data.__aiter__()
 
+    while True:
+        next_item = asyncio.ensure_future(iterator.__anext__())
 
-def _dump_output_data(data: Any) -> Any:
-    model_dump = getattr(data, "model_dump", None)
-    if callable(model_dump):
-        return _dump_output_data(model_dump(mode="json"))
+        try:
+            while not next_item.done():
+                await asyncio.wait({next_item}, timeout=writer.time_until_flush())
 
-    if isinstance(data, dict):
-        return {key: _dump_output_data(value) for key, value in data.items()}
+                if not next_item.done():
+                    await writer.aflush()
+        finally:
+            next_item.cancel()
 
-    if isinstance(data, (list, tuple)):
-        return [_dump_output_data(item) for item in data]
+        try:
+            item = next_item.result()
+        except StopAsyncIteration:
+            return
+
+        yield item
+
+
+def _is_ci_enabled() -> bool:
+    value = os.environ.get("CI")
+
+    if value is None:
+        return False
 
-    return data
+    return value.lower() not in {"", "0", "false", "no", "off"}
 
 
 def _format_output_value(value: Any) -> str:
@@ -99,7 +129,9 @@ def _record_lines(data: dict[Any, Any]) -> list[str]:
 
 
 def _default_output_renderable(data: Any) -> RenderableType:
-    dumped = _dump_output_data(data)
+    from rich.pretty import Pretty
+
+    dumped = to_json_data(data)
 
     if isinstance(dumped, dict):
         return Text("\n".join(_record_lines(dumped)))
@@ -131,6 +163,12 @@ class RichToolkit:
         handle_keyboard_interrupts: bool = True,
         mode: Literal["human", "json"] = "human",
         preserve_progress_logs: Optional[bool] = None,
+        progress_events: Union[bool, int, IO[str]] = False,
+        json_encoder: JSONEncoderName = "auto",
+        json_flush_items: Optional[int] = 1,
+        json_flush_bytes: Optional[int] = None,
+        json_flush_interval: Optional[float] = None,
+        json_sink: Optional[JSONSink] = None,
     ) -> None:
         """Create a toolkit.
 
@@ -142,12 +180,51 @@ class RichToolkit:
             preserve_progress_logs: Print each progress log message immediately
                 without inserting line breaks at the console width. When `None`,
                 this is enabled in CI and for non-interactive consoles.
+            progress_events: In JSON mode, write progress events (start, log,
+                advance, title, error, cancel and done) as JSON lines to
+                stderr when `True`, or to the given file descriptor or text
+                file. See `rich_toolkit._events` for their format.
+            json_encoder: JSON encoder used in JSON mode. `"auto"` uses orjson
+                or msgspec when they're installed, and the standard library
+                otherwise. All encoders write the same compact JSON.
+            json_flush_items: When streaming JSON lines, write the buffered
+                lines every this many lines. The default writes each line
+                right away, for consumers reading them as they come; `None`
+                leaves it to the other limits.
+            json_flush_bytes: Write the buffered lines once they take this
+                many bytes.
+            json_flush_interval: Write the buffered lines when a line is
+                added this many seconds after the first buffered one.
+                Buffered lines are always written when the stream ends or
+                fails.
+            json_sink: Where JSON mode writes its output instead of stdout:
+                a path (truncated, or connected to when it's a Unix socket),
+                a file descriptor, or a binary file. Buffered lines are
+                written together with `os.writev()` when the sink has a file
+                descriptor.
         """
         if mode not in ("human", "json"):
             raise ValueError("mode must be 'human' or 'json'")
 
         self.mode = mode
         self._json_output_written = False
+        self.json_encoder = json_encoder
+        self._json_encoder: Optional[StdlibEncoder] = None
+        self.json_flush_items = json_flush_items
+        self.json_flush_bytes = json_flush_bytes
+        self.json_flush_interval = json_flush_interval
+
+        if json_sink is not None and mode != "json":
+            raise ValueError("json_sink is only available in JSON mode")
+
+        self.json_sink = json_sink
+
+        self._progress_events: Optional[ProgressEvents] = None
+        if progress_events is not False:
+            if mode != "json":
+                raise ValueError("progress_events is only available in JSON mode")
+
+            self._progress_events = self._create_progress_events(progress_events)
 
         self.theme = theme
         if theme is not None:
@@ -170,6 +247,20 @@ class RichToolkit:
 
         self.handle_keyboard_interrupts = handle_keyboard_interrupts
 
+    def _create_progress_events(
+        self, progress_events: Union[bool, int, IO[str]]
+    ) -> ProgressEvents:
+        from ._events import ProgressEvents
+
+        if progress_events is True:
+            file: IO[str] = sys.stderr
+        elif isinstance(progress_events, int):
+            file = os.fdopen(progress_events, "w", encoding="utf-8", closefd=False)
+        else:
+            file = progress_events
+
+        return ProgressEvents(file, encode=self._encode_json)
+
     def __enter__(self):
         if self.mode == "human":
             if (renderable := self.style.render_context_enter()) is not None:
@@ -188,6 +279,9 @@ class RichToolkit:
             if (renderable := self.style.render_context_exit()) is not None:
                 self.console.print(renderable)
 
+        if self._progress_events is not None:
+            self._progress_events.flush()
+
         return None
 
     def print_title(self, title: str, end: str = "\n", **metadata: Any) -> None:
@@ -233,63 +327,74 @@ class RichToolkit:
 
         self.console.print(self.style.empty_line())
 
-    def _write_json_line(self, data: Any) -> None:
-        payload = json.dumps(
-            _dump_output_data(data),
-            ensure_ascii=False,
-            allow_nan=False,
-        )
-        sys.stdout.write(payload + "\n")
-        sys.stdout.flush()
+    def _encode_json(self, data: Any) -> bytes:
+        if self._json_encoder is None:
+            from ._json import get_encoder
+
+            self._json_encoder = get_encoder(self.json_encoder)
+
+        return self._json_encoder.encode(to_json_data(data))
+
+    def _call_output_renderer(
+        self, render_output: Callable[..., Any], data: Any
+    ) -> Any:
+        import inspect
 
-    def _render_custom_output(
-        self, render_output: OutputRenderer[Any], data: Any
-    ) -> None:
         signature = inspect.signature(render_output)
 
         if len(signature.parameters) == 1:
-            render_one_arg = cast(
-                Callable[[Any], Optional[RenderableType]],
-                render_output,
-            )
-            renderable = render_one_arg(data)
-        else:
-            render_two_args = cast(
-                Callable[[Any, RichToolkit], Optional[RenderableType]],
-                render_output,
-            )
-            renderable = render_two_args(data, self)
+            return render_output(data)
 
-        if renderable is not None:
-            self.print(renderable)
+        return render_output(data, self)
 
     def _write_json_output(self, data: Any) -> None:
-        if _is_output_stream(data):
-            for item in data:
-                self._write_json_line(item)
-            return
+        from ._json import JSONLinesWriter, open_sink
 
-        self._write_json_line(data)
+        with JSONLinesWriter(
+            open_sink(self.json_sink),
+            max_items=self.json_flush_items,
+            max_bytes=self.json_flush_bytes,
+            interval=self.json_flush_interval,
+        ) as writer:
+            if not _is_output_stream(data):
+                writer.write(self._encode_json(data))
+                return
 
-    def _render_human_output(
+            encode = stream_encoder(self._encode_json)
+            write = writer.write
+
+            for item in data:
+                write(encode(item))
+
+    def _human_output_renderable(
         self,
         data: Any,
-        render_output: Optional[Union[RenderableType, OutputRenderer[Any]]] = None,
-    ) -> None:
+        render_output: Optional[
+            Union[RenderableType, OutputRenderer[Any], AsyncOutputRenderer[Any]]
+        ] = None,
+    ) -> Any:
+        """Return what to print for `data`: a renderable, `None` for
+        nothing, or an awaitable of either with async renderers."""
         if render_output is not None:
             if callable(render_output):
-                self._render_custom_output(
-                    cast(OutputRenderer[Any], render_output), data
-                )
-            else:
-                self.print(render_output)
+                return self._call_output_renderer(render_output, data)
 
-            return
+            return render_output
 
         if isinstance(data, (str, ConsoleRenderable)):
-            self.print(data)
-        else:
-            self.print(_default_output_renderable(data))
+            return data
+
+        return _default_output_renderable(data)
+
+    def _render_human_output(
+        self,
+        data: Any,
+        render_output: Optional[Union[RenderableType, OutputRenderer[Any]]] = None,
+    ) -> None:
+        renderable = self._human_output_renderable(data, render_output)
+
+        if renderable is not None:
+            self.print(renderable)
 
     @overload
     def output(self, data: OutputT, render_output: None = None) -> None: ...
@@ -320,8 +425,123 @@ class RichToolkit:
 
         self._render_human_output(data, render_output=render_output)
 
+    async def aoutput(
+        self,
+        data: Union[AsyncIterable[OutputT], OutputT],
+        render_output: Optional[
+            Union[
+                RenderableType,
+                OutputRenderer[OutputT],
+                AsyncOutputRenderer[OutputT],
+            ]
+        ] = None,
+        concurrency: int = 1,
+    ) -> None:
+        """Output data like `output`, from a coroutine.
+
+        `data` can also be an async iterable, whose items are output as they
+        come. In JSON mode, lines are buffered like with `output`, and
+        written from a thread when the pipe is full, so the event loop is
+        never blocked.
+
+        Args:
+            data: Data to output, an iterator, or an async iterable.
+            render_output: Like for `output`, a renderable or a function
+                rendering each item, which can be a coroutine function.
+            concurrency: Number of items rendered at the same time by an
+                async `render_output`. They're still printed in order.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        if self.mode == "json":
+            if self._json_output_written:
+                raise RuntimeError("output() was already called in JSON mode")
+
+            self._json_output_written = True
+            await self._awrite_json_output(data)
+            return
+
+        import asyncio
+        import inspect
+        from collections import deque
+
+        # renderables or render tasks, printed in order
+        pending: Deque[Any] = deque()
+
+        async def print_rendered(keep: int) -> None:
+            while len(pending) > keep:
+                rendered = pending.popleft()
+
+                if isinstance(rendered, asyncio.Future):
+                    rendered = await rendered
+
+                if rendered is not None:
+                    self.print(rendered)
+
+        def render(item: Any) -> None:
+            rendered = self._human_output_renderable(item, render_output)
+
+            if inspect.isawaitable(rendered):
+                rendered = asyncio.ensure_future(rendered)
+
+            pending.append(rendered)
+
+        try:
+            if _is_async_output_stream(data):
+                async for item in data:  # type: ignore[union-attr]
+                    render(item)
+                    await print_rendered(concurrency - 1)
+            elif _is_output_stream(data):
+                for item in data:  # type: ignore[union-attr]
+                    render(item)
+                    await print_rendered(concurrency - 1)
+            else:
+                render(data)
+
+            await print_rendered(0)
+        finally:
+            for rendered in pending:
+                if isinstance(rendered, asyncio.Future):
+                    rendered.cancel()
+
+    async def _awrite_json_output(self, data: Any) -> None:
+        from ._json import JSONLinesWriter, open_sink
+
+        writer = JSONLinesWriter(
+            open_sink(self.json_sink),
+            max_items=self.json_flush_items,
+            max_bytes=self.json_flush_bytes,
+            interval=self.json_flush_interval,
+        )
+
+        try:
+            if _is_async_output_stream(data):
+                encode = stream_encoder(self._encode_json)
+                add = writer.add
+
+                if writer.interval is not None:
+                    data = _flush_while_waiting(data, writer)
+
+                async for item in data:
+                    if add(encode(item)):
+                        await writer.aflush()
+            elif _is_output_stream(data):
+                encode = stream_encoder(self._encode_json)
+                add = writer.add
+
+                for item in data:
+                    if add(encode(item)):
+                        await writer.aflush()
+            else:
+                writer.add(self._encode_json(data))
+        finally:
+            await writer.aclose()
+
     @_unavailable_in_json_mode("confirm")
     def confirm(self, label: str, **metadata: Any) -> bool:
+        from .menu import Option
+
         options: List[Option[bool]] = [
             Option({"value": True, "name": "Yes"}),
             Option({"value": False, "name": "No"}),
@@ -369,6 +589,8 @@ class RichToolkit:
         if self.mode == "json":
             raise RuntimeError("ask() is not available in JSON mode")
 
+        from .menu import Menu
+
         return Menu(
             label=label,
             options=options,
@@ -393,6 +615,8 @@ class RichToolkit:
         value: str = "",
         **metadata: Any,
     ) -> str:
+        from .input import Input
+
         return Input(
             name=title,
             label=title,
@@ -415,10 +639,20 @@ class RichToolkit:
         inline_logs: bool = False,
         lines_to_show: int = -1,
         preserve_logs: Optional[bool] = None,
+        max_logs: Optional[int] = None,
+        spill_logs_to: Union[str, os.PathLike[str], IO[str], None] = None,
+        refresh_per_second: float = 8,
+        refresh_policy: RefreshPolicy = "fixed",
+        log_rate_limit: Optional[float] = None,
+        total: Optional[float] = None,
         **metadata: Any,
     ) -> Progress:
         """Create a progress display.
 
+        Use it with `with`, or with `async with` to refresh it from the running
+        event loop instead of a separate thread, logging with `await
+        progress.alog(...)`.
+
         Args:
             title: Initial progress message.
             transient: Remove the progress display when it finishes.
@@ -427,8 +661,27 @@ class RichToolkit:
             lines_to_show: Maximum number of inline log lines to display. Negative
                 values display all lines.
             preserve_logs: Override the toolkit's progress-log preservation setting.
+            max_logs: Maximum number of inline log lines kept in memory, older
+                lines are dropped. Keeps every line when `None`.
+            spill_logs_to: Path or text file where every inline log line is
+                written, including the ones dropped because of `max_logs` or
+                `log_rate_limit`, so the file contains the full log.
+            refresh_per_second: Maximum number of frames rendered per second.
+            refresh_policy: `"fixed"` renders every frame, `"adaptive"` lowers
+                the frame rate when frames are slow to render or write, and
+                `"idle"` only renders when the content changed (this pauses
+                the animation while nothing is logged).
+            log_rate_limit: Maximum number of inline log lines stored and
+                displayed per second, with bursts of up to a second worth of
+                lines. Other lines are counted and shown as suppressed.
+            total: Number of steps to complete. Steps are counted with
+                `progress.advance()`, and a bar with the rate and the estimated
+                time left is displayed. Without a total, only the count and
+                the rate are displayed once something is advanced.
             **metadata: Additional metadata passed to the style renderer.
         """
+        from .progress import Progress
+
         return Progress(
             title=title,
             console=self.console,
@@ -441,5 +694,83 @@ class RichToolkit:
                 self.preserve_progress_logs if preserve_logs is None else preserve_logs
             ),
             quiet=self.mode == "json",
+            max_logs=max_logs,
+            spill_logs_to=spill_logs_to,
+            refresh_per_second=refresh_per_second,
+            refresh_policy=refresh_policy,
+            log_rate_limit=log_rate_limit,
+            total=total,
+            events=self._progress_events,
+            **metadata,
+        )
+
+    def track(
+        self,
+        iterable: Iterable[OutputT],
+        title: str,
+        total: Optional[float] = None,
+        transient: bool = False,
+        **metadata: Any,
+    ) -> Iterator[OutputT]:
+        """Iterate over `iterable` while displaying a progress bar.
+
+        The progress is advanced once per item and finishes when the loop
+        ends. Sized iterables like lists and ranges add no per-item cost, the
+        count is read once per frame. In JSON mode the items are returned
+        as they are, unless progress events are enabled.
+
+        Args:
+            iterable: Items to iterate over, generators of unknown length
+                included.
+            title: Progress message.
+            total: Number of items, defaults to the length of `iterable` when
+                it has one. Without it, only the count and the rate are
+                displayed.
+            transient: Remove the progress display when it finishes.
+            **metadata: Additional metadata passed to the style renderer.
+        """
+        if self.mode == "json" and self._progress_events is None:
+            return iter(iterable)
+
+        progress = self.progress(title, transient=transient, total=total, **metadata)
+
+        return progress.track(iterable)
+
+    def progress_group(
+        self,
+        title: str = "",
+        transient: bool = False,
+        preserve_logs: Optional[bool] = None,
+        refresh_per_second: float = 8,
+        refresh_policy: RefreshPolicy = "fixed",
+        **metadata: Any,
+    ) -> ProgressGroup:
+        """Create a display for many concurrent progress tasks.
+
+        Tasks are added with `add_task` and are all drawn in the same live
+        region, one frame at a time.
+
+        Args:
+            title: Title displayed above the tasks.
+            transient: Remove the display when it finishes.
+            preserve_logs: Override the toolkit's progress-log preservation setting.
+            refresh_per_second: Maximum number of frames rendered per second.
+            refresh_policy: `"fixed"`, `"adaptive"` or `"idle"`, see `progress`.
+            **metadata: Additional metadata passed to the style renderer.
+        """
+        from .progress import ProgressGroup
+
+        return ProgressGroup(
+            title=title,
+            console=self.console,
+            style=self.style,
+            transient=True if self.mode == "json" else transient,
+            preserve_logs=(
+                self.preserve_progress_logs if preserve_logs is None else preserve_logs
+            ),
+            quiet=self.mode == "json",
+            refresh_per_second=refresh_per_second,
+            refresh_policy=refresh_policy,
+            events=self._progress_events,
             **metadata,
         )
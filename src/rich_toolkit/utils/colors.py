@@ -1,9 +1,50 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
+
 from rich.color import Color
 from rich.color_triplet import ColorTriplet
 from rich.style import Style
 from rich.text import Text
 from typing_extensions import Literal
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+TerminalColorType = Literal["text", "background"]
+TerminalColors = Dict[TerminalColorType, Optional[str]]
+
+# Detected colors are kept for the lifetime of the process. `None` means the
+# terminal didn't answer, so callers fall back to their own default color.
+_terminal_color_cache: Dict[str, Optional[str]] = {}
+_terminal_color_cache_lock = threading.Lock()
+_background_detection: Optional["Future[TerminalColors]"] = None
+_background_detection_thread: Optional[threading.Thread] = None
+# set when a widget needs the terminal, so a background detection that
+# didn't query it yet gives up, see `wait_for_terminal_color_detection`
+_background_detection_cancelled = threading.Event()
+# held while the terminal is in cbreak mode for a query
+_terminal_mode_lock = threading.Lock()
+# seconds to wait for the terminal to send more of its replies
+_REPLY_TIMEOUT = 1.0
+
+
+class _DetectionCancelled(Exception):
+    pass
+
+
+# Set this environment variable to a file path to share detected colors
+# between processes running in the same terminal (e.g. several CLI commands
+# in one shell session).
+TERMINAL_COLOR_CACHE_ENV = "RICH_TOOLKIT_TERMINAL_COLOR_CACHE"
+TERMINAL_COLOR_CACHE_TTL_ENV = "RICH_TOOLKIT_TERMINAL_COLOR_CACHE_TTL"
+TERMINAL_COLOR_CACHE_TTL = 60 * 60
+
 
 def lighten(color: Color, amount: float) -> Color:
     triplet = color.triplet
@@ -109,20 +150,167 @@ def fade_text(
     return text
 
 
-def _get_terminal_color(
-    color_type: Literal["text", "background"], default_color: str
-) -> str:
-    import os
-    import re
-    import select
+# Number of distinct brightness levels used by `FadeTable`. Log lines only
+# use the upper part of the range, so this leaves ~20 visible steps.
+FADE_LEVELS = 32
+
+# Faded span styles are cached per table, cap it so that styles that are
+# unique per line (e.g. links) can't grow it without bound.
+_MAX_CACHED_FADE_STYLES = 1024
+
+
+class FadeTable:
+    """Lookup table for fading text towards a background color.
+
+    Brightness multipliers are quantized into `levels` steps, so fading a
+    color or a style is computed once per level and then looked up.
+    """
+
+    def __init__(
+        self, text_color: Color, background_color: Color, levels: int = FADE_LEVELS
+    ) -> None:
+        self.text_color = text_color
+        self.background_color = background_color
+        self.levels = levels
+
+        self._colors: Dict[Tuple[Color, int], Color] = {}
+        self._styles: Dict[Tuple[Union[Style, str], int], Style] = {}
+        self._text_styles: Dict[int, Style] = {}
+
+    def get_level(self, brightness_multiplier: float) -> int:
+        level = round(brightness_multiplier * (self.levels - 1))
+
+        return max(0, min(self.levels - 1, level))
+
+    def fade_color(self, color: Color, level: int) -> Color:
+        key = (color, level)
+        faded = self._colors.get(key)
+
+        if faded is None:
+            faded = fade_color(color, self.background_color, level / (self.levels - 1))
+            self._colors[key] = faded
+
+        return faded
+
+    def fade_style(self, style: Union[Style, str], level: int) -> Style:
+        key = (style, level)
+        faded = self._styles.get(key)
+
+        if faded is not None:
+            return faded
+
+        faded = Style.parse(style) if isinstance(style, str) else style
+
+        if faded.color:
+            color = faded.color
+
+            if color == Color.default():
+                color = self.text_color
+
+            faded = faded.copy()
+            faded._color = self.fade_color(color, level)
+
+        if len(self._styles) >= _MAX_CACHED_FADE_STYLES:
+            self._styles.clear()
+
+        self._styles[key] = faded
+
+        return faded
+
+    def fade_text(self, text: Text, brightness_multiplier: float) -> Text:
+        """Same as `fade_text`, with the brightness rounded to the nearest
+        level.
+
+        Only the faded styles are cached, callers that fade the same text
+        again should keep the result (see `ProgressLine.fade`).
+        """
+        level = self.get_level(brightness_multiplier)
+
+        text_style = self._text_styles.get(level)
+        if text_style is None:
+            text_style = Style(color=self.fade_color(self.text_color, level))
+            self._text_styles[level] = text_style
+
+        faded = text.copy()
+        faded._spans = [
+            span._replace(style=self.fade_style(span.style, level))
+            for span in faded._spans
+        ]
+        faded.style = text_style
+
+        return faded
+
+
+@lru_cache(maxsize=16)
+def get_fade_table(text_color: str, background_color: str) -> FadeTable:
+    """Return the shared fade table for a text and background color."""
+    return FadeTable(Color.parse(text_color), Color.parse(background_color))
 
-    # Set appropriate OSC code and default color based on color_type
+
+# Color components can be 1-4 hex digits depending on terminal
+_RGB_RE = re.compile(
+    rb"rgb:(?P<r>[0-9a-f]+)/(?P<g>[0-9a-f]+)/(?P<b>[0-9a-f]+)", re.IGNORECASE
+)
+# Terminal response ends with BEL (\a) or ST (\033\\)
+_OSC_REPLY_RE = re.compile(
+    rb"\033\](?P<code>1[01]);" + _RGB_RE.pattern + rb"(?:\a|\033\\)",
+    re.IGNORECASE,
+)
+_BARE_REPLY_RE = re.compile(_RGB_RE.pattern + rb"(?:\a|\033\\)", re.IGNORECASE)
+
+
+def _get_osc_code(color_type: str) -> str:
     if color_type.lower() == "text":
-        osc_code = "10"
+        return "10"
     elif color_type.lower() == "background":
-        osc_code = "11"
-    else:
-        raise ValueError("color_type must be either 'text' or 'background'")
+        return "11"
+
+    raise ValueError("color_type must be either 'text' or 'background'")
+
+
+def _parse_rgb_reply(match: "re.Match[bytes]") -> str:
+    r_hex, g_hex, b_hex = match.group("r"), match.group("g"), match.group("b")
+    # Convert to 8-bit by taking the first 2 hex digits
+    r = int(r_hex[:2], 16)
+    g = int(g_hex[:2], 16)
+    b = int(b_hex[:2], 16)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _parse_color_replies(response: bytes, osc_codes: Sequence[str]) -> Dict[str, str]:
+    # Parse the responses (format: \033]10;rgb:RRRR/GGGG/BBBB\033\\)
+    found = {
+        match.group("code").decode(): _parse_rgb_reply(match)
+        for match in _OSC_REPLY_RE.finditer(response)
+    }
+
+    # Some terminals don't echo the OSC code back, they answer the queries
+    # in the order they were sent. With several queries, only complete
+    # replies are used, as the last one might still be arriving.
+    if not found:
+        reply_re = _RGB_RE if len(osc_codes) == 1 else _BARE_REPLY_RE
+
+        for osc_code, match in zip(osc_codes, reply_re.finditer(response)):
+            found[osc_code] = _parse_rgb_reply(match)
+
+    return {code: color for code, color in found.items() if code in osc_codes}
+
+
+def _query_terminal_colors(
+    color_types: Sequence[TerminalColorType],
+) -> TerminalColors:
+    """Ask the terminal for several colors using a single round trip.
+
+    All OSC queries are written at once and the replies are parsed from the
+    same read loop, so slow links only pay the latency once.
+    """
+    import select
+
+    osc_codes = {_get_osc_code(color_type): color_type for color_type in color_types}
+    colors: TerminalColors = {color_type: None for color_type in color_types}
+
+    if not osc_codes:
+        return colors
 
     try:
         import fcntl
@@ -130,7 +318,7 @@ def _get_terminal_color(
         import tty
     except ImportError:
         # Not on a Unix-like system
-        return default_color
+        return colors
 
     # Use a dedicated fd via /dev/tty instead of sys.stdin so we don't
     # affect the process's stdin/stdout/stderr. On Linux, fds 0/1/2 share
@@ -140,7 +328,7 @@ def _get_terminal_color(
     try:
         tty_fd = os.open("/dev/tty", os.O_RDWR | os.O_NOCTTY)
     except OSError:
-        return default_color
+        return colors
 
     try:
         # Serialize access across forked workers. termios settings are
@@ -150,7 +338,7 @@ def _get_terminal_color(
         fcntl.flock(tty_fd, fcntl.LOCK_EX)
     except OSError:
         os.close(tty_fd)
-        return default_color
+        return colors
 
     # Only proceed if we're the foreground process group for this terminal.
     # Calling tcsetattr (via setcbreak) from a background process group
@@ -160,12 +348,27 @@ def _get_terminal_color(
     try:
         if os.tcgetpgrp(tty_fd) != os.getpgrp():
             os.close(tty_fd)
-            return default_color
+            return colors
     except OSError:
         os.close(tty_fd)
-        return default_color
+        return colors
+
+    _terminal_mode_lock.acquire()
+
+    if (
+        _background_detection_cancelled.is_set()
+        and threading.current_thread() is _background_detection_thread
+    ):
+        _terminal_mode_lock.release()
+        os.close(tty_fd)
+        raise _DetectionCancelled
 
-    old_settings = termios.tcgetattr(tty_fd)
+    try:
+        old_settings = termios.tcgetattr(tty_fd)
+    except BaseException:
+        _terminal_mode_lock.release()
+        os.close(tty_fd)
+        raise
 
     try:
         # Use setcbreak instead of setraw to keep ISIG enabled so that
@@ -175,59 +378,318 @@ def _get_terminal_color(
         # we need for reading the OSC response character-by-character.
         tty.setcbreak(tty_fd)
 
-        # Send OSC escape sequence to query color
-        os.write(tty_fd, f"\033]{osc_code};?\033\\".encode())
-
-        # Wait for response with timeout
-        if select.select([tty_fd], [], [], 1.0)[0]:
-            # Read response
-            response = b""
-            while True:
-                if select.select([tty_fd], [], [], 1.0)[0]:
-                    data = os.read(tty_fd, 32)
-                    if not data:
-                        break
-                    response += data
-                    # Terminal response ends with BEL (\a) or ST (\033\\)
-                    if b"\a" in response or b"\033\\" in response:
-                        break
-                    if len(response) > 50:  # Safety limit
-                        break
-                else:
-                    break
-
-            # Parse the response (format: \033]10;rgb:RRRR/GGGG/BBBB\033\\)
-            # Color components can be 1-4 hex digits depending on terminal
-            match = re.search(
-                rb"rgb:([0-9a-f]+)/([0-9a-f]+)/([0-9a-f]+)",
-                response,
-                re.IGNORECASE,
-            )
-            if match:
-                r_hex, g_hex, b_hex = match.groups()
-                # Convert to 8-bit by taking the first 2 hex digits
-                r = int(r_hex[:2], 16)
-                g = int(g_hex[:2], 16)
-                b = int(b_hex[:2], 16)
-                return f"#{r:02x}{g:02x}{b:02x}"
-
-            return default_color
-        else:
-            return default_color
+        # Send all OSC escape sequences in one write
+        os.write(
+            tty_fd,
+            "".join(f"\033]{osc_code};?\033\\" for osc_code in osc_codes).encode(),
+        )
+
+        # Read responses until every query was answered or the terminal
+        # stops sending data
+        response = b""
+        found: Dict[str, str] = {}
+
+        while len(found) < len(osc_codes):
+            if not select.select([tty_fd], [], [], _REPLY_TIMEOUT)[0]:
+                break
+
+            data = os.read(tty_fd, 64)
+            if not data:
+                break
+            response += data
+
+            found = _parse_color_replies(response, list(osc_codes))
+
+            if len(response) > 64 * len(osc_codes):  # Safety limit
+                break
+
+        for osc_code, color in found.items():
+            colors[osc_codes[osc_code]] = color
+
+        return colors
     except KeyboardInterrupt:
         # This can happen when a worker process is interrupted (Ctrl+C)
-        # while in the middle of querying the terminal. Return the default
-        # color gracefully — the interrupt will be handled by the caller.
-        return default_color
+        # while in the middle of querying the terminal. Give up gracefully
+        # so callers use their default color — the interrupt will be
+        # handled by the caller.
+        return colors
     finally:
         # Restore terminal settings using TCSAFLUSH to discard any
         # unread response bytes left in the input buffer, then release
         # the lock and close our dedicated fd.
         termios.tcsetattr(tty_fd, termios.TCSAFLUSH, old_settings)
+        _terminal_mode_lock.release()
         fcntl.flock(tty_fd, fcntl.LOCK_UN)
         os.close(tty_fd)
 
 
+def _get_terminal_identity() -> Optional[str]:
+    """Describe the terminal we're attached to, used as the disk cache key."""
+    tty_name = None
+
+    for fd in (0, 1, 2):
+        try:
+            tty_name = os.ttyname(fd)
+        except OSError:
+            continue
+
+        break
+
+    if tty_name is None:
+        return None
+
+    return "|".join(
+        [
+            tty_name,
+            os.environ.get("TERM", ""),
+            os.environ.get("TERM_PROGRAM", ""),
+            os.environ.get("COLORFGBG", ""),
+        ]
+    )
+
+
+def _get_disk_cache_ttl() -> float:
+    try:
+        return float(
+            os.environ.get(TERMINAL_COLOR_CACHE_TTL_ENV, TERMINAL_COLOR_CACHE_TTL)
+        )
+    except ValueError:
+        return TERMINAL_COLOR_CACHE_TTL
+
+
+def _load_disk_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return data if isinstance(data, dict) else {}
+
+
+def _read_disk_cache(
+    path: str, identity: str, color_type: TerminalColorType
+) -> Optional[str]:
+    terminal = _load_disk_cache(path).get(identity)
+
+    if not isinstance(terminal, dict):
+        return None
+
+    entry = terminal.get(color_type)
+
+    if not isinstance(entry, dict):
+        return None
+
+    color = entry.get("color")
+    timestamp = entry.get("timestamp")
+
+    if not isinstance(color, str) or not isinstance(timestamp, (int, float)):
+        return None
+
+    if time.time() - timestamp > _get_disk_cache_ttl():
+        return None
+
+    return color
+
+
+def _write_disk_cache(
+    path: str, identity: str, colors: Dict[TerminalColorType, str]
+) -> None:
+    data = _load_disk_cache(path)
+    terminal = data.get(identity)
+
+    if not isinstance(terminal, dict):
+        terminal = data[identity] = {}
+
+    timestamp = time.time()
+
+    for color_type, color in colors.items():
+        terminal[color_type] = {"color": color, "timestamp": timestamp}
+
+    directory = os.path.dirname(path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def clear_terminal_color_cache() -> None:
+    """Forget colors detected by this process.
+
+    The disk cache (if any) is left untouched.
+    """
+    global _background_detection
+
+    with _terminal_color_cache_lock:
+        _terminal_color_cache.clear()
+        _background_detection = None
+        _background_detection_cancelled.clear()
+
+
+def _get_terminal_colors(
+    color_types: Sequence[TerminalColorType],
+) -> TerminalColors:
+    for color_type in color_types:
+        _get_osc_code(color_type)
+
+    with _terminal_color_cache_lock:
+        colors = {
+            color_type: _terminal_color_cache[color_type]
+            for color_type in color_types
+            if color_type in _terminal_color_cache
+        }
+        missing = [color_type for color_type in color_types if color_type not in colors]
+
+        if not missing:
+            return colors
+
+        cache_path = os.environ.get(TERMINAL_COLOR_CACHE_ENV)
+        identity = _get_terminal_identity() if cache_path else None
+
+        if cache_path and identity:
+            for color_type in missing:
+                color = _read_disk_cache(cache_path, identity, color_type)
+                if color is not None:
+                    colors[color_type] = color
+
+            missing = [
+                color_type for color_type in missing if colors.get(color_type) is None
+            ]
+
+        if missing:
+            detected = _query_terminal_colors(missing)
+            colors.update(detected)
+
+            found = {
+                color_type: color
+                for color_type, color in detected.items()
+                if color is not None
+            }
+
+            if found and cache_path and identity:
+                _write_disk_cache(cache_path, identity, found)
+
+        _terminal_color_cache.update(colors)
+
+    return colors
+
+
+def _get_terminal_color(color_type: TerminalColorType, default_color: str) -> str:
+    return _get_terminal_colors([color_type])[color_type] or default_color
+
+
+def get_terminal_colors(
+    text_default_color: str = "#FFFFFF", background_default_color: str = "#000000"
+) -> Tuple[str, str]:
+    """Get the terminal text and background colors with a single query."""
+    colors = _get_terminal_colors(["text", "background"])
+
+    return (
+        colors["text"] or text_default_color,
+        colors["background"] or background_default_color,
+    )
+
+
+def _run_background_detection(
+    future: "Future[TerminalColors]",
+) -> None:
+    try:
+        future.set_result(_get_terminal_colors(["text", "background"]))
+    except _DetectionCancelled:
+        # not cached, so asking again later queries the terminal
+        future.set_result({"text": None, "background": None})
+    except BaseException as e:
+        future.set_exception(e)
+
+
+@atexit.register
+def _wait_for_background_detection() -> None:
+    # Don't let the interpreter exit while the probe thread has the terminal
+    # in cbreak mode, otherwise the user's shell would be left without echo
+    if _background_detection_thread is not None:
+        _background_detection_thread.join()
+
+
+def detect_terminal_colors_in_background() -> "Future[TerminalColors]":
+    """Detect the terminal text and background colors on a background thread.
+
+    Returns a future resolving to a mapping of color type to detected color
+    (`None` when the terminal didn't answer). Detection is started at most
+    once per process, and the future is already resolved when both colors
+    are cached.
+    """
+    from concurrent.futures import Future
+
+    global _background_detection, _background_detection_thread
+
+    with _terminal_color_cache_lock:
+        if _background_detection is not None:
+            return _background_detection
+
+        future: "Future[TerminalColors]" = Future()
+        _background_detection = future
+
+        if "text" in _terminal_color_cache and "background" in _terminal_color_cache:
+            future.set_result(
+                {
+                    "text": _terminal_color_cache["text"],
+                    "background": _terminal_color_cache["background"],
+                }
+            )
+
+            return future
+
+        _background_detection_thread = threading.Thread(
+            target=_run_background_detection,
+            args=(future,),
+            name="rich-toolkit-terminal-colors",
+            daemon=True,
+        )
+
+    _background_detection_thread.start()
+
+    return future
+
+
+def wait_for_terminal_color_detection(timeout: Optional[float] = None) -> None:
+    """Make sure a background color detection is done with the terminal
+    before reading keys from it.
+
+    The detection puts the terminal in cbreak mode and restores it when
+    done, discarding pending input, which would drop keystrokes and undo the
+    mode set by widgets. It's given `timeout` seconds (by default, as long
+    as it waits for replies) to finish. After that, it's cancelled if it
+    didn't start querying the terminal, or waited for until it restored it.
+    """
+    future = _background_detection
+
+    if future is None or future.done():
+        return
+
+    from concurrent.futures import wait
+
+    wait([future], timeout=_REPLY_TIMEOUT if timeout is None else timeout)
+
+    if future.done():
+        return
+
+    _background_detection_cancelled.set()
+
+    with _terminal_mode_lock:
+        pass
+
+
 def get_terminal_text_color(default_color: str = "#FFFFFF") -> str:
     """Get the terminal text (foreground) color."""
     return _get_terminal_color("text", default_color)
@@ -239,5 +701,6 @@ def get_terminal_background_color(default_color: str = "#000000") -> str:
 
 
 if __name__ == "__main__":
-    print(get_terminal_background_color())
-    print(get_terminal_text_color())
+    text_color, background_color = get_terminal_colors()
+    print(background_color)
+    print(text_color)
@@ -1,2 +1,28 @@
+from __future__ import annotations
+
+import io
+from typing import Any
+
+from rich.console import Console
+
+from rich_toolkit.progress import Progress
+from rich_toolkit.styles import BaseStyle
+
+
 def trim_whitespace_on_lines(text: str) -> str:
     return "\n".join(line.strip() for line in text.splitlines())
+
+
+def make_progress(title: str = "Deploying", **kwargs: Any) -> Progress:
+    """A progress rendering to a terminal console in memory."""
+    console = Console(file=io.StringIO(), force_terminal=True, width=80)
+    # a very low rate so the refresh thread never ticks during the test
+    kwargs.setdefault("refresh_per_second", 0.01)
+
+    return Progress(title, style=BaseStyle(), console=console, **kwargs)
+
+
+def render(style: BaseStyle, progress: Progress) -> str:
+    style.console.begin_capture()
+    style.console.print(style.render_element(progress))
+    return style.console.end_capture()
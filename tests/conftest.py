@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """Freeze the clock used by progresses, tests move it forward."""
+    now = [1000.0]
+    monkeypatch.setattr("rich_toolkit.progress.time.monotonic", lambda: now[0])
+
+    return now
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from rich.color import Color
+from rich.style import Style
+from rich.theme import Theme
+
+from rich_toolkit.progress import Progress
+from rich_toolkit.styles import BaseStyle, FancyStyle, TaggedStyle
+from rich_toolkit.utils.colors import lighten
+
+
+def test_animation_colors_are_memoized():
+    style = BaseStyle()
+
+    colors = style._get_animation_colors(steps=10, breathe=True)
+
+    assert style._get_animation_colors(steps=10, breathe=True) is colors
+    assert style._get_animation_colors(steps=10, breathe=False) is not colors
+
+
+def test_animation_colors_match_progress_style():
+    style = BaseStyle()
+    base_color = Color.parse("#893AE3")
+
+    assert style._get_animation_colors(steps=3) == [
+        lighten(base_color, 0.0),
+        lighten(base_color, 0.1),
+        lighten(base_color, 0.2),
+    ]
+    assert (
+        style._get_animation_colors(steps=3, animation_status="stopped")
+        == [base_color] * 3
+    )
+
+
+def test_animation_colors_follow_pushed_theme():
+    style = BaseStyle()
+    before = style._get_animation_colors(steps=4, animation_status="stopped")
+
+    style.console.push_theme(Theme({"progress": "on #ff0000"}))
+
+    assert (
+        style._get_animation_colors(steps=4, animation_status="stopped")
+        == [Color.parse("#ff0000")] * 4
+    )
+
+    style.console.pop_theme()
+
+    assert style._get_animation_colors(steps=4, animation_status="stopped") == before
+
+
+def test_animation_colors_are_kept_when_a_theme_leaves_them_unchanged():
+    style = BaseStyle()
+    colors = style._get_animation_colors(steps=4)
+
+    style.console.push_theme(Theme({"text": "#ff0000"}))
+
+    assert style._get_animation_colors(steps=4) is colors
+
+
+def test_animation_styles_are_precomputed_per_frame():
+    style = BaseStyle()
+
+    colors = style._get_animation_colors(steps=14, breathe=True)
+    styles = style._get_animation_styles(steps=14, breathe=True)
+
+    assert styles == [Style(color=color) for color in colors]
+    assert style._get_animation_styles(steps=14, breathe=True) is styles
+
+
+def test_rendering_progress_reuses_palettes():
+    for style in (TaggedStyle(), FancyStyle()):
+        progress = Progress("Installing...", style=style)
+        palettes = []
+
+        for _ in range(3):
+            style.console.begin_capture()
+            style.console.print(style.render_element(progress))
+            style.console.end_capture()
+
+            palettes.append(dict(style._animation_palettes))
+
+        assert palettes[0]
+        assert all(
+            palette[key] is palettes[0][key]
+            for palette in palettes
+            for key in palettes[0]
+        )
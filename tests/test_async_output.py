@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import random
+from typing import AsyncIterator, List
+
+import pytest
+
+from rich_toolkit import RichToolkit
+from rich_toolkit._json import JSONLinesWriter
+from rich_toolkit.styles import MinimalStyle
+
+
+async def _deployments(count: int) -> AsyncIterator[dict]:
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield {"id": f"dep_{i}"}
+
+
+def test_aoutput_streams_async_iterables_as_json_lines(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    app = RichToolkit(mode="json", json_flush_items=2)
+
+    asyncio.run(app.aoutput(_deployments(3)))
+
+    lines = capsys.readouterr().out.splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {"id": "dep_0"},
+        {"id": "dep_1"},
+        {"id": "dep_2"},
+    ]
+
+    with pytest.raises(RuntimeError, match="output\\(\\) was already called"):
+        asyncio.run(app.aoutput({"ok": False}))
+
+
+def test_aoutput_renders_items_in_human_mode(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    app = RichToolkit(style=MinimalStyle(theme={}))
+
+    asyncio.run(app.aoutput(_deployments(2)))
+
+    assert capsys.readouterr().out == "id: dep_0\nid: dep_1\n"
+
+
+def test_async_renderers_run_concurrently_in_order(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    app = RichToolkit(style=MinimalStyle(theme={}))
+    running: List[int] = []
+    max_running = 0
+
+    async def render(deployment: dict, toolkit: RichToolkit) -> str:
+        nonlocal max_running
+
+        running.append(1)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(random.random() / 100)
+        running.pop()
+
+        return deployment["id"]
+
+    asyncio.run(app.aoutput(_deployments(20), render_output=render, concurrency=4))
+
+    assert capsys.readouterr().out.splitlines() == [f"dep_{i}" for i in range(20)]
+    assert max_running == 4
+
+
+def test_pending_renderers_are_cancelled_on_error():
+    app = RichToolkit(style=MinimalStyle(theme={}))
+
+    async def render(deployment: dict) -> str:
+        if deployment["id"] == "dep_0":
+            raise ValueError("Render failed")
+
+        await asyncio.sleep(10)
+
+        return deployment["id"]
+
+    async def main() -> None:
+        with pytest.raises(ValueError, match="Render failed"):
+            await app.aoutput(_deployments(3), render_output=render, concurrency=3)
+
+        await asyncio.sleep(0)
+
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(main())
+
+
+def test_aflush_writes_from_a_thread_when_the_pipe_is_full():
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+
+    # fill the pipe
+    try:
+        while True:
+            os.write(write_fd, b"x" * 65536)
+    except BlockingIOError:
+        pass
+
+    os.set_blocking(write_fd, True)
+    file = io.TextIOWrapper(io.FileIO(write_fd, "w", closefd=False))
+    writer = JSONLinesWriter(file)
+
+    async def main() -> int:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.ensure_future(tick())
+        writer.add(b'{"ok":true}')
+        flush = asyncio.ensure_future(writer.aflush())
+
+        await asyncio.sleep(0.05)
+        assert not flush.done()
+
+        # drain the pipe so the write can go through
+        drained = b""
+
+        while not drained.endswith(b"\n"):
+            drained += os.read(read_fd, 65536)
+
+        await flush
+        ticker.cancel()
+
+        assert drained.endswith(b'x{"ok":true}\n')
+
+        return ticks
+
+    try:
+        assert asyncio.run(main()) > 1
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
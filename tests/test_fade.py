@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+from rich.color import Color
+from rich.style import Style
+from rich.text import Text
+
+from rich_toolkit.progress import Progress, ProgressLine
+from rich_toolkit.styles import BaseStyle
+from rich_toolkit.utils.colors import FadeTable, fade_text, get_fade_table
+
+
+def _table() -> FadeTable:
+    return FadeTable(Color.parse("#ffffff"), Color.parse("#000000"), levels=11)
+
+
+def test_brightness_is_quantized_into_levels():
+    table = _table()
+
+    assert table.get_level(1.0) == 10
+    assert table.get_level(0.0) == 0
+    assert table.get_level(0.44) == 4
+    assert table.get_level(0.46) == 5
+    assert table.get_level(1.5) == 10
+    assert table.get_level(-1) == 0
+
+
+def test_fade_text_matches_exact_fade_on_level_boundaries():
+    table = _table()
+    text = Text.from_markup("[red]error[/] [bold]done[/] [#00ff00]ok[/]")
+
+    faded = table.fade_text(text, 0.5)
+    expected = fade_text(
+        text,
+        text_color=Color.parse("#ffffff"),
+        background_color="#000000",
+        brightness_multiplier=0.5,
+    )
+
+    assert faded.plain == expected.plain
+    assert faded.style == expected.style
+    assert [span.style for span in faded.spans] == [
+        span.style for span in expected.spans
+    ]
+
+
+def test_faded_colors_and_styles_are_looked_up():
+    table = _table()
+
+    first = table.fade_text(Text.from_markup("[red]a[/]"), 0.5)
+    second = table.fade_text(Text.from_markup("[red]b[/]"), 0.52)
+
+    assert first.spans[0].style is second.spans[0].style
+    assert first.style is second.style
+    assert table.fade_color(Color.parse("red"), 5) is table.fade_color(
+        Color.parse("red"), 5
+    )
+
+
+def test_fade_text_does_not_modify_the_original():
+    text = Text("hello", spans=[])
+    text.stylize("red", 0, 2)
+
+    _table().fade_text(text, 0.3)
+
+    assert text.spans[0].style == "red"
+    assert text.style == ""
+
+
+def test_default_color_fades_the_text_color():
+    table = _table()
+
+    style = table.fade_style(Style(color="default", bold=True), 5)
+
+    assert style.bold
+    assert style.color == Color.from_rgb(127, 127, 127)
+
+
+def test_fade_tables_are_shared_per_color_pair():
+    assert get_fade_table("#ffffff", "#000000") is get_fade_table("#ffffff", "#000000")
+    assert get_fade_table("#ffffff", "#000000") is not get_fade_table(
+        "#ffffff", "#111111"
+    )
+
+
+def test_progress_log_lines_fade_towards_the_background():
+    style = BaseStyle()
+    style.text_color = "#ffffff"
+    style.background_color = "#000000"
+    progress = Progress("Installing", style=style, inline_logs=True, lines_to_show=5)
+
+    oldest = style.render_progress_log_line(
+        "first", index=0, max_lines=5, total_lines=5, parent=progress
+    )
+    newest = style.render_progress_log_line(
+        "last", index=4, max_lines=5, total_lines=5, parent=progress
+    )
+
+    assert oldest.style.color.triplet < newest.style.color.triplet
+    assert newest.style.color == Color.from_rgb(255, 255, 255)
+
+
+def test_faded_text_is_kept_per_line_and_level():
+    table = _table()
+    line = ProgressLine("[red]a[/]", Progress("Deploying"))
+
+    faded = line.fade(table, 0.5)
+
+    assert line.fade(table, 0.52) is faded
+    assert line.fade(table, 0.8) is not faded
+    assert line.fade(_table(), 0.8) is not line.fade(table, 0.8)
+
+    line.text = "[red]b[/]"
+
+    assert line.fade(table, 0.8).plain == "b"
+
+
+def test_progress_frames_without_new_lines_do_not_fade_again(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    style = BaseStyle(background_color="#000000", text_color="#ffffff")
+    progress = Progress("Deploying", style=style, inline_logs=True, lines_to_show=5)
+    table = get_fade_table(style.text_color, style.background_color)
+    faded: List[str] = []
+    fade_text = table.fade_text
+
+    def counting_fade_text(text: Text, brightness_multiplier: float) -> Text:
+        faded.append(text.plain)
+        return fade_text(text, brightness_multiplier)
+
+    monkeypatch.setattr(table, "fade_text", counting_fade_text)
+
+    for i in range(10):
+        progress.log(f"[green]step[/] {i}")
+
+    style.render_element(progress)
+    assert len(faded) == 5
+
+    style.render_element(progress)
+    assert len(faded) == 5
+
+    progress.log("[green]step[/] 10")
+    style.render_element(progress)
+    # the fade level follows the position, so every visible line shifted to
+    # a new level and is faded again, only the parsed text is reused
+    assert faded[5:] == [f"step {i}" for i in range(6, 11)]
+
+
+def test_progress_lines_are_parsed_once():
+    progress = Progress("Deploying", inline_logs=True)
+    progress.log("[green]step[/]", end="")
+
+    line = progress.logs[0]
+    parsed = line.parsed_text
+
+    assert parsed.plain == "step"
+    assert line.parsed_text is parsed
+
+    progress.log(" done")
+
+    assert progress.logs[0] is line
+    assert line.parsed_text is not parsed
+    assert line.parsed_text.plain == "step done"
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+
+def _import_times(statement: str) -> Dict[str, int]:
+    """Run `statement` in a fresh interpreter and return the cumulative
+    import time (in microseconds) of every imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: Dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, module = line.split("|")
+
+        try:
+            times[module.strip()] = int(cumulative)
+        except ValueError:
+            # header line
+            continue
+
+    return times
+
+
+def test_importing_package_does_not_import_rich() -> None:
+    times = _import_times("import rich_toolkit")
+
+    assert "rich_toolkit" in times
+    assert not [module for module in times if module.startswith("rich.")]
+    assert "rich_toolkit.toolkit" not in times
+    assert "rich_toolkit.styles" not in times
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["click", "rich.live", "rich.table", "rich.panel", "rich.pretty", "asyncio"],
+)
+def test_importing_toolkit_defers_heavy_modules(module: str) -> None:
+    times = _import_times("from rich_toolkit import RichToolkit")
+
+    assert "rich_toolkit.toolkit" in times
+    assert module not in times
+
+
+def test_importing_a_style_only_imports_that_style() -> None:
+    times = _import_times("from rich_toolkit.styles import MinimalStyle")
+
+    assert "rich_toolkit.styles.minimal" in times
+    assert "rich_toolkit.styles.tagged" not in times
+    assert "rich_toolkit.styles.fancy" not in times
+    assert "rich_toolkit.styles.border" not in times
+    assert "rich.table" not in times
+    assert "click" not in times
+    assert "asyncio" not in times
+
+
+def test_lazy_attributes_resolve_to_the_real_objects() -> None:
+    import rich_toolkit
+    import rich_toolkit.styles
+    from rich_toolkit.input import Validator
+    from rich_toolkit.styles.tagged import TaggedStyle
+    from rich_toolkit.toolkit import RichToolkit
+
+    assert rich_toolkit.RichToolkit is RichToolkit
+    assert rich_toolkit.Validator is Validator
+    assert rich_toolkit.styles.TaggedStyle is TaggedStyle
+    assert "RichToolkit" in dir(rich_toolkit)
+
+    with pytest.raises(AttributeError):
+        rich_toolkit.DoesNotExist  # noqa: B018
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import datetime
+import enum
+import json
+import sys
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable
+
+import pytest
+
+from rich_toolkit import RichToolkit
+from rich_toolkit._json import StdlibEncoder, get_encoder
+
+
+def _encoder(name: str) -> StdlibEncoder:
+    try:
+        return get_encoder(name)  # type: ignore[arg-type]
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+@pytest.fixture(params=["stdlib", "orjson", "msgspec"])
+def encoder(request: pytest.FixtureRequest) -> StdlibEncoder:
+    return _encoder(request.param)
+
+
+@dataclass
+class Deployment:
+    id: str
+
+
+class NotJsonSerializable:
+    pass
+
+
+class Status(enum.Enum):
+    READY = "ready"
+
+
+class Replicas(enum.IntEnum):
+    ONE = 1
+
+
+class Name(str):
+    pass
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        None,
+        True,
+        0,
+        -12,
+        2**70,
+        1.5,
+        -0.0,
+        1e16,
+        "",
+        "déploiement 🚀",
+        'quotes " and \\ and \n and \x00',
+        [],
+        {},
+        [1, "two", None, [3.0]],
+        (1, 2),
+        {"nested": {"list": [{"ok": True}]}},
+        # subclasses of native types
+        Replicas.ONE,
+        {"name": Name("api")},
+    ],
+)
+def test_encoders_round_trip(encoder: StdlibEncoder, data: Any):
+    payload = encoder.encode(data)
+
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == json.loads(json.dumps(data))
+
+
+def test_encoders_write_compact_unescaped_json(encoder: StdlibEncoder):
+    payload = encoder.encode({"name": "café", "tags": ["a", "b"], "ok": True})
+
+    assert payload == '{"name":"café","tags":["a","b"],"ok":true}'.encode()
+
+
+def test_encoders_convert_non_string_keys_like_the_standard_library(
+    encoder: StdlibEncoder,
+):
+    assert json.loads(encoder.encode({1: "one", None: "none"})) == {
+        "1": "one",
+        "null": "none",
+    }
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+@pytest.mark.parametrize(
+    "wrap",
+    [
+        lambda value: {"values": [None, value]},
+        lambda value: {"value": value},
+        lambda value: [value],
+    ],
+)
+def test_encoders_reject_non_finite_floats(
+    encoder: StdlibEncoder, value: float, wrap: Callable[[float], Any]
+):
+    with pytest.raises(ValueError, match="Out of range float values"):
+        encoder.encode(wrap(value))
+
+    with pytest.raises(ValueError, match="Out of range float values"):
+        encoder.encode(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        NotJsonSerializable(),
+        Deployment(id="dep_123"),
+        b"bytes",
+        bytearray(b"bytes"),
+        datetime.timedelta(seconds=5),
+        datetime.datetime(2026, 7, 13),
+        uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        Decimal("1.5"),
+        Status.READY,
+        {1, 2},
+    ],
+)
+def test_encoders_reject_unknown_types(encoder: StdlibEncoder, value: Any):
+    name = type(value).__name__
+
+    with pytest.raises(TypeError, match=f"Object of type {name} is not JSON"):
+        encoder.encode({"value": value})
+
+
+def test_auto_encoder_falls_back_to_the_standard_library(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    assert get_encoder().name == "stdlib"
+
+
+def test_unknown_encoder_is_rejected():
+    with pytest.raises(ValueError):
+        get_encoder("simplejson")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson", "msgspec"])
+def test_toolkit_writes_the_same_output_with_every_encoder(
+    name: str, capsysbinary: pytest.CaptureFixture[bytes]
+):
+    _encoder(name)
+    app = RichToolkit(mode="json", json_encoder=name)  # type: ignore[arg-type]
+
+    app.output(iter([{"id": "dep_123", "region": "zürich"}, [1, 2]]))
+
+    assert capsysbinary.readouterr().out == (
+        '{"id":"dep_123","region":"zürich"}\n[1,2]\n'.encode()
+    )
@@ -53,7 +53,7 @@ def test_json_mode_output_writes_parseable_json_once(capsys: pytest.CaptureFixtu
 
     captured = capsys.readouterr()
 
-    assert captured.out == '{"ok": true, "project": "demo"}\n'
+    assert captured.out == '{"ok":true,"project":"demo"}\n'
     assert json.loads(captured.out) == {"ok": True, "project": "demo"}
 
     with pytest.raises(RuntimeError, match="output\\(\\) was already called"):
@@ -92,7 +92,7 @@ def test_json_mode_output_keeps_lists_as_one_json_value(
 
     captured = capsys.readouterr()
 
-    assert captured.out == '[{"type": "log"}, {"type": "result"}]\n'
+    assert captured.out == '[{"type":"log"},{"type":"result"}]\n'
 
 
 def test_json_mode_can_be_constructed_without_style(capsys: pytest.CaptureFixture[str]) -> None:
@@ -298,23 +298,22 @@ def test_json_mode_confirm_raises_without_prompting(
         app.confirm("Continue?")
 
 
-def test_json_mode_output_rejects_dataclasses(capsys: pytest.CaptureFixture[str]) -> None:
+def test_json_mode_output_serializes_dataclasses(capsys: pytest.CaptureFixture[str]) -> None:
     app = RichToolkit(mode="json")
 
-    with pytest.raises(
-        TypeError,
-        match="Object of type DataclassDeploymentData is not JSON serializable",
-    ):
-        app.output(
-            DataclassDeploymentData(
-                id="dep_123",
-                url="https://demo.fastapicloud.com",
-            )
+    app.output(
+        DataclassDeploymentData(
+            id="dep_123",
+            url="https://demo.fastapicloud.com",
         )
+    )
 
     captured = capsys.readouterr()
 
-    assert captured.out == ""
+    assert json.loads(captured.out) == {
+        "id": "dep_123",
+        "url": "https://demo.fastapicloud.com",
+    }
 
 
 def test_json_mode_output_serializes_pydantic_style_models(
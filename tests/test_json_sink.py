@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import socket
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from rich_toolkit import RichToolkit
+from rich_toolkit._json import JSONLinesWriter, open_sink
+
+
+def _records(count: int) -> Iterator[dict]:
+    for i in range(count):
+        yield {"id": i}
+
+
+def _expected(count: int) -> bytes:
+    return b"".join(b'{"id":%d}\n' % i for i in range(count))
+
+
+def test_output_is_written_to_a_path(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = tmp_path / "output.jsonl"
+    path.write_bytes(b"previous run\n")
+
+    app = RichToolkit(mode="json", json_sink=path, json_flush_items=2)
+    app.output(_records(5))
+
+    assert path.read_bytes() == _expected(5)
+    assert capsys.readouterr().out == ""
+
+
+def test_output_is_written_to_a_file_descriptor():
+    read_fd, write_fd = os.pipe()
+
+    try:
+        app = RichToolkit(mode="json", json_sink=write_fd, json_flush_items=10)
+        app.output(_records(3))
+
+        # still open
+        os.write(write_fd, b"end\n")
+
+        assert os.read(read_fd, 1024) == _expected(3) + b"end\n"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_output_is_written_after_what_the_binary_file_buffered(tmp_path: Path):
+    path = tmp_path / "output.jsonl"
+
+    with open(path, "wb") as file:
+        file.write(b"# header\n")
+
+        app = RichToolkit(mode="json", json_sink=file)
+        app.output(_records(2))
+
+        assert not file.closed
+
+    assert path.read_bytes() == b"# header\n" + _expected(2)
+
+
+def test_seekable_binary_files_are_written_through_the_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def writev(fd: int, buffers: List[Any]) -> int:
+        raise AssertionError("the file was written around")
+
+    monkeypatch.setattr(os, "writev", writev)
+    path = tmp_path / "output.jsonl"
+
+    with open(path, "wb") as file:
+        file.write(b"# header\n")
+
+        app = RichToolkit(mode="json", json_sink=file)
+        app.output(_records(2))
+
+        assert file.tell() == len(b"# header\n" + _expected(2))
+        file.write(b"# footer\n")
+
+    assert path.read_bytes() == b"# header\n" + _expected(2) + b"# footer\n"
+
+
+def test_binary_pipes_are_written_with_writev(monkeypatch: pytest.MonkeyPatch):
+    calls: List[List[Any]] = []
+    writev = os.writev
+
+    def recording_writev(fd: int, buffers: List[Any]) -> int:
+        calls.append(list(buffers))
+        return writev(fd, buffers)
+
+    monkeypatch.setattr(os, "writev", recording_writev)
+    read_fd, write_fd = os.pipe()
+
+    try:
+        with os.fdopen(write_fd, "wb", closefd=False) as file:
+            file.write(b"# header\n")
+
+            app = RichToolkit(mode="json", json_sink=file)
+            app.output(_records(2))
+
+        assert os.read(read_fd, 1024) == b"# header\n" + _expected(2)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    assert calls
+
+
+def test_output_is_written_to_binary_files_without_a_descriptor():
+    file = io.BytesIO()
+
+    app = RichToolkit(mode="json", json_sink=file, json_flush_items=None)
+    app.output(_records(3))
+
+    assert file.getvalue() == _expected(3)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_output_is_sent_to_a_unix_socket(tmp_path: Path):
+    path = tmp_path / "output.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        server.bind(str(path))
+        server.listen(1)
+
+        app = RichToolkit(mode="json", json_sink=str(path))
+        asyncio.run(app.aoutput(_records(3)))
+
+        connection, _ = server.accept()
+        received = b""
+
+        with connection:
+            while chunk := connection.recv(1024):
+                received += chunk
+    finally:
+        server.close()
+
+    assert received == _expected(3)
+
+
+def test_json_sink_is_only_available_in_json_mode():
+    with pytest.raises(ValueError, match="json_sink"):
+        RichToolkit(json_sink=1)
+
+
+@pytest.mark.parametrize("sink", [True, object()])
+def test_unsupported_sinks_are_rejected(sink: Any):
+    with pytest.raises(TypeError, match="json_sink"):
+        open_sink(sink)
+
+
+def test_lines_are_written_with_one_writev_call_per_batch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: List[List[Any]] = []
+    writev = os.writev
+
+    def recording_writev(fd: int, buffers: List[Any]) -> int:
+        calls.append(list(buffers))
+        # write at most 5 bytes at a time
+        return writev(fd, [bytes(b"".join(buffers)[:5])])
+
+    monkeypatch.setattr(os, "writev", recording_writev)
+    monkeypatch.setattr("rich_toolkit._json._iov_max", 4)
+
+    read_fd, write_fd = os.pipe()
+
+    try:
+        with JSONLinesWriter(open_sink(write_fd), max_items=3) as writer:
+            for i in range(3):
+                writer.write(b'"line %d"' % i)
+
+        assert os.read(read_fd, 1024) == b'"line 0"\n"line 1"\n"line 2"\n'
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    # the 6 chunks are split in batches of 4
+    assert [len(buffers) for buffers in calls[:2]] == [4, 4]
+    assert calls[0][0] == b'"line 0"'
+    # the rest of a partly written chunk is passed without a copy
+    assert isinstance(calls[1][0], memoryview)
+    assert bytes(calls[1][0]) == b' 0"'
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import select
+import time
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+
+from rich_toolkit import RichToolkit
+from rich_toolkit._json import JSONLinesWriter
+
+
+class RecordingIO(io.StringIO):
+    """Text file whose binary writes are recorded one by one."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.buffer = self
+        self.writes: List[bytes] = []
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.writes.append(data)
+        return len(data)
+
+
+def test_writer_flushes_every_line_by_default():
+    file = RecordingIO()
+
+    with JSONLinesWriter(file) as writer:
+        writer.write(b"1")
+        writer.write(b"2")
+
+    assert file.writes == [b"1\n", b"2\n"]
+
+
+def test_writer_flushes_every_n_lines():
+    file = RecordingIO()
+
+    with JSONLinesWriter(file, max_items=2) as writer:
+        for i in range(5):
+            writer.write(str(i).encode())
+
+    assert file.writes == [b"0\n1\n", b"2\n3\n", b"4\n"]
+
+
+def test_writer_flushes_every_n_bytes():
+    file = RecordingIO()
+
+    with JSONLinesWriter(file, max_items=None, max_bytes=8) as writer:
+        for _ in range(3):
+            writer.write(b'"abc"')
+
+    assert file.writes == [b'"abc"\n"abc"\n', b'"abc"\n']
+
+
+def test_writer_flushes_after_an_interval(monkeypatch: pytest.MonkeyPatch):
+    now = [0.0]
+    monkeypatch.setattr("rich_toolkit._json.time.monotonic", lambda: now[0])
+    file = RecordingIO()
+
+    with JSONLinesWriter(file, max_items=None, interval=1) as writer:
+        writer.write(b"1")
+        now[0] = 0.5
+        writer.write(b"2")
+        now[0] = 1.0
+        writer.write(b"3")
+        writer.write(b"4")
+
+        assert file.writes == [b"1\n2\n3\n"]
+
+    assert file.writes == [b"1\n2\n3\n", b"4\n"]
+
+
+def test_writer_flushes_after_an_interval_without_more_lines():
+    file = RecordingIO()
+
+    with JSONLinesWriter(file, max_items=None, interval=0.05) as writer:
+        writer.write(b"1")
+
+        deadline = time.monotonic() + 5
+
+        while not file.writes:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert file.writes == [b"1\n"]
+
+
+def _wait_readable(fd: int, timeout: float) -> bool:
+    readable, _, _ = select.select([fd], [], [], timeout)
+
+    return bool(readable)
+
+
+def test_output_flushes_when_the_stream_stalls():
+    read_fd, write_fd = os.pipe()
+
+    def records() -> Iterator[dict]:
+        yield {"id": 1}
+
+        # stalls until the first line was written
+        assert _wait_readable(read_fd, 5)
+        assert os.read(read_fd, 1024) == b'{"id":1}\n'
+
+        yield {"id": 2}
+
+    try:
+        app = RichToolkit(
+            mode="json",
+            json_sink=write_fd,
+            json_flush_items=None,
+            json_flush_interval=0.05,
+        )
+        app.output(records())
+
+        assert os.read(read_fd, 1024) == b'{"id":2}\n'
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_aoutput_flushes_when_the_stream_stalls():
+    read_fd, write_fd = os.pipe()
+
+    async def records() -> AsyncIterator[dict]:
+        yield {"id": 1}
+
+        deadline = time.monotonic() + 5
+
+        while not _wait_readable(read_fd, 0):
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+
+        assert os.read(read_fd, 1024) == b'{"id":1}\n'
+
+        yield {"id": 2}
+
+    try:
+        app = RichToolkit(
+            mode="json",
+            json_sink=write_fd,
+            json_flush_items=None,
+            json_flush_interval=0.05,
+        )
+        asyncio.run(app.aoutput(records()))
+
+        assert os.read(read_fd, 1024) == b'{"id":2}\n'
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_writer_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        JSONLinesWriter(RecordingIO(), max_items=0)
+
+
+def test_buffered_lines_are_written_when_the_stream_fails(
+    capsysbinary: pytest.CaptureFixture[bytes],
+):
+    app = RichToolkit(mode="json", json_flush_items=100)
+
+    def records() -> Iterator[dict]:
+        yield {"id": 1}
+        yield {"id": 2}
+        raise RuntimeError("Connection lost")
+
+    with pytest.raises(RuntimeError):
+        app.output(records())
+
+    assert capsysbinary.readouterr().out == b'{"id":1}\n{"id":2}\n'
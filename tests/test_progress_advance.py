@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import io
+from typing import List
+
+import pytest
+from rich.console import Console
+
+from rich_toolkit import RichToolkit
+from rich_toolkit.progress import Progress
+from rich_toolkit.styles import (
+    BaseStyle,
+    BorderedStyle,
+    FancyStyle,
+    MinimalStyle,
+    TaggedStyle,
+)
+
+from ._utils import render
+
+
+def test_advance_counts_completed_steps():
+    progress = Progress("Uploading", total=10)
+
+    progress.advance()
+    progress.advance(3)
+
+    assert progress.completed == 4
+    assert progress.speed is None
+    assert progress.eta is None
+
+
+def test_speed_is_sampled_once_per_frame(clock: List[float]):
+    progress = Progress("Uploading", total=1000)
+
+    clock[0] += 1
+    progress.advance(100)
+    progress._sample_speed()
+
+    assert progress.speed == 100
+    assert progress.eta == 9
+
+    clock[0] += 1
+    progress.advance(300)
+    progress._sample_speed()
+
+    # moves towards the new rate without jumping to it
+    assert progress.speed is not None
+    assert 100 < progress.speed < 300
+    assert progress.eta == pytest.approx(600 / progress.speed)
+
+
+def test_eta_is_not_known_without_total(clock: List[float]):
+    progress = Progress("Scanning")
+
+    clock[0] += 1
+    progress.advance(100)
+    progress._sample_speed()
+
+    assert progress.speed == 100
+    assert progress.eta is None
+
+
+@pytest.mark.parametrize(
+    "style_class", [MinimalStyle, TaggedStyle, FancyStyle, BorderedStyle]
+)
+def test_bar_and_rate_are_rendered_by_every_style(style_class: type) -> None:
+    style = style_class()
+    progress = Progress("Uploading", style=style, total=5000)
+    progress.advance(1234)
+    progress.speed = 1234.5
+
+    output = render(style, progress)
+
+    assert "━" in output
+    assert "25% 1,234/5,000 · 1.2k/s · ETA 0:03" in output
+
+
+def test_count_is_rendered_without_total():
+    style = MinimalStyle()
+    progress = Progress("Scanning", style=style)
+
+    assert "0" not in render(style, progress)
+
+    progress.advance(12_345)
+
+    assert "12,345" in render(style, progress)
+
+
+def test_idle_progress_renders_when_advanced():
+    console = Console(file=io.StringIO(), force_terminal=True)
+    progress = Progress(
+        "Uploading",
+        style=BaseStyle(),
+        console=console,
+        refresh_per_second=0.01,
+        refresh_policy="idle",
+        total=10,
+    )
+
+    with progress:
+        progress.refresh()
+        rendered = progress.frames_rendered
+
+        progress.refresh()
+        assert progress.frames_rendered == rendered
+
+        progress.advance()
+        progress.refresh()
+        assert progress.frames_rendered == rendered + 1
+
+
+def test_toolkit_progress_accepts_total():
+    app = RichToolkit(style=MinimalStyle(), mode="json")
+
+    with app.progress("Uploading", total=3) as progress:
+        for _ in range(3):
+            progress.advance()
+
+    assert progress.total == 3
+    assert progress.completed == 3
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+
+from rich_toolkit import RichToolkit
+from rich_toolkit.progress import Progress
+
+from ._utils import make_progress
+
+
+def test_async_progress_is_refreshed_by_the_event_loop():
+    progress = make_progress(inline_logs=True, refresh_per_second=100)
+
+    async def main() -> None:
+        async with progress:
+            assert progress._refresh_thread is None
+            assert progress._driver is not None
+
+            await progress.alog("Uploading")
+            await asyncio.sleep(0.1)
+
+            assert progress.frames_rendered > 0
+
+    asyncio.run(main())
+
+    assert progress._driver is None
+    assert "Uploading" in progress.console.file.getvalue()  # type: ignore[attr-defined]
+
+
+def test_alog_waits_for_the_queue_to_be_drained():
+    progress = make_progress(inline_logs=True)
+    progress.max_pending_logs = 10
+    queued: List[int] = []
+
+    async def main() -> None:
+        async with progress:
+            for i in range(100):
+                await progress.alog(f"line {i}")
+                queued.append(len(progress._pending_logs))
+
+    asyncio.run(main())
+
+    assert max(queued) == 10
+    assert progress.total_lines == 100
+    assert [line.text for line in progress.logs][-1] == "line 99"
+
+
+def test_alog_without_event_loop_driver():
+    progress = make_progress(inline_logs=True)
+
+    asyncio.run(progress.alog("Uploading"))
+
+    assert [line.text for line in progress.logs] == ["Uploading"]
+
+
+def test_async_progress_in_json_mode():
+    app = RichToolkit(mode="json")
+
+    async def main() -> Progress:
+        async with app.progress("Deploying", inline_logs=True) as progress:
+            await progress.alog("Uploading")
+
+        return progress
+
+    progress = asyncio.run(main())
+
+    assert progress._driver is None
+    assert [line.text for line in progress.logs] == ["Uploading"]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from rich_toolkit import RichToolkit
+from rich_toolkit._events import ProgressEvents
+
+
+def _encode(event: Dict[str, Any]) -> bytes:
+    return json.dumps(event).encode()
+
+
+def _events(file: io.StringIO) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in file.getvalue().splitlines()]
+
+
+def _app(file: io.StringIO) -> RichToolkit:
+    return RichToolkit(mode="json", progress_events=file)
+
+
+def test_progress_events_are_written_in_order():
+    file = io.StringIO()
+    app = _app(file)
+
+    with app.progress("Deploying", total=2) as progress:
+        progress.log("[bold]Uploading[/bold]")
+        progress.log("Building\nTesting")
+        progress.advance()
+        progress.advance()
+        progress.title = "Deploying app"
+
+    assert _events(file) == [
+        {"event": "start", "progress": 1, "title": "Deploying", "total": 2},
+        {
+            "event": "log",
+            "progress": 1,
+            "lines": ["Uploading", "Building", "Testing"],
+            "suppressed": 0,
+        },
+        {"event": "advance", "progress": 1, "completed": 2, "total": 2},
+        {"event": "title", "progress": 1, "title": "Deploying app"},
+        {"event": "done", "progress": 1},
+    ]
+
+
+def test_async_progress_events_are_written_in_order():
+    file = io.StringIO()
+    app = _app(file)
+
+    async def main() -> None:
+        async with app.progress("Deploying", total=1) as progress:
+            await progress.alog("Uploading")
+            progress.advance()
+
+    asyncio.run(main())
+
+    assert _events(file) == [
+        {"event": "start", "progress": 1, "title": "Deploying", "total": 1},
+        {"event": "log", "progress": 1, "lines": ["Uploading"], "suppressed": 0},
+        {"event": "advance", "progress": 1, "completed": 1, "total": 1},
+        {"event": "done", "progress": 1},
+    ]
+
+
+def test_error_and_cancel_events_are_written_right_away():
+    file = io.StringIO()
+    app = _app(file)
+
+    with app.progress("Deploying") as progress:
+        progress.set_error("Upload failed")
+
+        assert _events(file)[-1] == {
+            "event": "error",
+            "progress": 1,
+            "message": "Upload failed",
+        }
+
+    with pytest.raises(KeyboardInterrupt):
+        with app.progress("Deploying"):
+            raise KeyboardInterrupt
+
+    assert _events(file)[-1] == {"event": "cancel", "progress": 2}
+
+
+def test_events_are_batched():
+    file = io.StringIO()
+    events = ProgressEvents(file, encode=_encode, flush_interval=60)
+
+    events.emit(1, "start", title="Deploying")
+    events.log(1, ["Uploading"])
+
+    assert file.getvalue() == ""
+
+    events.flush()
+
+    assert len(_events(file)) == 2
+
+
+def test_log_events_are_rate_limited():
+    file = io.StringIO()
+    events = ProgressEvents(file, encode=_encode, log_rate_limit=10)
+
+    events.log(1, [f"line {i}" for i in range(25)])
+    events.log(2, ["other"])
+    events.flush()
+
+    first, second = _events(file)
+
+    assert first["lines"] == [f"line {i}" for i in range(10)]
+    assert first["suppressed"] == 15
+    assert second["lines"] == ["other"]
+
+
+def test_group_tasks_reference_their_group():
+    file = io.StringIO()
+    app = _app(file)
+
+    with app.progress_group("Deploying") as group:
+        with group.add_task("Building"):
+            pass
+
+    assert _events(file)[1] == {
+        "event": "start",
+        "progress": 2,
+        "title": "Building",
+        "total": None,
+        "group": 1,
+    }
+
+
+def test_track_reports_the_count_in_json_mode():
+    file = io.StringIO()
+    app = _app(file)
+
+    assert list(app.track(range(3), "Processing")) == [0, 1, 2]
+    assert _events(file)[-2:] == [
+        {"event": "advance", "progress": 1, "completed": 3, "total": 3},
+        {"event": "done", "progress": 1},
+    ]
+
+
+def test_progress_events_to_file_descriptor():
+    read_fd, write_fd = os.pipe()
+
+    try:
+        app = RichToolkit(mode="json", progress_events=write_fd)
+
+        with app.progress("Deploying"):
+            pass
+
+        lines = os.read(read_fd, 65536).decode().splitlines()
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    assert [json.loads(line)["event"] for line in lines] == ["start", "done"]
+
+
+def test_progress_events_require_json_mode():
+    with pytest.raises(ValueError):
+        RichToolkit(progress_events=True)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from rich.text import Text
+
+from rich_toolkit._subprocess import LineReader
+from rich_toolkit.progress import Progress
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def _lines(progress: Progress) -> list[str]:
+    return [
+        line.text.plain if isinstance(line.text, Text) else line.text
+        for line in progress.logs
+    ]
+
+
+def test_follow_logs_stdout_and_stderr():
+    progress = Progress("Building", inline_logs=True)
+
+    exit_code = progress.follow(
+        _python(
+            "import sys\n"
+            "for i in range(1000): print(f'out {i}')\n"
+            "print('err', file=sys.stderr)"
+        )
+    )
+
+    assert exit_code == 0
+    assert not progress.is_error
+
+    lines = _lines(progress)
+    assert sorted(lines) == sorted([f"out {i}" for i in range(1000)] + ["err"])
+    assert [line for line in lines if line.startswith("out")] == [
+        f"out {i}" for i in range(1000)
+    ]
+
+
+def test_follow_marks_the_progress_as_errored():
+    progress = Progress("Building")
+
+    exit_code = progress.follow(
+        _python("import sys; print('failing'); sys.exit(3)"),
+        error_message="Build failed",
+    )
+
+    assert exit_code == 3
+    assert progress.is_error
+    assert progress.current_message == "Build failed"
+
+
+def test_follow_without_error_message_only_returns_the_exit_code():
+    progress = Progress("Building")
+
+    assert progress.follow(_python("import sys; print('failing'); sys.exit(1)")) == 1
+    assert not progress.is_error
+    assert str(progress.current_message) == "failing"
+
+
+def test_follow_running_process():
+    process = subprocess.Popen(
+        _python("print('[bold]not markup[/]')"),
+        stdout=subprocess.PIPE,
+    )
+    progress = Progress("Building", inline_logs=True)
+
+    assert progress.follow(process) == 0
+    assert _lines(progress) == ["[bold]not markup[/]"]
+
+
+def test_follow_keeps_bounded_logs():
+    progress = Progress("Building", inline_logs=True, max_logs=10)
+
+    progress.follow(_python("for i in range(1000): print(i)"))
+
+    assert progress.total_lines == 1000
+    assert _lines(progress) == [str(i) for i in range(990, 1000)]
+
+
+def test_line_reader_splits_across_chunks():
+    reader = LineReader()
+
+    assert reader.feed(b"first\nsec") == ["first"]
+    assert reader.feed(b"ond\n") == ["second"]
+    assert reader.feed("café\n".encode()[:4]) == []
+    assert reader.feed("café\n".encode()[4:]) == ["café"]
+    assert reader.feed(b"no newline") == []
+    assert reader.close() == ["no newline"]
+
+
+def test_line_reader_handles_carriage_returns():
+    reader = LineReader()
+
+    assert reader.feed(b"windows\r\n10%\r50%\r100%\n") == ["windows", "100%"]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from rich.color import Color
+
+from rich_toolkit import RichToolkit
+from rich_toolkit.progress import Progress, ProgressGroup
+from rich_toolkit.styles import BaseStyle, BorderedStyle, FancyStyle, TaggedStyle
+
+
+class CountingIO(io.StringIO):
+    writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+def _group(style: BaseStyle, **kwargs: object) -> ProgressGroup:
+    style.console.file = CountingIO()
+    style.console._force_terminal = True
+
+    return ProgressGroup(
+        "Deploying",
+        style=style,
+        console=style.console,
+        refresh_per_second=0.01,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def _render(group: ProgressGroup) -> str:
+    console = group.style.console
+    console.begin_capture()
+    console.print(group.style.render_element(group, done=True))
+    return console.end_capture()
+
+
+def _task_colors(group: ProgressGroup, task: Progress, done: bool) -> set[Color]:
+    style = group.style
+    rendered = style.render_element(task, done=done, parent=group)
+
+    return {
+        segment.style.color
+        for segment in style.console.render(rendered)
+        if segment.style is not None and segment.style.color is not None
+    }
+
+
+@pytest.mark.parametrize(
+    "style_class", [BaseStyle, TaggedStyle, FancyStyle, BorderedStyle]
+)
+def test_group_renders_every_task(style_class: type[BaseStyle]):
+    group = _group(style_class())
+
+    with group.add_task("Building", inline_logs=True, lines_to_show=2) as build:
+        for i in range(3):
+            build.log(f"step {i}")
+
+    test = group.add_task("Testing")
+    test.start()
+    test.set_error("Tests failed")
+
+    group.add_task("Linting").log("Checking types")
+
+    output = _render(group)
+
+    assert "step 0" not in output
+    assert "step 1" in output
+    assert "step 2" in output
+    assert "Tests failed" in output
+    assert "Checking types" in output
+    assert output.index("step 2") < output.index("Tests failed")
+    assert output.index("Tests failed") < output.index("Checking types")
+
+
+@pytest.mark.parametrize("style_class", [TaggedStyle, FancyStyle, BorderedStyle])
+@pytest.mark.parametrize("done", [False, True])
+def test_failed_tasks_use_the_error_palette(style_class: type[BaseStyle], done: bool):
+    style = style_class(theme={"error": "#ff0000"})
+    group = _group(style)
+
+    failed = group.add_task("Testing")
+    failed.start()
+    failed.set_error("Tests failed")
+
+    running = group.add_task("Linting")
+    running.start()
+
+    error_color = Color.parse("#ff0000")
+
+    assert error_color in _task_colors(group, failed, done)
+    assert error_color not in _task_colors(group, running, done)
+
+
+def test_transient_tasks_are_removed_when_done():
+    group = _group(BaseStyle())
+
+    with group.add_task("Building", transient=True):
+        pass
+
+    with group.add_task("Testing", transient_on_error=True) as test:
+        test.set_error("Tests failed")
+
+    kept = group.add_task("Linting")
+    with kept:
+        pass
+
+    assert group.tasks == [kept]
+
+
+def test_tasks_are_drawn_in_one_write_per_frame():
+    group = _group(TaggedStyle())
+
+    with group:
+        tasks = [group.add_task(f"Step {i}", inline_logs=True) for i in range(50)]
+
+        for task in tasks:
+            task.start()
+            task.log("working")
+
+        file = group.console.file
+        assert isinstance(file, CountingIO)
+        writes = file.writes
+
+        group.refresh()
+
+        assert file.writes == writes + 1
+
+    assert all(task.total_lines == 1 for task in tasks)
+
+
+def test_idle_group_renders_when_a_task_changes():
+    group = _group(BaseStyle(), refresh_policy="idle")
+
+    with group:
+        task = group.add_task("Building")
+        group.refresh()
+        rendered = group.frames_rendered
+
+        group.refresh()
+        assert group.frames_rendered == rendered
+
+        task.log("Compiling")
+        group.refresh()
+        assert group.frames_rendered == rendered + 1
+
+
+def test_tasks_share_the_group_animation_frame():
+    style = TaggedStyle()
+    group = _group(style)
+
+    for i in range(10):
+        group.add_task(f"Step {i}").start()
+
+    counter = style.animation_counter
+    style.render_element(group)
+
+    assert style.animation_counter == counter + 1
+
+
+def test_progress_group_is_quiet_in_json_mode():
+    app = RichToolkit(mode="json")
+
+    with app.progress_group("Deploying") as group:
+        with group.add_task("Building", inline_logs=True) as task:
+            task.log("Compiling")
+
+    assert task._quiet
+    assert not task._started
+    assert [line.text for line in task.logs] == ["Compiling"]
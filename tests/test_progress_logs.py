@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+import pytest
+from rich.console import Console
+from rich.text import Text
+
+from rich_toolkit import RichToolkit
+from rich_toolkit.progress import Progress, ProgressGroup
+from rich_toolkit.styles import BaseStyle, BorderedStyle
+
+from ._utils import render
+
+
+def test_logs_are_unbounded_by_default():
+    progress = Progress("Deploying", inline_logs=True, lines_to_show=2)
+
+    for i in range(10):
+        progress.log(f"line {i}")
+
+    assert len(progress.logs) == 10
+    assert progress.total_lines == 10
+
+
+def test_max_logs_keeps_only_the_latest_lines():
+    progress = Progress("Deploying", inline_logs=True, lines_to_show=2, max_logs=3)
+
+    for i in range(10):
+        progress.log(f"line {i}")
+
+    assert [line.text for line in progress.logs] == ["line 7", "line 8", "line 9"]
+    assert progress.total_lines == 10
+    assert [line.text for line in progress.get_visible_logs()] == [
+        "line 8",
+        "line 9",
+    ]
+
+
+def test_max_logs_is_at_least_lines_to_show():
+    progress = Progress("Deploying", inline_logs=True, lines_to_show=5, max_logs=2)
+
+    assert progress.max_logs == 5
+
+
+def test_max_logs_must_be_positive():
+    with pytest.raises(ValueError, match="max_logs"):
+        Progress("Deploying", inline_logs=True, max_logs=0)
+
+
+def test_bounded_logs_keep_partial_lines_open():
+    progress = Progress("Deploying", inline_logs=True, lines_to_show=1, max_logs=1)
+
+    progress.log("Downloading", end="")
+    progress.log("... done")
+    progress.log("Installing")
+
+    assert [line.text for line in progress.logs] == ["Installing"]
+    assert progress.total_lines == 2
+
+
+@pytest.mark.parametrize("style_class", [BaseStyle, BorderedStyle])
+def test_bounded_logs_render_like_unbounded_logs(style_class: type) -> None:
+    style = style_class()
+    bounded = Progress(
+        "Deploying", style=style, inline_logs=True, lines_to_show=3, max_logs=3
+    )
+    unbounded = Progress("Deploying", style=style, inline_logs=True, lines_to_show=3)
+
+    for i in range(20):
+        bounded.log(f"line {i}")
+        unbounded.log(f"line {i}")
+
+    style.animation_counter = 0
+    bounded_output = render(style, bounded)
+    style.animation_counter = 0
+
+    assert bounded_output == render(style, unbounded)
+
+
+def test_spilled_logs_are_written_to_a_file(tmp_path: Path) -> None:
+    log_file = tmp_path / "deploy.log"
+    app = RichToolkit(style=BaseStyle(), mode="json")
+
+    with app.progress(
+        "Deploying",
+        inline_logs=True,
+        lines_to_show=2,
+        max_logs=2,
+        spill_logs_to=log_file,
+    ) as progress:
+        for i in range(5):
+            progress.log(Text(f"line {i}") if i % 2 else f"line {i}")
+
+        assert len(progress.logs) == 2
+
+    assert log_file.read_text() == "".join(f"line {i}\n" for i in range(5))
+
+
+def test_spilled_logs_can_be_written_to_an_open_file() -> None:
+    log_file = io.StringIO()
+
+    with Progress(
+        "Deploying",
+        inline_logs=True,
+        max_logs=1,
+        spill_logs_to=log_file,
+        quiet=True,
+    ) as progress:
+        progress.log("first")
+        progress.log("second")
+
+    assert log_file.getvalue() == "first\nsecond\n"
+    assert not log_file.closed
+
+
+@pytest.fixture
+def run_in_thread() -> Iterator[Callable[[Callable[[], None]], None]]:
+    # keep the threads alive until the test is done, as finished threads'
+    # identifiers can be reused
+    done = threading.Event()
+    threads: List[threading.Thread] = []
+
+    def run(func: Callable[[], None]) -> None:
+        ran = threading.Event()
+
+        def target() -> None:
+            func()
+            ran.set()
+            done.wait(timeout=5)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        threads.append(thread)
+        ran.wait(timeout=5)
+
+    yield run
+
+    done.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_producers_do_not_lose_lines():
+    progress = Progress("Deploying", inline_logs=True, lines_to_show=5)
+
+    def produce(worker: int) -> None:
+        for i in range(500):
+            progress.log(f"{worker}:{i}")
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert progress.total_lines == 8 * 500
+
+    for worker in range(8):
+        lines = [
+            int(str(line.text).split(":")[1])
+            for line in progress.logs
+            if str(line.text).startswith(f"{worker}:")
+        ]
+        assert lines == list(range(500))
+
+
+def test_partial_lines_are_continued_per_producer(
+    run_in_thread: Callable[[Callable[[], None]], None],
+):
+    progress = Progress("Deploying", inline_logs=True)
+
+    run_in_thread(lambda: progress.log("Downloading", end=""))
+    run_in_thread(lambda: progress.log("Unrelated"))
+    progress.log("Main thread", end="")
+    run_in_thread(lambda: progress.log("Other thread"))
+    progress.log(" done")
+
+    assert [line.text for line in progress.logs] == [
+        "Downloading",
+        "Unrelated",
+        "Main thread done",
+        "Other thread",
+    ]
+
+
+def test_partial_messages_are_continued_per_producer(
+    run_in_thread: Callable[[Callable[[], None]], None],
+):
+    progress = Progress("Deploying")
+
+    progress.log("Uploading", end="")
+    progress.log("...")
+
+    assert progress.current_message == "Uploading..."
+
+    progress.log("Uploading", end="")
+    run_in_thread(lambda: progress.log("Other"))
+    progress.log("...")
+
+    assert progress.current_message == "..."
+
+
+def test_pending_logs_are_applied_before_setting_the_message():
+    progress = Progress("Deploying")
+
+    progress.log("Uploading")
+    progress.current_message = "Done"
+
+    assert progress.current_message == "Done"
+
+
+def test_pending_logs_are_bounded_without_rendering():
+    progress = Progress("Deploying", inline_logs=True)
+
+    for i in range(progress.max_pending_logs * 3):
+        progress.log(f"line {i}")
+
+    assert len(progress._pending_logs) < progress.max_pending_logs
+
+
+@pytest.fixture
+def log_storm() -> Iterator[Callable[[Callable[[], None], int], None]]:
+    # call `log` in a tight loop from several threads until the test is done
+    done = threading.Event()
+    threads: List[threading.Thread] = []
+
+    def start(log: Callable[[], None], count: int) -> None:
+        def target() -> None:
+            while not done.is_set():
+                log()
+
+        for _ in range(count):
+            thread = threading.Thread(target=target)
+            thread.start()
+            threads.append(thread)
+
+    yield start
+
+    done.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_frames_keep_rendering_while_threads_log(
+    log_storm: Callable[[Callable[[], None], int], None],
+) -> None:
+    progress = Progress(
+        "Deploying",
+        console=Console(file=io.StringIO(), force_terminal=True, width=80),
+        inline_logs=True,
+        lines_to_show=5,
+        refresh_per_second=20,
+    )
+
+    with progress:
+        log_storm(lambda: progress.log("line"), 4)
+
+        for _ in range(3):
+            rendered = progress.frames_rendered
+            time.sleep(0.3)
+
+            assert progress.frames_rendered > rendered
+
+
+def test_group_refresh_returns_while_a_task_is_flooded(
+    log_storm: Callable[[Callable[[], None], int], None],
+) -> None:
+    group = ProgressGroup(
+        "Deploying",
+        console=Console(file=io.StringIO(), force_terminal=True, width=80),
+        refresh_per_second=0.01,
+    )
+    task = group.add_task("Building", inline_logs=True, lines_to_show=5)
+    task.max_pending_logs = 1
+
+    refreshed = threading.Event()
+
+    def refresh() -> None:
+        for _ in range(3):
+            group.refresh()
+
+        refreshed.set()
+
+    log_storm(lambda: task.log("line"), 2)
+    threading.Thread(target=refresh, daemon=True).start()
+
+    assert refreshed.wait(timeout=5)
+
+
+def test_log_rate_limit_must_be_positive():
+    with pytest.raises(ValueError, match="log_rate_limit"):
+        Progress("Deploying", inline_logs=True, log_rate_limit=0)
+
+
+def test_log_rate_limit_suppresses_lines(clock: List[float]):
+    progress = Progress("Deploying", inline_logs=True, log_rate_limit=10)
+
+    for i in range(1000):
+        progress.log(f"line {i}")
+
+    assert [line.text for line in progress.logs] == [f"line {i}" for i in range(10)]
+    assert progress.total_lines == 10
+    assert progress.suppressed_lines == 990
+
+    clock[0] += 0.5
+
+    for i in range(1000, 1010):
+        progress.log(f"line {i}")
+
+    assert progress.total_lines == 15
+    assert progress.suppressed_lines == 995
+
+
+def test_suppressed_partial_lines_stay_suppressed(clock: List[float]):
+    progress = Progress("Deploying", inline_logs=True, log_rate_limit=1)
+
+    progress.log("kept")
+    progress.log("Downloading", end="")
+    clock[0] += 10
+    progress.log(" 100%")
+
+    assert [line.text for line in progress.logs] == ["kept"]
+    assert progress.suppressed_lines == 1
+
+
+@pytest.mark.parametrize("style_class", [BaseStyle, BorderedStyle])
+def test_suppressed_lines_are_shown_in_the_tail(style_class: type, clock: List[float]):
+    style = style_class()
+    progress = Progress(
+        "Deploying",
+        style=style,
+        inline_logs=True,
+        lines_to_show=5,
+        log_rate_limit=5,
+    )
+
+    for i in range(12_350):
+        progress.log(f"line {i}")
+
+    output = render(style, progress)
+
+    assert "line 4" in output
+    assert "… 12,345 lines suppressed" in output
+
+
+def test_spill_file_has_the_full_stream_in_order(
+    tmp_path: Path, clock: List[float]
+) -> None:
+    log_file = tmp_path / "progress.log"
+    progress = Progress(
+        "Deploying",
+        inline_logs=True,
+        max_logs=2,
+        spill_logs_to=log_file,
+        log_rate_limit=2,
+    )
+
+    with progress:
+        for i in range(5):
+            progress.log(f"line {i}")
+
+        progress._log_lines([f"batch {i}" for i in range(3)])
+        progress.log("unfinished", end="")
+
+    assert [line.text for line in progress.logs] == ["line 0", "line 1"]
+    assert log_file.read_text().splitlines() == [
+        *[f"line {i}" for i in range(5)],
+        *[f"batch {i}" for i in range(3)],
+        "unfinished",
+    ]
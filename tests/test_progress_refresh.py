@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+
+import pytest
+
+
+from ._utils import make_progress
+
+
+def test_refresh_policy_must_be_known():
+    with pytest.raises(ValueError, match="refresh_policy"):
+        make_progress(refresh_policy="sometimes")
+
+
+def test_fixed_policy_renders_every_frame():
+    progress = make_progress()
+
+    with progress:
+        for _ in range(3):
+            progress.refresh()
+
+    # 3 refreshes and the final frame
+    assert progress.frames_rendered == 4
+    assert progress.frames_skipped == 0
+
+
+def test_idle_policy_only_renders_changes():
+    progress = make_progress(refresh_policy="idle", inline_logs=True)
+
+    with progress:
+        progress.refresh()
+        progress.refresh()
+        progress.log("Uploading")
+        progress.refresh()
+        progress.refresh()
+        progress.current_message = "Almost done"
+        progress.refresh()
+
+    assert progress.frames_rendered == 4
+    assert progress.frames_skipped == 2
+
+
+def test_idle_policy_renders_title_changes():
+    progress = make_progress(refresh_policy="idle")
+
+    with progress:
+        progress.refresh()
+        progress.refresh()
+        progress.title = "Deploying again"
+        progress.refresh()
+
+    assert progress.frames_skipped == 1
+    assert progress.frames_rendered == 3
+
+
+def test_adaptive_policy_backs_off_when_frames_are_slow():
+    progress = make_progress(refresh_policy="adaptive")
+    progress.refresh_per_second = 8
+
+    with progress:
+        progress.refresh()
+
+        # pretend frames take 50ms to render and write
+        progress._frame_cost = 0.05
+
+        assert progress.refresh_interval == pytest.approx(0.5)
+
+        progress.refresh()
+
+    assert progress.frames_skipped == 1
+    assert progress.frames_rendered == 2
+
+
+def test_adaptive_policy_keeps_the_rate_when_frames_are_fast():
+    progress = make_progress(refresh_policy="adaptive")
+    progress.refresh_per_second = 8
+
+    assert progress.refresh_interval == pytest.approx(1 / 8)
+
+    progress._frame_cost = 0.001
+
+    assert progress.refresh_interval == pytest.approx(1 / 8)
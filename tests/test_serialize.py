@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import datetime
+import enum
+import json
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from rich_toolkit import RichToolkit
+from rich_toolkit._serialize import model_encoder, stream_encoder, to_json_data
+
+
+class Status(enum.Enum):
+    READY = "ready"
+    BUILDING = "building"
+
+
+class Region(NamedTuple):
+    name: str
+    zone: int
+
+
+@dataclass
+class Deployment:
+    id: str
+    status: Status
+    region: Region
+    tags: List[str] = field(default_factory=list)
+
+
+class Point(BaseModel):
+    x: float
+    y: Optional[float] = None
+    label: str = ""
+
+
+class Route(BaseModel):
+    points: List[Point]
+
+
+def test_json_compatible_data_is_not_copied():
+    data = {"id": "dep_123", "tags": ["web", "eu"], "replicas": [1, 2.5, None]}
+
+    assert to_json_data(data) is data
+
+
+def test_only_converted_containers_are_copied():
+    tags = ["web", "eu"]
+    data = {"tags": tags, "status": Status.READY}
+
+    converted = to_json_data(data)
+
+    assert converted == {"tags": tags, "status": "ready"}
+    assert converted is not data
+    assert converted["tags"] is tags
+    assert data["status"] is Status.READY
+
+
+def test_dataclasses_become_objects_and_named_tuples_arrays():
+    deployment = Deployment("dep_123", Status.BUILDING, Region("eu-west", 2), ["web"])
+
+    assert to_json_data(deployment) == {
+        "id": "dep_123",
+        "status": "building",
+        "region": ["eu-west", 2],
+        "tags": ["web"],
+    }
+
+
+def test_named_tuples_are_written_like_the_standard_library(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    region = Region("eu-west", 2)
+
+    RichToolkit(mode="json").output({"region": region})
+
+    assert json.loads(capsys.readouterr().out) == json.loads(
+        json.dumps({"region": region})
+    )
+
+
+def test_attrs_classes_become_objects():
+    attr = pytest.importorskip("attr")
+
+    @attr.s(auto_attribs=True)
+    class Service:
+        name: str
+        port: int
+
+    assert to_json_data(Service("api", 8000)) == {"name": "api", "port": 8000}
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (datetime.datetime(2026, 7, 13, 12, 30), "2026-07-13T12:30:00"),
+        (datetime.date(2026, 7, 13), "2026-07-13"),
+        (datetime.time(12, 30), "12:30:00"),
+        (
+            uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "12345678-1234-5678-1234-567812345678",
+        ),
+        (Decimal("1.10"), "1.10"),
+        (PurePosixPath("/srv/app"), "/srv/app"),
+        ({3, 1, 2}, [1, 2, 3]),
+        (frozenset({"b", "a"}), ["a", "b"]),
+        ((1, Status.READY), [1, "ready"]),
+    ],
+)
+def test_scalar_types(value: Any, expected: Any):
+    assert to_json_data(value) == expected
+
+
+def test_keys_are_converted_like_the_standard_library():
+    data = {1: "a", 2.5: "b", False: "c", None: "d"}
+
+    assert to_json_data(data) == json.loads(json.dumps(data))
+    assert to_json_data({Status.READY: 1}) == {"ready": 1}
+
+
+def test_unknown_objects_are_left_for_the_encoder():
+    value = object()
+
+    assert to_json_data({"value": value})["value"] is value
+
+
+def test_pydantic_models_use_json_mode():
+    assert to_json_data(Point(x=1, label="é")) == {"x": 1.0, "y": None, "label": "é"}
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        Point(x=1.5, y=2, label="café"),
+        Point(x=1.5),
+        Route(points=[Point(x=1), Point(x=2, y=3)]),
+    ],
+)
+def test_model_encoder_matches_the_regular_path(model: BaseModel):
+    encode = model_encoder(type(model))
+    assert encode is not None
+
+    payload = encode(model)
+
+    # `null`s in nested models are checked by the regular path
+    if isinstance(model, Route):
+        assert payload is None
+    else:
+        assert payload == json.dumps(
+            to_json_data(model), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def test_model_encoder_leaves_non_finite_floats_to_the_regular_path():
+    encode = model_encoder(Point)
+    assert encode is not None
+
+    assert encode(Point(x=float("nan"))) is None
+
+
+def test_stream_encoder_uses_the_model_serializer_for_the_first_model():
+    calls: List[Any] = []
+
+    def encode(item: Any) -> bytes:
+        calls.append(item)
+        return b"regular"
+
+    encode_item = stream_encoder(encode)
+    other = {"x": 1}
+
+    assert encode_item(Point(x=1)) == b'{"x":1.0,"y":null,"label":""}'
+    assert encode_item(other) == b"regular"
+    assert calls == [other]
+
+
+def test_json_mode_streams_models_and_rejects_non_finite_floats(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    app = RichToolkit(mode="json")
+
+    with pytest.raises(ValueError, match="Out of range float values"):
+        app.output(iter([Point(x=1), Point(x=float("inf"))]))
+
+    lines: List[Dict[str, Any]] = [
+        json.loads(line) for line in capsys.readouterr().out.splitlines()
+    ]
+
+    assert lines == [{"x": 1.0, "y": None, "label": ""}]
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pytest
+
+from rich_toolkit import RichToolkit
+from rich_toolkit.styles import BaseStyle, TaggedStyle
+from rich_toolkit.utils import colors
+
+query_terminal_colors = colors._query_terminal_colors
+
+
+@pytest.fixture
+def queries(monkeypatch: pytest.MonkeyPatch) -> Iterator[List[str]]:
+    calls: List[str] = []
+    detected = {"text": "#eeeeee", "background": "#111111"}
+
+    def fake_query(color_types: Sequence[str]) -> Dict[str, Optional[str]]:
+        calls.extend(color_types)
+        return {color_type: detected[color_type] for color_type in color_types}
+
+    monkeypatch.delenv(colors.TERMINAL_COLOR_CACHE_ENV, raising=False)
+    monkeypatch.setattr(colors, "_query_terminal_colors", fake_query)
+    monkeypatch.setattr(colors, "_get_terminal_identity", lambda: "/dev/pts/1|xterm")
+    colors.clear_terminal_color_cache()
+
+    yield calls
+
+    colors.clear_terminal_color_cache()
+
+
+def test_styles_share_detected_terminal_colors(queries: List[str]) -> None:
+    first = BaseStyle()
+    second = TaggedStyle()
+
+    assert first.background_color == second.background_color == "#111111"
+    assert first.text_color == second.text_color == "#eeeeee"
+    assert queries == ["text", "background"]
+
+
+def test_failed_detection_is_cached_and_uses_caller_default(
+    monkeypatch: pytest.MonkeyPatch, queries: List[str]
+) -> None:
+    def no_answer(color_types: Sequence[str]) -> Dict[str, Optional[str]]:
+        queries.extend(color_types)
+        return {color_type: None for color_type in color_types}
+
+    monkeypatch.setattr(colors, "_query_terminal_colors", no_answer)
+
+    assert colors.get_terminal_background_color("#000000") == "#000000"
+    assert colors.get_terminal_background_color("#222222") == "#222222"
+    assert queries == ["background"]
+
+
+def test_disk_cache_is_shared_between_processes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, queries: List[str]
+) -> None:
+    cache_path = tmp_path / "colors.json"
+    monkeypatch.setenv(colors.TERMINAL_COLOR_CACHE_ENV, str(cache_path))
+
+    assert colors.get_terminal_background_color() == "#111111"
+    assert queries == ["background"]
+
+    # simulate a new process in the same terminal
+    colors.clear_terminal_color_cache()
+
+    assert colors.get_terminal_background_color() == "#111111"
+    assert queries == ["background"]
+
+    stored = json.loads(cache_path.read_text())
+    assert stored["/dev/pts/1|xterm"]["background"]["color"] == "#111111"
+
+
+def test_disk_cache_is_keyed_by_terminal(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, queries: List[str]
+) -> None:
+    monkeypatch.setenv(colors.TERMINAL_COLOR_CACHE_ENV, str(tmp_path / "colors.json"))
+
+    colors.get_terminal_background_color()
+    colors.clear_terminal_color_cache()
+
+    monkeypatch.setattr(colors, "_get_terminal_identity", lambda: "/dev/pts/2|xterm")
+    colors.get_terminal_background_color()
+
+    assert queries == ["background", "background"]
+
+
+def test_disk_cache_entries_expire(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, queries: List[str]
+) -> None:
+    monkeypatch.setenv(colors.TERMINAL_COLOR_CACHE_ENV, str(tmp_path / "colors.json"))
+    monkeypatch.setenv(colors.TERMINAL_COLOR_CACHE_TTL_ENV, "0")
+
+    colors.get_terminal_background_color()
+    colors.clear_terminal_color_cache()
+    colors.get_terminal_background_color()
+
+    assert queries == ["background", "background"]
+
+
+def test_unreadable_disk_cache_is_ignored(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, queries: List[str]
+) -> None:
+    cache_path = tmp_path / "colors.json"
+    cache_path.write_text("not json")
+    monkeypatch.setenv(colors.TERMINAL_COLOR_CACHE_ENV, str(cache_path))
+
+    assert colors.get_terminal_background_color() == "#111111"
+    assert queries == ["background"]
+
+
+def test_terminal_colors_are_queried_together(queries: List[str]) -> None:
+    assert colors.get_terminal_colors() == ("#eeeeee", "#111111")
+    assert colors.get_terminal_text_color() == "#eeeeee"
+    assert queries == ["text", "background"]
+
+
+def test_only_missing_colors_are_queried(queries: List[str]) -> None:
+    colors.get_terminal_background_color()
+    colors.get_terminal_colors()
+
+    assert queries == ["background", "text"]
+
+
+def test_parse_color_replies_from_one_read() -> None:
+    response = b"\033]10;rgb:eeee/eeee/eeee\033\\\033]11;rgb:1111/2222/3333\a"
+
+    assert colors._parse_color_replies(response, ["10", "11"]) == {
+        "10": "#eeeeee",
+        "11": "#112233",
+    }
+
+
+def test_parse_color_replies_ignores_incomplete_reply() -> None:
+    response = b"\033]10;rgb:eeee/eeee/eeee\033\\\033]11;rgb:11"
+
+    assert colors._parse_color_replies(response, ["10", "11"]) == {"10": "#eeeeee"}
+
+
+def test_parse_color_replies_without_osc_code_for_single_query() -> None:
+    assert colors._parse_color_replies(b"rgb:ff/00/00\a", ["11"]) == {"11": "#ff0000"}
+
+
+def test_parse_color_replies_without_osc_code_in_query_order() -> None:
+    response = b"\033]rgb:eeee/eeee/eeee\033\\\033]rgb:1111/2222/3333\a"
+
+    assert colors._parse_color_replies(response, ["10", "11"]) == {
+        "10": "#eeeeee",
+        "11": "#112233",
+    }
+    assert colors._parse_color_replies(response[:-1], ["10", "11"]) == {"10": "#eeeeee"}
+
+
+def test_background_detection_does_not_block_style_creation(
+    monkeypatch: pytest.MonkeyPatch, queries: List[str]
+) -> None:
+    answered = threading.Event()
+
+    def slow_query(color_types: Sequence[str]) -> Dict[str, Optional[str]]:
+        answered.wait(timeout=5)
+        return {"text": "#eeeeee", "background": "#111111"}
+
+    monkeypatch.setattr(colors, "_query_terminal_colors", slow_query)
+
+    style = TaggedStyle(
+        background_color="#010101",
+        text_color="#fefefe",
+        detect_colors_in_background=True,
+    )
+
+    assert style.background_color == "#010101"
+    assert style.text_color == "#fefefe"
+    assert style._terminal_colors is not None
+
+    answered.set()
+    style._terminal_colors.result(timeout=5)
+
+    assert style.background_color == "#111111"
+    assert style.text_color == "#eeeeee"
+
+
+def test_background_detection_runs_once(queries: List[str]) -> None:
+    first = BaseStyle(detect_colors_in_background=True)
+    second = BaseStyle(detect_colors_in_background=True)
+
+    assert first._terminal_colors is second._terminal_colors
+    assert first._terminal_colors is not None
+    first._terminal_colors.result(timeout=5)
+
+    assert queries == ["text", "background"]
+    assert second.background_color == "#111111"
+
+
+def test_background_detection_keeps_defaults_when_terminal_does_not_answer(
+    monkeypatch: pytest.MonkeyPatch, queries: List[str]
+) -> None:
+    monkeypatch.setattr(
+        colors,
+        "_query_terminal_colors",
+        lambda color_types: {color_type: None for color_type in color_types},
+    )
+
+    style = BaseStyle(background_color="#222222", detect_colors_in_background=True)
+    assert style._terminal_colors is not None
+    style._terminal_colors.result(timeout=5)
+
+    assert style.background_color == "#222222"
+    assert style.text_color == "#FFFFFF"
+
+
+def test_background_detection_uses_cached_colors(queries: List[str]) -> None:
+    colors.get_terminal_colors()
+
+    future = colors.detect_terminal_colors_in_background()
+
+    assert future.done()
+    assert future.result() == {"text": "#eeeeee", "background": "#111111"}
+    assert queries == ["text", "background"]
+
+
+def test_input_waits_for_background_detection_to_restore_the_terminal(
+    monkeypatch: pytest.MonkeyPatch, queries: List[str]
+) -> None:
+    events: List[str] = []
+    probing = threading.Event()
+
+    def probe(color_types: Sequence[str]) -> Dict[str, Optional[str]]:
+        # holds the terminal for longer than input waits for it
+        with colors._terminal_mode_lock:
+            probing.set()
+            time.sleep(0.2)
+            events.append("restored")
+
+        return {"text": "#eeeeee", "background": "#111111"}
+
+    def getchar() -> str:
+        events.append("getchar")
+        return "\r"
+
+    monkeypatch.setattr(colors, "_query_terminal_colors", probe)
+    monkeypatch.setattr(colors, "_REPLY_TIMEOUT", 0.01)
+    monkeypatch.setattr("rich_toolkit.container.getchar", getchar)
+
+    app = RichToolkit(style=TaggedStyle(detect_colors_in_background=True))
+    assert probing.wait(timeout=5)
+
+    assert app.input("Name", default="Ada") == "Ada"
+    assert events == ["restored", "getchar"]
+
+
+def test_background_detection_is_cancelled_before_querying_the_terminal(
+    monkeypatch: pytest.MonkeyPatch, queries: List[str]
+) -> None:
+    colors._background_detection_cancelled.set()
+    thread = threading.current_thread()
+    monkeypatch.setattr(colors, "_background_detection_thread", thread)
+    monkeypatch.setattr(colors.os, "open", lambda *args: os.dup(0))
+    monkeypatch.setattr(colors.os, "tcgetpgrp", lambda fd: os.getpgrp())
+    monkeypatch.setattr(colors, "_query_terminal_colors", query_terminal_colors)
+
+    with pytest.raises(colors._DetectionCancelled):
+        colors._query_terminal_colors(["text"])
+
+    assert not colors._terminal_mode_lock.locked()
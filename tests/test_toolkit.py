@@ -1,3 +1,4 @@
+import time
 from io import StringIO
 
 import pytest
@@ -157,6 +158,119 @@ def test_progress_can_preserve_logs_without_wrapping() -> None:
     assert message in output.getvalue().splitlines()
 
 
+def _preserved_progress(output: StringIO) -> Progress:
+    console = Console(file=output, width=20, color_system=None)
+    style = MinimalStyle(theme={})
+    style.console = console
+    app = RichToolkit(style=style, preserve_progress_logs=True)
+
+    progress = app.progress("Loading", inline_logs=True)
+    progress.preserve_logs_flush_interval = 60
+
+    return progress
+
+
+def test_preserved_plain_logs_are_buffered_until_flushed() -> None:
+    output = StringIO()
+
+    with _preserved_progress(output) as progress:
+        progress.log("Building...")
+        progress.log("Still building", end="")
+        progress.log("...")
+
+        assert "Building..." not in output.getvalue()
+
+        progress.flush()
+
+        assert output.getvalue().splitlines() == [
+            "Building...",
+            "Still building...",
+        ]
+
+
+def test_preserved_logs_are_flushed_when_the_buffer_is_full() -> None:
+    output = StringIO()
+
+    with _preserved_progress(output) as progress:
+        progress.preserve_logs_buffer_size = 20
+        progress.log("short")
+
+        assert output.getvalue() == ""
+
+        progress.log("LONG_LOG=" + "x" * 40)
+
+        assert output.getvalue().splitlines() == ["short", "LONG_LOG=" + "x" * 40]
+
+
+def test_preserved_logs_with_markup_keep_their_order() -> None:
+    output = StringIO()
+
+    with _preserved_progress(output) as progress:
+        progress.log("plain")
+        progress.log("[bold]markup[/]")
+        progress.log("plain again")
+        progress.log("tab\there")
+
+    assert output.getvalue().splitlines()[:4] == [
+        "plain",
+        "markup",
+        "plain again",
+        "tab     here",
+    ]
+
+
+def test_preserved_logs_are_flushed_on_error() -> None:
+    output = StringIO()
+
+    with pytest.raises(RuntimeError):
+        with _preserved_progress(output) as progress:
+            progress.log("Building...")
+            raise RuntimeError
+
+    assert "Building..." in output.getvalue().splitlines()
+
+
+def test_preserved_logs_are_highlighted_on_color_consoles() -> None:
+    output = StringIO()
+    console = Console(file=output, width=80, color_system="truecolor")
+    style = MinimalStyle(theme={})
+    style.console = console
+    app = RichToolkit(style=style, preserve_progress_logs=True)
+    message = "Downloaded 42 files from https://example.com True"
+
+    with app.progress("Loading", inline_logs=True) as progress:
+        progress.log(message)
+
+    expected = StringIO()
+    Console(file=expected, width=80, color_system="truecolor").print(
+        message, soft_wrap=True
+    )
+
+    assert "\x1b[" in expected.getvalue()
+    assert expected.getvalue() in output.getvalue()
+
+
+def test_preserved_logs_are_flushed_when_nothing_else_is_logged() -> None:
+    output = StringIO()
+    console = Console(file=output, width=20, color_system=None)
+    style = MinimalStyle(theme={})
+    style.console = console
+    app = RichToolkit(style=style, preserve_progress_logs=True)
+
+    # tasks of a group aren't refreshed by a thread of their own
+    with app.progress_group("Deploying") as group:
+        with group.add_task("Building", inline_logs=True) as task:
+            task.preserve_logs_flush_interval = 0.05
+            task.log("Building...")
+
+            # the producer stalls
+            deadline = time.monotonic() + 5
+
+            while "Building..." not in output.getvalue():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+
 def test_preserved_inline_progress_uses_updated_title() -> None:
     output = StringIO()
     console = Console(file=output, color_system=None)
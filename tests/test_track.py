@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import io
+from typing import Iterator
+
+
+from rich_toolkit import RichToolkit
+from rich_toolkit.styles import BaseStyle
+
+from ._utils import make_progress
+
+
+def _generate(count: int) -> Iterator[int]:
+    yield from range(count)
+
+
+def test_track_counts_sized_iterables():
+    progress = make_progress("Processing")
+    seen = []
+
+    for _ in progress.track([1, 2, 3, 4]):
+        progress._sample_speed()
+        seen.append(progress.completed)
+        assert progress._started
+
+    assert seen == [1, 2, 3, 4]
+    assert progress.total == 4
+    assert progress.completed == 4
+    assert not progress._started
+
+
+def test_track_counts_generators():
+    progress = make_progress("Processing")
+    seen = []
+
+    for _ in progress.track(_generate(3)):
+        progress._sample_speed()
+        seen.append(progress.completed)
+
+    assert seen == [1, 2, 3]
+    assert progress.total is None
+    assert progress.completed == 3
+    assert not progress._started
+
+
+class Deployments:
+    """Sized, but its iterator has no length hint."""
+
+    def __len__(self) -> int:
+        return 3
+
+    def __iter__(self) -> Iterator[int]:
+        return _generate(3)
+
+
+def test_track_uses_the_length_of_sized_iterables():
+    progress = make_progress("Processing")
+    seen = []
+
+    for _ in progress.track(Deployments()):
+        progress._sample_speed()
+        seen.append(progress.completed)
+
+    assert seen == [1, 2, 3]
+    assert progress.total == 3
+    assert progress.completed == 3
+
+
+def test_track_finishes_when_the_loop_is_left():
+    progress = make_progress("Processing")
+
+    for item in progress.track(range(100)):
+        if item == 9:
+            break
+
+    assert progress.completed == 10
+    assert not progress._started
+
+
+def test_toolkit_track_renders_the_count():
+    app = RichToolkit(style=BaseStyle())
+    app.console.file = io.StringIO()
+    app.console._force_terminal = True
+
+    assert list(app.track(range(5), "Processing")) == list(range(5))
+    assert "100% 5/5" in app.console.file.getvalue()
+
+
+def test_toolkit_track_passes_items_through_in_json_mode():
+    app = RichToolkit(mode="json")
+    items = _generate(3)
+
+    assert app.track(items, "Processing") is items